@@ -0,0 +1,70 @@
+"""
+Вартість одного запису логу для різних конфігурацій sink-ів.
+
+Запуск (з каталогу ParkFlowUABot):
+    python -m benchmarks.bench_logging [--records 50000]
+"""
+import argparse
+import os
+import time
+
+from loguru import logger
+
+from telegram_bot.logger import QueuedSink, _json_format
+
+PAYLOAD = [{"id": i, "spot_id": i, "status": "paid", "total_price": 40} for i in range(20)]
+
+
+def _measure(records: int, call) -> float:
+    started = time.perf_counter()
+    for _ in range(records):
+        call()
+    return (time.perf_counter() - started) / records * 1e9
+
+
+def run(records: int) -> dict[str, float]:
+    results = {}
+    bound = logger.bind(endpoint="/bookings/phone/{id}", latency_ms=12.5, status=200)
+
+    def configure(**kwargs):
+        logger.remove()
+        logger.add(os.devnull, level="INFO", **kwargs)
+
+    # Без жодного sink-а: базова вартість виклику loguru
+    logger.remove()
+    results["no_sink"] = _measure(records, lambda: bound.info("[API] GET {} -> {}", "/bookings/phone/{id}", 200))
+
+    configure(format=_json_format)
+    results["debug_filtered"] = _measure(records, lambda: logger.debug("[BOOKING_SERVICE] Бронювання: {}", PAYLOAD))
+
+    configure(format="{time} | {level} | {message}")
+    results["text_sync"] = _measure(records, lambda: bound.info("[API] GET {} -> {}", "/bookings/phone/{id}", 200))
+
+    configure(format=_json_format)
+    results["json_sync"] = _measure(records, lambda: bound.info("[API] GET {} -> {}", "/bookings/phone/{id}", 200))
+
+    # Так працює продакшн-конфігурація: на event loop лишається тільки форматування та put у чергу
+    logger.remove()
+    sink = QueuedSink(os.devnull)
+    logger.add(sink, level="INFO", format=_json_format)
+    results["json_queued"] = _measure(records, lambda: bound.info("[API] GET {} -> {}", "/bookings/phone/{id}", 200))
+    logger.remove()
+    sink.stop()
+
+    configure(format=_json_format, enqueue=True)
+    results["json_enqueue"] = _measure(records, lambda: bound.info("[API] GET {} -> {}", "/bookings/phone/{id}", 200))
+    logger.remove()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=50_000)
+    args = parser.parse_args()
+
+    for name, ns in run(args.records).items():
+        print(f"{name:<16} {ns / 1000:8.2f} µs/запис")
+
+
+if __name__ == "__main__":
+    main()
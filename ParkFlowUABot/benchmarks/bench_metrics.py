@@ -0,0 +1,42 @@
+"""
+Накладні витрати одного спостереження метрик.
+
+Запуск (з каталогу ParkFlowUABot):
+    python -m benchmarks.bench_metrics [--observations 200000]
+"""
+import argparse
+import time
+
+from telegram_bot.monitoring.metrics import MetricsRegistry
+
+
+def _measure(observations: int, call) -> float:
+    started = time.perf_counter()
+    for _ in range(observations):
+        call()
+    return (time.perf_counter() - started) / observations * 1e9
+
+
+def run(observations: int) -> dict[str, float]:
+    registry = MetricsRegistry()
+    histogram = registry.histogram("bench_latency_seconds", "bench", ("router", "handler"))
+    counter = registry.counter("bench_total", "bench", ("function", "endpoint", "status"))
+
+    return {
+        "histogram_observe": _measure(observations, lambda: histogram.observe(0.042, "booking_handler", "select_spot")),
+        "counter_inc": _measure(observations, lambda: counter.inc("get_spot_by_id", "/parking/spot/{id}", 200)),
+        "perf_counter_pair": _measure(observations, lambda: time.perf_counter() - time.perf_counter()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--observations", type=int, default=200_000)
+    args = parser.parse_args()
+
+    for name, ns in run(args.observations).items():
+        print(f"{name:<20} {ns / 1000:8.3f} µs")
+
+
+if __name__ == "__main__":
+    main()
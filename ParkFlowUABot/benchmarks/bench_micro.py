@@ -0,0 +1,225 @@
+"""
+Мікробенчмарки чистих функцій, що виконуються на кожну взаємодію з ботом,
+зі збереженими базовими значеннями та перевіркою регресій.
+
+Кожна функція проганяється партіями (розмір партії підбирається так, щоб партія тривала
+не менше --min-time), з вимкненим GC; береться найкраща з --repeat партій —
+це найстабільніша оцінка на зашумленій машині.
+
+Запуск (з каталогу ParkFlowUABot):
+    python -m benchmarks.bench_micro --save          # зберегти базові значення
+    python -m benchmarks.bench_micro [--tolerance 0.25] [--only format_booking]
+
+Без --save порівнює з базовими значеннями і завершується з кодом 1, якщо якась функція
+стала повільнішою більше ніж на tolerance або для неї немає базового значення (перевірка
+без бази нічого б не перевіряла). Базові значення залежать від машини — зберігайте
+їх на тій самій машині, на якій перевірятимете.
+"""
+import argparse
+import asyncio
+import contextlib
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+from unittest import mock
+
+# Конфігурація і логер читаються під час імпорту telegram_bot — тиша в консолі та лог поза репозиторієм
+os.environ.setdefault("CONSOLE_LOG_LEVEL", "WARNING")
+os.environ.setdefault("LOG_FILE", os.path.join(tempfile.gettempdir(), "parkflow-bench.log"))
+
+from email.utils import format_datetime, parsedate_to_datetime  # noqa: E402
+from datetime import datetime, timedelta, timezone  # noqa: E402
+
+from telegram_bot.handlers import booking_handler, feedback_handler  # noqa: E402
+from telegram_bot.handlers.car_handler import validate_license_plate  # noqa: E402
+from telegram_bot.keyboards import menu  # noqa: E402
+from telegram_bot.keyboards.selection import id_index, resolve_selection, selection_index  # noqa: E402
+from telegram_bot.services.booking_index import BookingIndex  # noqa: E402
+from telegram_bot.services.booking_stats import aggregate_bookings  # noqa: E402
+from telegram_bot.timeutils import format_dt, format_timestamp, parse_timestamp, to_kyiv  # noqa: E402
+
+try:
+    import pytz  # лише для порівняння з попереднім способом форматування часу
+except ImportError:
+    pytz = None
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "micro.json")
+
+SPOT = {
+    "id": 17, "number": 17, "hourly_rate": 25, "parking_id": 1,
+    "occupied_from": format_datetime(datetime(2025, 6, 1, 8, tzinfo=timezone.utc)),
+    "occupied_until": format_datetime(datetime(2025, 6, 1, 10, tzinfo=timezone.utc)),
+}
+BOOKING = {
+    "id": 101, "spot_id": 17, "duration_hours": 2, "total_price": 50, "status": "paid",
+    "car": {"brand": "Volkswagen", "license_plate": "AA1234BB"},
+    "card": {"number": "4111111111111111"},
+    "created_at": "2025-06-01T08:00:00",
+}
+CITIES = [{"id": i, "name": f"Місто {i}"} for i in range(1, 21)]
+SPOTS = [{"id": i, "number": i, "hourly_rate": 20 + i % 5 * 5} for i in range(1, 21)]
+CARS = [{"id": i, "brand": "Volkswagen", "model": "Golf", "license_plate": f"AA{i:04d}BB"} for i in range(1, 6)]
+OPTIONS = [f"{spot['id']}: Місце №{spot['number']}) {spot['hourly_rate']} ціна за годину" for spot in SPOTS]
+CITIES_INDEX = id_index(CITIES)
+SPOTS_INDEX = id_index(SPOTS)
+CARS_INDEX = selection_index(CARS, booking_handler.car_label)
+FEEDBACKS = [
+    {"id": i, "user_id": i % 3 + 1, "text": f"Відгук №{i}", "timestamp": (datetime(2025, 1, 1) + timedelta(days=i)).isoformat()}
+    for i in range(1, 13)
+]
+# Довга історія частого паркувальника для фільтрів індексу
+HISTORY = [
+    {**BOOKING, "id": i, "status": ("paid", "pending", "rejected")[i % 3],
+     "created_at": (datetime(2024, 1, 1) + timedelta(hours=7 * i)).isoformat()}
+    for i in range(1, 501)
+]
+HISTORY_INDEX = BookingIndex(HISTORY)
+USERS = {i: {"id": i, "first_name": "Іван", "last_name": f"Петренко {i}"} for i in range(1, 4)}
+
+
+async def _get_user_by_id(user_id: int):
+    return USERS.get(user_id)
+
+
+def _users_in_memory():
+    # Міряємо складання тексту сторінки, а не HTTP: автори відгуків беруться з пам'яті
+    return mock.patch.object(feedback_handler, "get_user_by_id", _get_user_by_id)
+
+
+# Назва → (функція, чи асинхронна). Для вибору беремо останній варіант списку.
+CASES = {
+    "format_booking": (lambda: booking_handler.format_booking(BOOKING, {17: SPOT}), True),
+    "build_keyboard_from_list[booking_handler]": (lambda: booking_handler.build_keyboard_from_list(OPTIONS), False),
+    "build_keyboard_from_list[menu]": (lambda: menu.build_keyboard_from_list(OPTIONS), False),
+    "validate_license_plate[valid]": (lambda: validate_license_plate("AA1234BB"), False),
+    "validate_license_plate[invalid]": (lambda: validate_license_plate("AA12345B"), False),
+    "resolve_selection[city_id]": (lambda: resolve_selection(CITIES, CITIES_INDEX, str(CITIES[-1]["id"])), False),
+    "resolve_selection[spot_id]": (lambda: resolve_selection(SPOTS, SPOTS_INDEX, str(SPOTS[-1]["id"])), False),
+    "resolve_selection[select_car]": (lambda: resolve_selection(CARS, CARS_INDEX, "5: Volkswagen Golf: AA0005BB"), False),
+    "render_feedback_page": (lambda: feedback_handler.render_feedback_page(FEEDBACKS[::-1], 2, 3), True),
+    # Після першого виклику сторінка береться з кешу версії набору відгуків
+    "feedback_pages.text[cached]": (lambda: feedback_handler._feedback_pages.text("v1", FEEDBACKS[::-1], 2), True),
+    "booking_index.select[week]": (lambda: HISTORY_INDEX.select(datetime(2024, 3, 1), datetime(2024, 3, 8)), False),
+    "booking_index.select[status]": (lambda: HISTORY_INDEX.select(status="pending"), False),
+    "booking_stats.aggregate[500]": (lambda: aggregate_bookings(HISTORY_INDEX), False),
+    "timestamp[parse_timestamp]": (lambda: format_dt(to_kyiv(parse_timestamp(SPOT["occupied_from"]))), False),
+    "timestamp[parse_timestamp,iso]": (lambda: format_dt(to_kyiv(parse_timestamp(BOOKING["created_at"]))), False),
+    "timestamp[format_timestamp]": (lambda: format_timestamp(SPOT["occupied_from"]), False),
+}
+if pytz is not None:
+    # Як format_booking форматував час до timeutils: новий pytz-об'єкт і parsedate_to_datetime на кожен виклик
+    CASES["timestamp[pytz+parsedate]"] = (
+        lambda: parsedate_to_datetime(SPOT["occupied_from"])
+        .astimezone(pytz.timezone("Europe/Kyiv")).strftime("%d.%m.%Y %H:%M"),
+        False,
+    )
+
+# Оточення, в якому проганяється бенчмарк (за замовчуванням — без змін)
+SETUP = {
+    "render_feedback_page": _users_in_memory,
+    "feedback_pages.text[cached]": _users_in_memory,
+}
+
+
+def _batch(call, number: int) -> float:
+    started = time.perf_counter()
+    for _ in range(number):
+        call()
+    return time.perf_counter() - started
+
+
+async def _batch_async(call, number: int) -> float:
+    started = time.perf_counter()
+    for _ in range(number):
+        await call()
+    return time.perf_counter() - started
+
+
+def measure(call, is_async: bool, repeat: int, min_time: float) -> float:
+    """
+    Найкращий час одного виклику в наносекундах.
+    """
+    loop = asyncio.new_event_loop() if is_async else None
+
+    def batch(number: int) -> float:
+        return loop.run_until_complete(_batch_async(call, number)) if is_async else _batch(call, number)
+
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        number = 1
+        while batch(number) < min_time:
+            number *= 2
+        best = min(batch(number) for _ in range(repeat))
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+        if loop is not None:
+            loop.close()
+    return best / number * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="файл з базовими значеннями")
+    parser.add_argument("--save", action="store_true", help="зберегти поточні результати як базові")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="допустиме сповільнення, частка (0.25 = +25%%)")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--min-time", type=float, default=0.2, help="мінімальна тривалість однієї партії, с")
+    parser.add_argument("--only", action="append", help="запустити лише вказані бенчмарки")
+    args = parser.parse_args()
+
+    names = args.only or list(CASES)
+    unknown = set(names) - set(CASES)
+    if unknown:
+        parser.error(f"невідомі бенчмарки: {', '.join(sorted(unknown))}")
+
+    baseline = {}
+    if not args.save and os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+
+    results = {}
+    regressions = []
+    unchecked = []
+    for name in names:
+        call, is_async = CASES[name]
+        with SETUP.get(name, contextlib.nullcontext)():
+            ns = results[name] = round(measure(call, is_async, args.repeat, args.min_time), 1)
+        line = f"{name:<42} {ns / 1000:10.3f} µs"
+        if name in baseline:
+            ratio = ns / baseline[name]
+            line += f"   базово {baseline[name] / 1000:10.3f} µs   x{ratio:.2f}"
+            if ratio > 1 + args.tolerance:
+                regressions.append(name)
+                line += "   ❌ РЕГРЕСІЯ"
+        elif not args.save:
+            unchecked.append(name)
+        print(line)
+
+    if args.save:
+        saved = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as file:
+                saved = json.load(file)
+        saved.update(results)
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump(saved, file, ensure_ascii=False, indent=2, sort_keys=True)
+        print(f"Базові значення збережено: {args.baseline}")
+    elif not baseline:
+        print(f"Базових значень немає ({args.baseline}) — запустіть з --save")
+    elif unchecked:
+        print(f"Немає базових значень для: {', '.join(unchecked)} — запустіть з --save")
+
+    if regressions:
+        print(f"Сповільнення понад {args.tolerance:.0%}: {', '.join(regressions)}")
+    if regressions or unchecked:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""
+Локальний фейковий ParkFlow API для бенчмарків: ті самі ендпоінти, що викликають services/*,
+стан у пам'яті по номеру телефону, налаштовувані затримка та частка помилок 5xx.
+"""
+import asyncio
+import hashlib
+import json as jsonlib
+import random
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+from aiohttp import web
+
+CITIES = [{"id": i, "name": f"Місто {i}"} for i in range(1, 6)]
+PARKINGS = [{"id": i, "name": f"Паркінг {i}", "city_id": (i % len(CITIES)) + 1} for i in range(1, 26)]
+SPOTS_PER_PARKING = 20
+
+
+def _spot(spot_id: int) -> dict:
+    occupied_from = datetime(2025, 6, 1, 8, tzinfo=timezone.utc) + timedelta(hours=spot_id % 12)
+    return {
+        "id": spot_id,
+        "number": (spot_id - 1) % SPOTS_PER_PARKING + 1,
+        "parking_id": (spot_id - 1) // SPOTS_PER_PARKING + 1,
+        "hourly_rate": 20 + spot_id % 5 * 5,
+        "occupied_from": format_datetime(occupied_from),
+        "occupied_until": format_datetime(occupied_from + timedelta(hours=2)),
+    }
+
+
+class FakeParkFlowState:
+    def __init__(self, bookings_per_user: int = 7, feedbacks: int = 12):
+        self.bookings_per_user = bookings_per_user
+        self.users: dict[str, dict] = {}
+        self.cars: dict[str, list[dict]] = {}
+        self.cards: dict[str, list[dict]] = {}
+        self.bookings: dict[str, list[dict]] = {}
+        self.feedback: list[dict] = []
+        self._ids = iter(range(1, 10**9))
+        author = self.add_user("+380990000000", "Автор", "Відгуків")
+        base = datetime(2025, 1, 1)
+        for i in range(feedbacks):
+            self.feedback.append({
+                "id": next(self._ids), "user_id": author["id"], "text": f"Відгук №{i + 1}",
+                "timestamp": (base + timedelta(days=i)).isoformat(),
+            })
+
+    def add_user(self, phone: str, first_name: str, last_name: str) -> dict:
+        """
+        Реєструє користувача з одним авто, однією карткою та кількома бронюваннями,
+        щоб сценарії бронювання й історії мали з чим працювати.
+        """
+        user = {"id": next(self._ids), "first_name": first_name, "last_name": last_name,
+                "phone_number": phone, "email": None}
+        self.users[phone] = user
+        car = {"id": next(self._ids), "brand": "Volkswagen", "model": "Golf", "year": 2015,
+               "license_plate": f"AA{user['id'] % 10000:04d}BB"}
+        card = {"id": next(self._ids), "number": f"4111{user['id']:012d}", "exp_date": "12/30"}
+        self.cars[phone] = [car]
+        self.cards[phone] = [card]
+        base = datetime(2025, 1, 1)
+        self.bookings[phone] = [
+            {"id": next(self._ids), "spot_id": i % (len(PARKINGS) * SPOTS_PER_PARKING) + 1, "car": car, "card": card,
+             "duration_hours": 2, "total_price": 40, "status": ("paid", "pending", "rejected")[i % 3],
+             "created_at": (base + timedelta(days=i)).isoformat()}
+            for i in range(self.bookings_per_user)
+        ]
+        return user
+
+    def next_id(self) -> int:
+        return next(self._ids)
+
+
+def make_fake_api(
+    state: FakeParkFlowState,
+    latency: float = 0.0,
+    jitter: float = 0.0,
+    error_rate: float = 0.0,
+    seed: int | None = None,
+) -> web.Application:
+    """
+    latency/jitter — затримка відповіді в секундах (рівномірно в межах latency ± jitter),
+    error_rate — частка запитів, на які API відповідає 500. Кількість викликів і
+    згенерованих помилок, а також відповідей 304 на умовні запити — у app["stats"].
+    """
+    rng = random.Random(seed)
+    stats = {"calls": 0, "errors": 0, "not_modified": 0}
+
+    @web.middleware
+    async def chaos(request: web.Request, handler):
+        stats["calls"] += 1
+        delay = latency + rng.uniform(-jitter, jitter) if jitter else latency
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if error_rate and rng.random() < error_rate:
+            stats["errors"] += 1
+            return web.json_response({"detail": "Injected error"}, status=500)
+        return await handler(request)
+
+    app = web.Application(middlewares=[chaos])
+    app["stats"] = stats
+    json = web.json_response
+
+    def cacheable(request: web.Request, data) -> web.Response:
+        # Списки віддаються з ETag (відбиток тіла); збіг з If-None-Match — 304 без тіла
+        body = jsonlib.dumps(data)
+        etag = f'"{hashlib.sha1(body.encode()).hexdigest()[:16]}"'
+        if request.headers.get("If-None-Match") == etag:
+            stats["not_modified"] += 1
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.Response(text=body, content_type="application/json", headers={"ETag": etag})
+
+    async def health(request):
+        return json({"status": "ok"})
+
+    async def user_by_phone(request):
+        user = state.users.get(request.query.get("phone_number"))
+        return json(user) if user else json({"detail": "User not found"}, status=404)
+
+    async def user_by_id(request):
+        user_id = int(request.match_info["user_id"])
+        user = next((u for u in state.users.values() if u["id"] == user_id), None)
+        return json(user) if user else json({"detail": "User not found"}, status=404)
+
+    async def register_user(request):
+        data = await request.json()
+        user = state.add_user(data["phone_number"], data.get("first_name", ""), data.get("last_name", ""))
+        return json(user, status=201)
+
+    async def update_user(request):
+        user = state.users.get(request.query.get("phone_number"))
+        if not user:
+            return json({"detail": "User not found"}, status=404)
+        user.update(await request.json())
+        return json(user)
+
+    async def cities(request):
+        return cacheable(request, CITIES)
+
+    async def parkings(request):
+        return cacheable(request, PARKINGS)
+
+    async def available_spots(request):
+        parking_id = int(request.query["parking_id"])
+        first = (parking_id - 1) * SPOTS_PER_PARKING + 1
+        return json([_spot(spot_id) for spot_id in range(first, first + SPOTS_PER_PARKING)])
+
+    async def spot(request):
+        return json(_spot(int(request.match_info["spot_id"])))
+
+    async def spots_by_ids(request):
+        ids = [int(spot_id) for spot_id in request.query.get("ids", "").split(",") if spot_id]
+        return json([_spot(spot_id) for spot_id in ids])
+
+    async def list_cars(request):
+        return cacheable(request, state.cars.get(request.match_info["phone"], []))
+
+    async def add_car(request):
+        cars = state.cars.setdefault(request.match_info["phone"], [])
+        data = await request.json()
+        if any(c["license_plate"] == data["license_plate"] for c in cars):
+            return json({"message": "Авто з таким номером вже додано"})
+        car = {"id": state.next_id(), **data}
+        cars.append(car)
+        return json(car, status=201)
+
+    async def car_by_plate(request):
+        cars = state.cars.get(request.match_info["phone"], [])
+        car = next((c for c in cars if c["license_plate"] == request.match_info["plate"]), None)
+        if not car:
+            return json({"detail": "Car not found"}, status=404)
+        if request.method == "DELETE":
+            cars.remove(car)
+        else:
+            car.update(await request.json())
+        return json({"message": "ok"})
+
+    async def list_cards(request):
+        return cacheable(request, state.cards.get(request.match_info["phone"], []))
+
+    async def add_card(request):
+        cards = state.cards.setdefault(request.match_info["phone"], [])
+        data = await request.json()
+        if any(c["number"] == data["number"] for c in cards):
+            return json({"message": "Картка вже існує"})
+        card = {"id": state.next_id(), "number": data["number"], "exp_date": data["exp_date"]}
+        cards.append(card)
+        return json(card, status=201)
+
+    async def card_by_id(request):
+        card_id = int(request.match_info["card_id"])
+        for cards in state.cards.values():
+            card = next((c for c in cards if c["id"] == card_id), None)
+            if card:
+                if request.method == "DELETE":
+                    cards.remove(card)
+                else:
+                    card.update(await request.json())
+                return json({"message": "ok"})
+        return json({"detail": "Card not found"}, status=404)
+
+    async def list_bookings(request):
+        bookings = state.bookings.get(request.match_info["phone"], [])
+        if "limit" not in request.query:
+            return json(bookings)
+        # Пагінація як у get_user_bookings_page: новіші першими, курсор — непрозорий рядок (тут зсув)
+        ordered = sorted(bookings, key=lambda b: b["created_at"], reverse=True)
+        offset = int(request.query.get("cursor", 0))
+        end = offset + int(request.query["limit"])
+        return json({
+            "items": ordered[offset:end],
+            "next_cursor": str(end) if end < len(ordered) else None,
+            "total": len(ordered),
+        })
+
+    async def create_booking(request):
+        phone = request.match_info["phone"]
+        data = await request.json()
+        car = next((c for c in state.cars.get(phone, []) if c["id"] == data["car_id"]), {})
+        card = next((c for c in state.cards.get(phone, []) if c["id"] == data["card_id"]), {})
+        booking = {
+            "id": state.next_id(), "spot_id": data["spot_id"], "car": car, "card": card,
+            "duration_hours": data["duration_hours"], "total_price": data["duration_hours"] * 20,
+            "status": "pending", "created_at": datetime.now().isoformat(),
+        }
+        state.bookings.setdefault(phone, []).append(booking)
+        return json(booking, status=201)
+
+    async def list_feedback(request):
+        return cacheable(request, state.feedback)
+
+    async def add_feedback(request):
+        data = await request.json()
+        feedback = {"id": state.next_id(), "timestamp": datetime.now().isoformat(), **data}
+        state.feedback.append(feedback)
+        return json(feedback, status=201)
+
+    router = app.router
+    router.add_get("/health", health)
+    router.add_get("/users/by-phone", user_by_phone)
+    router.add_get("/users/{user_id:\\d+}", user_by_id)
+    router.add_post("/users/register", register_user)
+    router.add_put("/users/update", update_user)
+    router.add_get("/parking/cities", cities)
+    router.add_get("/parking/parkings", parkings)
+    router.add_get("/parking/spots/available", available_spots)
+    router.add_get("/parking/spot/{spot_id:\\d+}", spot)
+    router.add_get("/parking/spots", spots_by_ids)
+    router.add_get("/cars/phone/{phone}", list_cars)
+    router.add_post("/cars/phone/{phone}", add_car)
+    router.add_route("*", "/cars/phone/{phone}/{plate}", car_by_plate)
+    router.add_get("/cards/phone/{phone}", list_cards)
+    router.add_post("/cards/phone/{phone}", add_card)
+    router.add_route("*", "/cards/{card_id:\\d+}", card_by_id)
+    router.add_get("/bookings/phone/{phone}", list_bookings)
+    router.add_post("/bookings/phone/{phone}", create_booking)
+    router.add_get("/feedback", list_feedback)
+    router.add_post("/feedback", add_feedback)
+    return app
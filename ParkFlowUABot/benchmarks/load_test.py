@@ -0,0 +1,375 @@
+"""
+Навантажувальний бенчмарк: N віртуальних користувачів паралельно проходять реальні сценарії
+(майстер бронювання SpotState, CRUD авто та карток, перегляд відгуків) через справжній
+Dispatcher з create_dispatcher(). Замість Telegram — FakeTelegramSession, замість ParkFlow API —
+локальний aiohttp-сервер з benchmarks.fake_api з налаштовуваними затримкою та помилками.
+
+З --cassette замість фейкового API відповіді відтворюються з касети, записаної через
+API_RECORD_PATH (services/cassette.py), з оригінальними затримками та розмірами payload.
+
+--faults вмикає інʼєкцію збоїв на боці клієнта (API_FAULTS, services/faults.py), щоб побачити,
+як деградують пропускна здатність і хвіст затримок, коли бекенд поводиться погано.
+
+Результат — JSON (updates/s, p50/p95/p99 обробки апдейту, запити до API на апдейт, пікова RSS)
+для відстеження регресій між релізами.
+
+Запуск (з каталогу ParkFlowUABot):
+    python -m benchmarks.load_test [--users 50] [--rounds 3] [--api-latency 20] [--error-rate 0.01]
+                                   [--scenarios booking,cars,cards,feedback] [--output result.json]
+    python -m benchmarks.load_test --cassette prod.cassette.jsonl [--replay-speed 1]
+    python -m benchmarks.load_test --faults "latency=0.5:0.2@/feedback,reset:0.05,malformed:0.05"
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from aiogram.client.session.base import BaseSession
+from aiogram.methods import AnswerCallbackQuery, DeleteMessage
+from aiogram.types import (
+    CallbackQuery,
+    Chat,
+    Contact,
+    InlineKeyboardMarkup,
+    Message,
+    ReplyKeyboardMarkup,
+    Update,
+    User,
+)
+from aiohttp import web
+
+from benchmarks.fake_api import FakeParkFlowState, make_fake_api
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+SCENARIOS = ("booking", "cars", "cards", "feedback")
+
+
+class ScenarioAborted(Exception):
+    """Бот відповів не тим, чого чекає сценарій (наприклад, через згенеровану помилку API)."""
+
+
+class FakeTelegramSession(BaseSession):
+    """
+    Сесія Bot API без мережі: кожен запит «успішний», а остання reply-клавіатура
+    та inline-кнопки запам'ятовуються для чату, щоб віртуальний користувач міг їх натискати.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        super().__init__()
+        self.latency = latency
+        self.requests = 0
+        self.keyboards: dict[int, list[str]] = {}
+        self.callbacks: dict[int, list[str]] = {}
+        self._message_ids = itertools.count(1)
+
+    async def make_request(self, bot, method, timeout=None):
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        chat_id = getattr(method, "chat_id", None)
+        markup = getattr(method, "reply_markup", None)
+        if isinstance(markup, ReplyKeyboardMarkup):
+            self.keyboards[chat_id] = [button.text for row in markup.keyboard for button in row]
+        elif isinstance(markup, InlineKeyboardMarkup):
+            self.callbacks.setdefault(chat_id, []).extend(
+                button.callback_data for row in markup.inline_keyboard for button in row if button.callback_data
+            )
+
+        if isinstance(method, (AnswerCallbackQuery, DeleteMessage)):
+            return True
+        return Message(
+            message_id=next(self._message_ids),
+            date=datetime.now(),
+            chat=Chat(id=chat_id or 0, type="private"),
+            text=getattr(method, "text", None),
+        )
+
+    async def stream_content(self, *args, **kwargs):
+        yield b""
+
+    async def close(self):
+        pass
+
+
+class VirtualUser:
+    def __init__(self, harness: "LoadHarness", telegram_id: int, phone: str, rng: random.Random):
+        self.harness = harness
+        self.rng = rng
+        self.phone = phone
+        self.user = User(id=telegram_id, is_bot=False, first_name="Бенчмарк")
+        self.chat = Chat(id=telegram_id, type="private")
+
+    def _message(self, **kwargs) -> Message:
+        return Message(
+            message_id=next(self.harness.ids), date=datetime.now(), chat=self.chat, from_user=self.user, **kwargs
+        )
+
+    async def send(self, text: str):
+        await self.harness.feed(Update(update_id=next(self.harness.ids), message=self._message(text=text)))
+
+    async def share_contact(self):
+        contact = Contact(phone_number=self.phone, first_name="Бенчмарк", user_id=self.user.id)
+        await self.harness.feed(Update(update_id=next(self.harness.ids), message=self._message(contact=contact)))
+
+    async def press(self, prefix: str):
+        callbacks = self.harness.session.callbacks.pop(self.chat.id, [])
+        data = next((c for c in reversed(callbacks) if c.startswith(prefix)), None)
+        if data is None:
+            raise ScenarioAborted(f"немає inline-кнопки {prefix}")
+        await self.tap(data)
+
+    async def tap(self, data: str):
+        callback = CallbackQuery(
+            id=str(next(self.harness.ids)), from_user=self.user, chat_instance=str(self.chat.id), data=data,
+            message=self._message(text="…"),
+        )
+        await self.harness.feed(Update(update_id=next(self.harness.ids), callback_query=callback))
+
+    async def pick_inline(self, step: str):
+        # Місто, паркінг і місце обираються інлайн-кнопками "spot:<крок>:<id>" (без стрілок гортання)
+        prefix = f"spot:{step}:"
+        callbacks = self.harness.session.callbacks.pop(self.chat.id, [])
+        options = [c for c in callbacks if c.startswith(prefix) and not c.startswith(prefix + "page:")]
+        if not options:
+            raise ScenarioAborted(f"немає inline-кнопок {prefix}")
+        await self.tap(self.rng.choice(options))
+
+    async def pick_option(self):
+        # Варіанти вибору в reply-клавіатурах майстра починаються з ID або числа: "1: VW Golf: AA1234BB", "2 годин"
+        options = [text for text in self.harness.session.keyboards.get(self.chat.id, []) if text[:1].isdigit()]
+        if not options:
+            raise ScenarioAborted("немає варіантів для вибору")
+        await self.send(self.rng.choice(options))
+
+    async def booking(self):
+        await self.send("📍 Перевірити доступні місця")
+        for step in ("c", "p", "s"):
+            await self.pick_inline(step)
+        for _ in ("авто", "картка", "тривалість"):
+            await self.pick_option()
+        await self.send("✅ Так")
+        await self.send("ℹ️ Статус бронювання")
+        await self.press("bk:page:2")
+        # Повернення на вже показану сторінку береться з кешу тексту сторінок
+        await self.press("bk:page:1")
+        await self.send("🏠 Головне меню")
+
+    async def cars(self):
+        plate = f"KA{self.rng.randrange(10000):04d}XX"
+        await self.send("🚘 Мої авто")
+        await self.send("📋 Список авто")
+        for text in ("🚘 Додати авто", "Toyota", "Corolla", "2018", plate):
+            await self.send(text)
+        await self.send("🗑 Видалити авто")
+        await self.press(f"delete:{plate}")
+        await self.send("⬅️ Назад до меню")
+
+    async def cards(self):
+        number = "5168" + "".join(self.rng.choice("0123456789") for _ in range(12))
+        await self.send("💳 Картки")
+        for text in ("➕ Додати картку", number, "12/29", "123"):
+            await self.send(text)
+        await self.send("📋 Мої картки")
+        await self.send("❌ Видалити картку")
+        await self.press("delete_card:")
+        await self.send("⬅️ Назад до меню")
+
+    async def feedback(self):
+        await self.send("📣 Відгуки")
+        await self.send("📖 Всі відгуки")
+        await self.press("fb:page:2")
+        await self.press("fb:page:1")
+        await self.send("📋 Меню відгуків")
+        await self.send("🏠 Головне меню")
+
+    async def run(self, scenarios: list[str], rounds: int):
+        await self.send("/start")
+        await self.share_contact()
+        for _ in range(rounds):
+            for name in self.rng.sample(scenarios, len(scenarios)):
+                self.harness.current[self.chat.id] = name
+                try:
+                    await getattr(self, name)()
+                except ScenarioAborted:
+                    self.harness.aborted[name] += 1
+                    await self.send("🏠 Головне меню")
+                else:
+                    self.harness.completed[name] += 1
+
+
+class LoadHarness:
+    def __init__(self, dispatcher, bot, session: FakeTelegramSession):
+        self.dispatcher = dispatcher
+        self.bot = bot
+        self.session = session
+        self.ids = itertools.count(1)
+        self.latencies: dict[str, list[float]] = {}
+        self.current: dict[int, str] = {}
+        self.completed: dict[str, int] = {name: 0 for name in SCENARIOS}
+        self.aborted: dict[str, int] = {name: 0 for name in SCENARIOS}
+        self.errors = 0
+
+    async def feed(self, update: Update):
+        chat_id = (update.message or update.callback_query.message).chat.id
+        started = time.perf_counter()
+        try:
+            await self.dispatcher.feed_update(self.bot, update)
+        except Exception:
+            self.errors += 1
+        self.latencies.setdefault(self.current.get(chat_id, "onboarding"), []).append(
+            (time.perf_counter() - started) * 1000
+        )
+
+
+def _percentiles(samples: list[float]) -> dict[str, float]:
+    if len(samples) < 2:
+        # quantiles() потребує двох точок; одна вибірка — це й медіана, і хвіст
+        value = round(samples[0], 3) if samples else 0.0
+        return {"p50": value, "p95": value, "p99": value, "max": value}
+    # inclusive — перцентилі в межах вибірки (exclusive екстраполює й дає p99 > max)
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {
+        "p50": round(cuts[49], 3),
+        "p95": round(cuts[94], 3),
+        "p99": round(cuts[98], 3),
+        "max": round(max(samples), 3),
+    }
+
+
+def _peak_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss: кілобайти на Linux, байти на macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+async def run(args) -> dict:
+    state = FakeParkFlowState()
+    runner = None
+    workdir = tempfile.mkdtemp(prefix="parkflow-load-")
+    if args.cassette:
+        os.environ["API_BASE_URL"] = "http://parkflow-replay"
+        os.environ["API_REPLAY_PATH"] = args.cassette
+        os.environ["API_REPLAY_SPEED"] = str(args.replay_speed)
+    else:
+        api = make_fake_api(
+            state, latency=args.api_latency / 1000, jitter=args.api_jitter / 1000, error_rate=args.error_rate, seed=args.seed
+        )
+        runner = web.AppRunner(api)
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", 0).start()
+        host, port = runner.addresses[0][:2]
+        os.environ["API_BASE_URL"] = f"http://{host}:{port}"
+
+    # Конфігурація бота читається під час імпорту, тож імпортуємо його лише після налаштування оточення
+    os.environ.setdefault("BOT_TOKEN", "42:BENCHMARK")
+    os.environ.setdefault("IDENTITY_STORE_PATH", os.path.join(workdir, "identity_map.json"))
+    os.environ.setdefault("LOG_FILE", os.path.join(workdir, "telegram_bot.log"))
+    os.environ.setdefault("CONSOLE_LOG_LEVEL", "WARNING")
+    if args.faults:
+        os.environ["API_FAULTS"] = args.faults
+    from telegram_bot.bot import create_bot, create_dispatcher
+    from telegram_bot.monitoring.metrics import FAULTS_INJECTED
+
+    session = FakeTelegramSession(latency=args.telegram_latency / 1000)
+    harness = LoadHarness(create_dispatcher(), create_bot(session=session), session)
+    rng = random.Random(args.seed)
+    users = []
+    for i in range(args.users):
+        phone = f"+38067{i:07d}"
+        state.add_user(phone, "Бенчмарк", f"№{i}")
+        users.append(VirtualUser(harness, 100_000 + i, phone, random.Random(rng.random())))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(user.run(args.scenarios, args.rounds) for user in users))
+    elapsed = time.perf_counter() - started
+    if runner is not None:
+        await runner.cleanup()
+        api_calls, api_errors = api["stats"]["calls"], api["stats"]["errors"]
+        api_not_modified = api["stats"]["not_modified"]
+    else:
+        from telegram_bot.services.api_service import get_replay_session
+        api_calls, api_errors, api_not_modified = get_replay_session().cassette.served, 0, 0
+
+    all_latencies = [latency for samples in harness.latencies.values() for latency in samples]
+    updates = len(all_latencies)
+    return {
+        "config": {
+            "users": args.users,
+            "rounds": args.rounds,
+            "scenarios": args.scenarios,
+            "api_latency_ms": args.api_latency,
+            "api_jitter_ms": args.api_jitter,
+            "telegram_latency_ms": args.telegram_latency,
+            "error_rate": args.error_rate,
+            "seed": args.seed,
+            "cassette": args.cassette,
+            "faults": args.faults,
+        },
+        "duration_s": round(elapsed, 3),
+        "updates": updates,
+        "updates_per_s": round(updates / elapsed, 1) if elapsed else 0.0,
+        "latency_ms": _percentiles(all_latencies),
+        "api_calls": api_calls,
+        "api_calls_per_update": round(api_calls / updates, 3) if updates else 0.0,
+        "api_not_modified": api_not_modified,
+        "api_errors_injected": api_errors,
+        "client_faults_injected": int(FAULTS_INJECTED.total()),
+        "telegram_requests": session.requests,
+        "update_errors": harness.errors,
+        "peak_rss_mb": _peak_rss_mb(),
+        "scenarios": {
+            name: {
+                "completed": harness.completed.get(name, 0),
+                "aborted": harness.aborted.get(name, 0),
+                "updates": len(samples),
+                "latency_ms": _percentiles(samples),
+            }
+            for name, samples in harness.latencies.items()
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=50, help="кількість віртуальних користувачів")
+    parser.add_argument("--rounds", type=int, default=3, help="скільки разів кожен проходить усі сценарії")
+    parser.add_argument("--scenarios", type=lambda s: s.split(","), default=list(SCENARIOS))
+    parser.add_argument("--api-latency", type=float, default=20.0, help="затримка фейкового API, мс")
+    parser.add_argument("--api-jitter", type=float, default=5.0, help="розкид затримки API, мс")
+    parser.add_argument("--telegram-latency", type=float, default=0.0, help="затримка відповіді Bot API, мс")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="частка відповідей 500 від API")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--cassette", help="відтворювати відповіді API з касети замість фейкового API")
+    parser.add_argument("--faults", help="правила API_FAULTS для інʼєкції збоїв на боці клієнта")
+    parser.add_argument("--replay-speed", type=float, default=1.0, help="прискорення затримок касети (0 — без затримок)")
+    parser.add_argument("--output", help="куди додатково зберегти JSON-результат")
+    args = parser.parse_args()
+
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"невідомі сценарії: {', '.join(sorted(unknown))}")
+
+    result = asyncio.run(run(args))
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
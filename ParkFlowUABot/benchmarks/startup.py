@@ -0,0 +1,199 @@
+"""
+Звіт про час запуску бота: скільки коштує імпорт кожного модуля та скільки минає
+від старту процесу до обробки першого апдейту — окремо з ледачими router-ами (LAZY_ROUTERS)
+і без них.
+
+Кожен замір — окремий процес `python -m benchmarks.startup --probe`, що імпортує telegram_bot.bot,
+створює Dispatcher і проганяє через нього /start, а потім перше повідомлення «📣 Відгуки»
+(саме воно в ледачому режимі підвантажує feedback_handler). Telegram замінено сесією без мережі,
+API_BASE_URL вказує на закритий порт, тож мережа не впливає на результат.
+
+Імпорт бібліотек (aiogram, aiohttp, pydantic) міряється окремо від імпорту telegram_bot:
+перший займає секунди й однаковий в обох режимах, LAZY_ROUTERS впливає лише на другий.
+
+Як і в bench_micro, для кожного етапу береться найкращий із --runs процесів: час імпорту
+на зашумленій машині коливається на сотні мілісекунд, мінімум стабільніший.
+
+Розбивка за модулями береться з `python -X importtime` того ж процесу: власний час модуля
+(self) та разом із залежностями (cumulative).
+
+Запуск (з каталогу ParkFlowUABot):
+    python -m benchmarks.startup [--runs 5] [--top 20] [--output startup.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+MODES = {"eager": "", "lazy": "feedback_handler,settings_handler"}
+
+
+def _probe():
+    """Виконується в дочірньому процесі: друкує JSON з часом етапів, мс."""
+    started = time.perf_counter()
+
+    from datetime import datetime
+
+    from aiogram.client.session.base import BaseSession
+    from aiogram.methods import AnswerCallbackQuery, DeleteMessage
+    from aiogram.types import Chat, Message, Update, User
+    import aiohttp.web  # noqa: F401
+    # aiogram.types будує pydantic-моделі всіх типів Bot API — це нижня межа старту, на яку бот не впливає
+    libraries = time.perf_counter()
+
+    from telegram_bot.bot import create_bot, create_dispatcher
+    imported = time.perf_counter()
+
+    dispatcher = create_dispatcher()
+    created = time.perf_counter()
+
+    class NullSession(BaseSession):
+        async def make_request(self, bot, method, timeout=None):
+            if isinstance(method, (AnswerCallbackQuery, DeleteMessage)):
+                return True
+            return Message(
+                message_id=1, date=datetime.now(),
+                chat=Chat(id=getattr(method, "chat_id", 0) or 0, type="private"),
+                text=getattr(method, "text", None),
+            )
+
+        async def stream_content(self, *args, **kwargs):
+            yield b""
+
+        async def close(self):
+            pass
+
+    user = User(id=1, is_bot=False, first_name="Startup")
+    chat = Chat(id=1, type="private")
+
+    def update(update_id: int, text: str) -> Update:
+        return Update(
+            update_id=update_id,
+            message=Message(message_id=update_id, date=datetime.now(), chat=chat, from_user=user, text=text),
+        )
+
+    async def run():
+        bot = create_bot(session=NullSession())
+        await dispatcher.feed_update(bot, update(1, "/start"))
+        first = time.perf_counter()
+        await dispatcher.feed_update(bot, update(2, "📣 Відгуки"))
+        return first, time.perf_counter()
+
+    first_update, first_feedback = asyncio.run(run())
+    print(json.dumps({
+        "libraries_import_ms": (libraries - started) * 1000,
+        "bot_import_ms": (imported - libraries) * 1000,
+        "dispatcher_ms": (created - imported) * 1000,
+        "first_update_ms": (first_update - created) * 1000,
+        "time_to_first_update_ms": (first_update - started) * 1000,
+        "first_feedback_ms": (first_feedback - first_update) * 1000,
+    }))
+
+
+def _run_probe(lazy_routers: str, importtime: bool = False) -> tuple[dict, str, float]:
+    workdir = tempfile.mkdtemp(prefix="parkflow-startup-")
+    env = dict(
+        os.environ,
+        BOT_TOKEN="42:STARTUP",
+        API_BASE_URL="http://127.0.0.1:9",
+        CONSOLE_LOG_LEVEL="WARNING",
+        LOG_FILE=os.path.join(workdir, "bot.log"),
+        IDENTITY_STORE_PATH=os.path.join(workdir, "identity_map.json"),
+        METRICS_PORT="0",
+        LOOP_MONITOR_INTERVAL="0",
+        LAZY_ROUTERS=lazy_routers,
+    )
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-m", "benchmarks.startup", "--probe"]
+    started = time.perf_counter()
+    result = subprocess.run(command, env=env, capture_output=True, text=True, encoding="utf-8", check=True)
+    wall_ms = (time.perf_counter() - started) * 1000
+    return json.loads(result.stdout.strip().splitlines()[-1]), result.stderr, wall_ms
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int]]:
+    """
+    Рядки `import time: self [us] | cumulative | imported package` → [(модуль, self_us, cumulative_us)].
+    """
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        if not self_us.strip().isdigit():
+            continue  # заголовок
+        modules.append((name.strip(), int(self_us), int(cumulative_us)))
+    return modules
+
+
+def _print_modules(title: str, rows: list[tuple[str, int, int]]):
+    print(f"\n{title}")
+    print(f"  {'self, мс':>9} {'cumul., мс':>10}  модуль")
+    for name, self_us, cumulative_us in rows:
+        print(f"  {self_us / 1000:9.1f} {cumulative_us / 1000:10.1f}  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--probe", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--runs", type=int, default=5, help="кількість процесів на режим (береться найкращий)")
+    parser.add_argument("--top", type=int, default=20, help="скільки найдорожчих модулів показати")
+    parser.add_argument("--output", help="записати результат у JSON-файл")
+    args = parser.parse_args()
+
+    if args.probe:
+        _probe()
+        return
+
+    report = {"modes": {}, "modules": [], "packages": {}}
+    # Режими чергуються, щоб дрейф навантаження машини однаково зачіпав обидва
+    all_runs = {mode: [] for mode in MODES}
+    for _ in range(args.runs):
+        for mode, lazy_routers in MODES.items():
+            all_runs[mode].append(_run_probe(lazy_routers))
+    for mode, runs in all_runs.items():
+        stages = {key: min(run[0][key] for run in runs) for key in runs[0][0]}
+        stages["process_wall_ms"] = min(run[2] for run in runs)
+        report["modes"][mode] = {key: round(value, 1) for key, value in stages.items()}
+
+    _, stderr, _ = _run_probe(MODES["eager"], importtime=True)
+    modules = parse_importtime(stderr)
+    packages: defaultdict[str, int] = defaultdict(int)
+    for name, self_us, _ in modules:
+        packages[name.split(".", 1)[0]] += self_us
+    report["modules"] = [
+        {"module": name, "self_ms": self_us / 1000, "cumulative_ms": cumulative_us / 1000}
+        for name, self_us, cumulative_us in modules
+    ]
+    report["packages"] = {name: total / 1000 for name, total in sorted(packages.items(), key=lambda item: -item[1])}
+
+    print(f"Найкращий з {args.runs} процесів, мс:")
+    stage_names = list(report["modes"]["eager"])
+    print(f"  {'етап':<26}" + "".join(f"{mode:>10}" for mode in MODES))
+    for stage in stage_names:
+        print(f"  {stage:<26}" + "".join(f"{report['modes'][mode][stage]:10.1f}" for mode in MODES))
+
+    _print_modules(
+        f"Найдорожчі модулі за власним часом імпорту (топ {args.top}):",
+        sorted(modules, key=lambda row: -row[1])[:args.top],
+    )
+    _print_modules(
+        "Модулі telegram_bot:",
+        sorted((row for row in modules if row[0].startswith("telegram_bot")), key=lambda row: -row[2]),
+    )
+    print("\nВласний час імпорту за пакетами, мс:")
+    for name, total in list(report["packages"].items())[:args.top]:
+        print(f"  {total:9.1f}  {name}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+        print(f"\nЗвіт збережено: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,83 @@
 # telegram_bot/bot.py
 
 import asyncio
+import signal
 from aiogram import Bot, Dispatcher
-from telegram_bot.config import BOT_TOKEN
+from aiogram.fsm.storage.memory import MemoryStorage
+from telegram_bot.config import BOT_TOKEN, LOOP_BLOCK_THRESHOLD, LOOP_MONITOR_INTERVAL, METRICS_HOST, METRICS_PORT
 from telegram_bot.handlers import all_handlers
+from telegram_bot.middlewares.log_context import LogContextMiddleware
+from telegram_bot.middlewares.metrics import HandlerMetricsMiddleware, TelegramRequestMetricsMiddleware
+from telegram_bot.middlewares.slow_handler import SlowHandlerMiddleware
+from telegram_bot.middlewares.tracing import (
+    HandlerTracingMiddleware,
+    TelegramRequestTracingMiddleware,
+    UpdateTracingMiddleware,
+)
+from telegram_bot.middlewares.user_context import UserContextMiddleware, load_user_contexts
+from telegram_bot.monitoring.fsm_storage import InstrumentedStorage
+from telegram_bot.monitoring.loop_monitor import LoopMonitor
+from telegram_bot.monitoring.metrics import start_metrics_server
+from telegram_bot.monitoring.profiler import start_profiling
+from telegram_bot.services.identity_store import flush_identities
 from telegram_bot.logger import logger  #  єдиний логер для всього проєкту
 
 logger.info("Запуск Telegram-бота...")
 
-async def main():
-    bot = Bot(token=BOT_TOKEN)
-    dp = Dispatcher()
+
+def create_dispatcher() -> Dispatcher:
+    dp = Dispatcher(storage=InstrumentedStorage(MemoryStorage()))
+    dp.update.outer_middleware(UpdateTracingMiddleware())
+    dp.update.outer_middleware(LogContextMiddleware())
+    dp.update.outer_middleware(UserContextMiddleware())
+    for observer in (dp.message, dp.callback_query):
+        observer.middleware(HandlerMetricsMiddleware())
+        observer.middleware(HandlerTracingMiddleware())
+        observer.middleware(SlowHandlerMiddleware())
 
     for handler in all_handlers:
         dp.include_router(handler)
-        logger.debug(f"Router {handler} підключено до Dispatcher")
+        logger.debug("Router {} підключено до Dispatcher", handler)
+
+    return dp
+
+
+def create_bot(**kwargs) -> Bot:
+    bot = Bot(token=BOT_TOKEN, **kwargs)
+    bot.session.middleware(TelegramRequestMetricsMiddleware())
+    bot.session.middleware(TelegramRequestTracingMiddleware())
+    return bot
+
+
+async def main():
+    load_user_contexts()
+    bot = create_bot()
+    dp = create_dispatcher()
+
+    metrics_runner = None
+    if METRICS_PORT:
+        metrics_runner = await start_metrics_server(METRICS_HOST, METRICS_PORT)
+
+    loop_monitor = None
+    if LOOP_MONITOR_INTERVAL:
+        loop_monitor = LoopMonitor(LOOP_MONITOR_INTERVAL, LOOP_BLOCK_THRESHOLD)
+        loop_monitor.start()
+
+    # kill -USR1 <pid> запускає профілювання на PROFILE_DURATION секунд (лише POSIX)
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGUSR1, start_profiling)
+    except (AttributeError, NotImplementedError):
+        logger.debug("[PROFILER] Сигнал SIGUSR1 недоступний на цій платформі")
 
     logger.info("Усі router-и підключено. Стартуємо polling...")
-    await dp.start_polling(bot)
+    try:
+        await dp.start_polling(bot)
+    finally:
+        if loop_monitor:
+            await loop_monitor.stop()
+        if metrics_runner:
+            await metrics_runner.cleanup()
+        await flush_identities()
 
 if __name__ == "__main__":
     try:
@@ -0,0 +1,19 @@
+from collections import OrderedDict
+
+
+class BoundedCache(OrderedDict):
+    """
+    Словник-кеш щонайбільше на limit записів: новий ключ понад ліміт витісняє найдавніший.
+    Перезаписаний ключ стає найновішим — так частіше оновлювані записи живуть довше.
+    """
+
+    def __init__(self, limit: int):
+        super().__init__()
+        self.limit = limit
+
+    def __setitem__(self, key, value):
+        if key in self:
+            self.move_to_end(key)
+        elif len(self) >= self.limit:
+            self.popitem(last=False)
+        super().__setitem__(key, value)
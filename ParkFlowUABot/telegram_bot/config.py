@@ -6,6 +6,44 @@ load_dotenv()
 
 BOT_TOKEN = os.getenv("BOT_TOKEN")
 API_BASE_URL = os.getenv("API_BASE_URL")
+IDENTITY_STORE_PATH = os.getenv("IDENTITY_STORE_PATH", "telegram_bot/identity_map.json")
+
+# Локальний ендпоінт /metrics; METRICS_PORT=0 вимикає сервер
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9108"))
+
+# Файл для експорту спанів трейсингу (Chrome Trace Event Format); порожнє значення — без експорту
+TRACE_EXPORT_PATH = os.getenv("TRACE_EXPORT_PATH", "")
+
+# Запис трафіку API у касету та відтворення з неї (без живого бекенду); API_REPLAY_SPEED=2 — удвічі швидше, 0 — без затримок
+API_RECORD_PATH = os.getenv("API_RECORD_PATH", "")
+API_REPLAY_PATH = os.getenv("API_REPLAY_PATH", "")
+API_REPLAY_SPEED = float(os.getenv("API_REPLAY_SPEED", "1.0"))
+
+# Загальний тайм-аут запиту до API, секунди (раніше діяв стандартний тайм-аут aiohttp — 5 хвилин)
+API_TIMEOUT = float(os.getenv("API_TIMEOUT", "10"))
+
+# Інʼєкція збоїв API для перевірки стійкості, формат — у services/faults.parse_faults; порожньо — вимкнено
+API_FAULTS = os.getenv("API_FAULTS", "")
+
+# Поріг (секунди), після якого обробник вважається повільним, та інтервал знімання стеків
+SLOW_HANDLER_THRESHOLD = float(os.getenv("SLOW_HANDLER_THRESHOLD", "1.0"))
+SLOW_HANDLER_SAMPLE_INTERVAL = float(os.getenv("SLOW_HANDLER_SAMPLE_INTERVAL", "0.1"))
+
+# Монітор event loop: інтервал вимірювання затримки (0 — вимкнено) та поріг блокування, секунди
+LOOP_MONITOR_INTERVAL = float(os.getenv("LOOP_MONITOR_INTERVAL", "0.1"))
+LOOP_BLOCK_THRESHOLD = float(os.getenv("LOOP_BLOCK_THRESHOLD", "0.1"))
+
+# Профілювання на вимогу (/profile або SIGUSR1): telegram_id адміністраторів через кому, тривалість за замовчуванням
+# і найбільша тривалість, яку можна задати в /profile
+ADMIN_IDS = {int(admin_id) for admin_id in os.getenv("ADMIN_IDS", "").split(",") if admin_id.strip()}
+PROFILE_DIR = os.getenv("PROFILE_DIR", "telegram_bot/profiles")
+PROFILE_DURATION = float(os.getenv("PROFILE_DURATION", "30"))
+PROFILE_MAX_DURATION = float(os.getenv("PROFILE_MAX_DURATION", "300"))
+PROFILE_SAMPLE_INTERVAL = float(os.getenv("PROFILE_SAMPLE_INTERVAL", "0.005"))
+
+# Модулі обробників, що імпортуються при першому використанні (handlers/lazy_router.py); порожньо — усі одразу
+LAZY_ROUTERS = {name.strip() for name in os.getenv("LAZY_ROUTERS", "feedback_handler,settings_handler").split(",") if name.strip()}
 
 logger.info("Завантажено конфігурацію Telegram-бота")
 logger.debug(f"API_BASE_URL = {API_BASE_URL}")
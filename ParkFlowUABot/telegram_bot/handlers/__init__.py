@@ -1,26 +1,51 @@
 from telegram_bot.handlers.start_handler import router as start_router
+from telegram_bot.handlers.admin_handler import router as admin_router
 from telegram_bot.handlers.registration_handler import router as registration_router
-from telegram_bot.handlers.settings_handler import router as settings_router
 from telegram_bot.handlers.error_handler import router as error_router
 from telegram_bot.handlers.car_handler import router as car_router
 from telegram_bot.handlers.card_handler import router as card_router
 from telegram_bot.handlers.booking_handler import router as booking_router
-from telegram_bot.handlers.feedback_handler import router as feedback_router  # ✅ додано
+from telegram_bot.handlers.lazy_router import LazyRouter
+from telegram_bot.handlers.feedback_texts import FEEDBACK_CALLBACK_PREFIX, FEEDBACK_TRIGGER_TEXTS
 
+from telegram_bot.config import LAZY_ROUTERS
 from telegram_bot.logger import logger
 
 logger.debug("Імпортовано start_handler")
+logger.debug("Імпортовано admin_handler")
 logger.debug("Імпортовано registration_handler")
-logger.debug("Імпортовано settings_handler")
 logger.debug("Імпортовано error_handler")
 logger.debug("Імпортовано car_handler")
 logger.debug("Імпортовано card_handler")
 logger.debug("Імпортовано booking_handler")
-logger.debug("Імпортовано feedback_handler")
+
+# Рідко вживані router-и можна імпортувати при першому використанні (LAZY_ROUTERS).
+# Тексти — усі, на які їхні обробники реагують без фільтра стану, щоб порядок обробки не змінився
+# (для відгуків — спільні з feedback_handler константи, їх відповідність перевіряє tests/test_lazy_router.py).
+if "feedback_handler" in LAZY_ROUTERS:
+    feedback_router = LazyRouter(
+        "telegram_bot.handlers.feedback_handler",
+        texts=FEEDBACK_TRIGGER_TEXTS,
+        state_groups=("FeedbackStates",),
+        callback_prefixes=(FEEDBACK_CALLBACK_PREFIX,),
+    )
+    logger.debug("Імпорт feedback_handler відкладено до першого використання")
+else:
+    from telegram_bot.handlers.feedback_handler import router as feedback_router  # ✅ додано
+    logger.debug("Імпортовано feedback_handler")
+
+if "settings_handler" in LAZY_ROUTERS:
+    # settings_handler містить загальний fallback, тож його завантажує будь-який апдейт, що сюди дійшов
+    settings_router = LazyRouter("telegram_bot.handlers.settings_handler")
+    logger.debug("Імпорт settings_handler відкладено до першого використання")
+else:
+    from telegram_bot.handlers.settings_handler import router as settings_router
+    logger.debug("Імпортовано settings_handler")
 
 all_handlers = [
     booking_router,
     start_router,
+    admin_router,
     registration_router,
     car_router,
     card_router,
@@ -0,0 +1,50 @@
+import asyncio
+import math
+
+from aiogram import Router, F
+from aiogram.filters import Command, CommandObject
+from aiogram.types import Message
+from loguru import logger
+
+from telegram_bot.config import ADMIN_IDS, PROFILE_DURATION, PROFILE_MAX_DURATION
+from telegram_bot.monitoring.profiler import start_profiling
+from telegram_bot.monitoring.tracing import create_detached_task
+
+router = Router()
+
+# Задачі звітів про профілювання: event loop тримає лише слабкі посилання на задачі
+_report_tasks: set[asyncio.Task] = set()
+
+
+@router.message(Command("profile"), F.from_user.id.in_(ADMIN_IDS))
+async def profile(message: Message, command: CommandObject):
+    logger.info("/profile викликано адміністратором: telegram_id={}", message.from_user.id)
+    try:
+        duration = float(command.args) if command.args else PROFILE_DURATION
+    except ValueError:
+        duration = math.nan
+    if not math.isfinite(duration) or duration <= 0:
+        await message.answer(f"⚠️ Використання: /profile [секунди > 0, щонайбільше {PROFILE_MAX_DURATION:g}]")
+        return
+    duration = min(duration, PROFILE_MAX_DURATION)
+
+    session = start_profiling(duration)
+    if session is None:
+        await message.answer("⏳ Профілювання вже триває.")
+        return
+
+    await message.answer(f"🔬 Профілювання запущено на {duration:g} с.")
+    # Не тримаємо обробник відкритим на весь час профілювання — результат надішлемо окремо
+    task = create_detached_task(_report_when_done(message, session))
+    _report_tasks.add(task)
+    task.add_done_callback(_report_tasks.discard)
+
+
+async def _report_when_done(message: Message, session: asyncio.Task):
+    try:
+        path = await session
+    except Exception as e:
+        logger.exception("[PROFILER] Помилка профілювання: {}", e)
+        await message.answer("❌ Профілювання завершилося з помилкою.")
+        return
+    await message.answer(f"✅ Профіль збережено: {path}")
@@ -1,24 +1,39 @@
-from datetime import datetime, timedelta
-from email.utils import parsedate_to_datetime
-import pytz
-
-from aiogram import Router, F
-from aiogram.types import Message, ReplyKeyboardMarkup, KeyboardButton
+import asyncio
+from contextlib import suppress
+from datetime import timedelta
+
+from aiogram import Bot, Router, F
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import (
+    CallbackQuery, Message,
+    ReplyKeyboardMarkup, KeyboardButton,
+    InlineKeyboardMarkup, InlineKeyboardButton
+)
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import StatesGroup, State, any_state
 from loguru import logger
 
-from telegram_bot.keyboards.menu import main_menu
+from telegram_bot.bounded_cache import BoundedCache
+from telegram_bot.keyboards.menu import build_paginated_inline_keyboard, main_menu
+from telegram_bot.keyboards.selection import build_selection_keyboard, id_index, resolve_selection
+from telegram_bot.monitoring.tracing import create_detached_task
 from telegram_bot.services.booking_service import (
     get_all_cities,
     get_parkings_by_city,
     get_available_spots,
     get_user_cars,
     get_spot_by_id,
+    get_spots_by_ids,
     book_spot,
-    get_user_bookings
+    get_user_bookings_page,
+    slice_bookings_page
 )
+from telegram_bot.services.booking_export import BookingsCsvFile
+from telegram_bot.services.booking_index import get_booking_index, remember_booking
+from telegram_bot.services.booking_stats import get_booking_stats, invalidate_booking_stats
 from telegram_bot.services.card_service import get_user_cards
+from telegram_bot.middlewares.user_context import UserContext
+from telegram_bot.timeutils import format_dt, format_timestamp, now_kyiv, parse_timestamp
 
 router = Router()
 
@@ -37,6 +52,31 @@ class SpotState(StatesGroup):
     select_duration = State()
     confirm_booking = State()
 
+# Скільки міст, паркінгів чи місць показує одна сторінка інлайн-клавіатури
+SPOT_OPTIONS_PER_PAGE = 8
+
+def spot_label(spot: dict) -> str:
+    return f"Місце №{spot['number']} — {spot['hourly_rate']} грн/год"
+
+def car_label(car: dict) -> str:
+    return f"{car['id']}: {car['brand']} {car['model']}: {car['license_plate']}"
+
+def card_label(card: dict) -> str:
+    return f"{card['id']}: {card['number']}"
+
+# Крок інлайн-вибору (у callback_data) → (ключ списку в FSM, стан кроку, підпис кнопки).
+# Поруч зі списком у FSM лежить індекс id → позиція під ключем "<ключ>_index"
+SPOT_STEPS = {
+    "c": ("cities", SpotState.select_city, lambda c: c["name"]),
+    "p": ("parkings", SpotState.select_parking, lambda p: p["name"]),
+    "s": ("spots", SpotState.select_spot, spot_label),
+}
+
+
+def build_spot_options_keyboard(step: str, items: list[dict], page: int = 1):
+    _, _, label = SPOT_STEPS[step]
+    return build_paginated_inline_keyboard(items, label, f"spot:{step}", page, SPOT_OPTIONS_PER_PAGE)
+
 async def push_state(state: FSMContext, new_state: State):
     data = await state.get_data()
     history = data.get("state_history", [])
@@ -52,18 +92,17 @@ def build_keyboard_from_list(options: list[str]) -> ReplyKeyboardMarkup:
     return ReplyKeyboardMarkup(keyboard=rows, resize_keyboard=True)
 
 @router.message(F.text == "🏠 Головне меню", any_state)
-async def handle_main_menu_any(message: Message, state: FSMContext):
-    data = await state.get_data()
-    phone = data.get("phone_number")
+async def handle_main_menu_any(message: Message, state: FSMContext, user_ctx: UserContext):
+    phone = user_ctx.phone_number
     await state.clear()
     if phone:
         await state.update_data(phone_number=phone)
     await message.answer("⬅️ Ви повернулись до головного меню", reply_markup=main_menu())
 
-async def handle_navigation_buttons(message: Message, state: FSMContext):
+async def handle_navigation_buttons(message: Message, state: FSMContext, user_ctx: UserContext):
     data = await state.get_data()
     history = data.get("state_history", [])
-    phone = data.get("phone_number")
+    phone = user_ctx.phone_number
 
     if message.text == "🏠 Головне меню":
         await state.clear()
@@ -85,27 +124,26 @@ async def handle_navigation_buttons(message: Message, state: FSMContext):
         # Правильна маршрутизація назад
         match prev_state:
             case SpotState.select_city.state:
-                return await start_checking(message, state)
+                return await start_checking(message, state, user_ctx)
             case SpotState.select_parking.state:
-                return await select_city(message, state)
+                return await select_city(message, state, user_ctx)
             case SpotState.select_spot.state:
-                return await select_parking(message, state)
+                return await select_parking(message, state, user_ctx)
             case SpotState.select_car.state:
-                return await select_spot(message, state)
+                return await select_spot(message, state, user_ctx)
             case SpotState.select_card.state:
-                return await select_car(message, state)
+                return await select_car(message, state, user_ctx)
             case SpotState.select_duration.state:
-                return await select_card(message, state)
+                return await select_card(message, state, user_ctx)
             case SpotState.confirm_booking.state:
-                return await select_duration(message, state)
+                return await select_duration(message, state, user_ctx)
 
         return await message.answer("⬅️ Повернулись до попереднього кроку.")
 
 
 @router.message(F.text == "📍 Перевірити доступні місця")
-async def start_checking(message: Message, state: FSMContext):
-    data = await state.get_data()
-    phone = data.get("phone_number")
+async def start_checking(message: Message, state: FSMContext, user_ctx: UserContext):
+    phone = user_ctx.phone_number
     if not phone:
         return await message.answer("⚠️ Поділіться номером або введіть /start.")
 
@@ -122,22 +160,48 @@ async def start_checking(message: Message, state: FSMContext):
         return await message.answer("Немає доступних міст.")
 
     await push_state(state, SpotState.select_city)
-    await state.update_data(cities=cities)
-    await message.answer("Оберіть місто:", reply_markup=build_keyboard_from_list(
-        [f"{c['id']}: {c['name']}" for c in cities]
-    ))
+    await state.update_data(cities=cities, cities_index=id_index(cities))
+    # Інлайн-клавіатура не несе кнопок навігації — вони лишаються у звичайній клавіатурі
+    await message.answer("📍 Пошук вільного місця", reply_markup=build_keyboard_from_list([]))
+    await message.answer("Оберіть місто:", reply_markup=build_spot_options_keyboard("c", cities))
+
+@router.callback_query(F.data.startswith("spot:"))
+async def handle_spot_option(callback: CallbackQuery, state: FSMContext, user_ctx: UserContext):
+    _, step, value = callback.data.split(":", 2)
+    key, step_state, _ = SPOT_STEPS[step]
+    if await state.get_state() != step_state.state:
+        return await callback.answer("⌛ Цей список уже неактуальний.")
 
-@router.message(SpotState.select_city)
-async def select_city(message: Message, state: FSMContext):
+    data = await state.get_data()
+    items = data.get(key, [])
+    if value.startswith("page:"):
+        # Гортання лише підміняє клавіатуру того самого повідомлення
+        with suppress(TelegramBadRequest):
+            await callback.message.edit_reply_markup(
+                reply_markup=build_spot_options_keyboard(step, items, int(value[len("page:"):]))
+            )
+        return await callback.answer()
+
+    item = resolve_selection(items, data.get(f"{key}_index", {}), value)
+    if item is None:
+        return await callback.answer("❌ Варіант не знайдено.")
+    await callback.answer()
+    await SPOT_PICKERS[step](callback.message, state, user_ctx, item)
+
+@router.callback_query(F.data == "noop")
+async def handle_noop(callback: CallbackQuery):
+    await callback.answer()
+
+async def _select_with_buttons(message: Message, state: FSMContext, user_ctx: UserContext, hint: str):
     if message.text in ["⬅️ Назад", "🏠 Головне меню"]:
-        return await handle_navigation_buttons(message, state)
+        return await handle_navigation_buttons(message, state, user_ctx)
+    await message.answer(hint)
 
-    data = await state.get_data()
-    cities = data.get("cities", [])
-    city = next((c for c in cities if f"{c['id']}: {c['name']}" == message.text.strip()), None)
-    if not city:
-        return await message.answer("Місто не знайдено.")
+@router.message(SpotState.select_city)
+async def select_city(message: Message, state: FSMContext, user_ctx: UserContext):
+    await _select_with_buttons(message, state, user_ctx, "Оберіть місто кнопкою в списку вище.")
 
+async def pick_city(message: Message, state: FSMContext, user_ctx: UserContext, city: dict):
     try:
         parkings = await get_parkings_by_city(city["id"])
     except Exception:
@@ -148,22 +212,17 @@ async def select_city(message: Message, state: FSMContext):
         return await message.answer("Немає паркінгів.")
 
     await push_state(state, SpotState.select_parking)
-    await state.update_data(parkings=parkings)
-    await message.answer("Оберіть паркінг:", reply_markup=build_keyboard_from_list(
-        [f"{p['id']}: {p['name']}" for p in parkings]
-    ))
+    await state.update_data(parkings=parkings, parkings_index=id_index(parkings))
+    await message.edit_text(
+        f"🏙 {city['name']}\nОберіть паркінг:",
+        reply_markup=build_spot_options_keyboard("p", parkings),
+    )
 
 @router.message(SpotState.select_parking)
-async def select_parking(message: Message, state: FSMContext):
-    if message.text in ["⬅️ Назад", "🏠 Головне меню"]:
-        return await handle_navigation_buttons(message, state)
-
-    data = await state.get_data()
-    parkings = data.get("parkings", [])
-    parking = next((p for p in parkings if f"{p['id']}: {p['name']}" == message.text.strip()), None)
-    if not parking:
-        return await message.answer("Паркінг не знайдено.")
+async def select_parking(message: Message, state: FSMContext, user_ctx: UserContext):
+    await _select_with_buttons(message, state, user_ctx, "Оберіть паркінг кнопкою в списку вище.")
 
+async def pick_parking(message: Message, state: FSMContext, user_ctx: UserContext, parking: dict):
     try:
         spots = await get_available_spots(parking["id"])
     except Exception:
@@ -174,23 +233,19 @@ async def select_parking(message: Message, state: FSMContext):
         return await message.answer("Немає вільних місць.")
 
     await push_state(state, SpotState.select_spot)
-    await state.update_data(selected_parking=parking, spots=spots)
-    await message.answer("Оберіть місце:", reply_markup=build_keyboard_from_list([
-        f"{s['id']}: Місце №{s['number']}) {s['hourly_rate']} ціна за годину" for s in spots
-    ]))
+    await state.update_data(selected_parking=parking, spots=spots, spots_index=id_index(spots))
+    await message.edit_text(
+        f"🏢 {parking['name']}\nОберіть місце:",
+        reply_markup=build_spot_options_keyboard("s", spots),
+    )
 
 @router.message(SpotState.select_spot)
-async def select_spot(message: Message, state: FSMContext):
-    if message.text in ["⬅️ Назад", "🏠 Головне меню"]:
-        return await handle_navigation_buttons(message, state)
-
-    data = await state.get_data()
-    spot = next((s for s in data.get("spots", []) if f"{s['id']}: Місце №{s['number']}) {s['hourly_rate']} ціна за годину" == message.text.strip()), None)
-    if not spot:
-        return await message.answer("Місце не знайдено.")
+async def select_spot(message: Message, state: FSMContext, user_ctx: UserContext):
+    await _select_with_buttons(message, state, user_ctx, "Оберіть місце кнопкою в списку вище.")
 
+async def pick_spot(message: Message, state: FSMContext, user_ctx: UserContext, spot: dict):
     try:
-        cars = await get_user_cars(data["phone_number"])
+        cars = await get_user_cars(user_ctx.phone_number)
     except Exception:
         logger.exception("[BOT] get_user_cars failed")
         return await message.answer("⚠️ Не вдалося отримати авто.")
@@ -198,24 +253,26 @@ async def select_spot(message: Message, state: FSMContext):
     if not cars:
         return await message.answer("❌ У вас немає зареєстрованих авто.")
 
+    keyboard, cars_index = build_selection_keyboard(cars, car_label)
     await push_state(state, SpotState.select_car)
-    await state.update_data(selected_spot=spot, cars=cars)
-    await message.answer("Оберіть авто:", reply_markup=build_keyboard_from_list([
-        f"{c['id']}: {c['brand']} {c['model']}: {c['license_plate']}" for c in cars
-    ]))
+    await state.update_data(selected_spot=spot, cars=cars, cars_index=cars_index)
+    await message.edit_text(f"🅿️ {spot_label(spot)}")
+    await message.answer("Оберіть авто:", reply_markup=keyboard)
+
+SPOT_PICKERS = {"c": pick_city, "p": pick_parking, "s": pick_spot}
 
 @router.message(SpotState.select_car)
-async def select_car(message: Message, state: FSMContext):
+async def select_car(message: Message, state: FSMContext, user_ctx: UserContext):
     if message.text in ["⬅️ Назад", "🏠 Головне меню"]:
-        return await handle_navigation_buttons(message, state)
+        return await handle_navigation_buttons(message, state, user_ctx)
 
     data = await state.get_data()
-    car = next((c for c in data.get("cars", []) if f"{c['id']}: {c['brand']} {c['model']}: {c['license_plate']}" == message.text.strip()), None)
+    car = resolve_selection(data.get("cars", []), data.get("cars_index", {}), message.text)
     if not car:
         return await message.answer("Авто не знайдено.")
 
     try:
-        cards = await get_user_cards(data["phone_number"])
+        cards = await get_user_cards(user_ctx.phone_number)
     except Exception:
         logger.exception("[BOT] get_user_cards failed")
         return await message.answer("⚠️ Не вдалося отримати картки.")
@@ -223,19 +280,18 @@ async def select_car(message: Message, state: FSMContext):
     if not cards:
         return await message.answer("❌ У вас немає збережених карток.")
 
+    keyboard, cards_index = build_selection_keyboard(cards, card_label)
     await push_state(state, SpotState.select_card)
-    await state.update_data(selected_car=car, cards=cards)
-    await message.answer("Оберіть картку:", reply_markup=build_keyboard_from_list([
-        f"{c['id']}: {c['number']}" for c in cards
-    ]))
+    await state.update_data(selected_car=car, cards=cards, cards_index=cards_index)
+    await message.answer("Оберіть картку:", reply_markup=keyboard)
 
 @router.message(SpotState.select_card)
-async def select_card(message: Message, state: FSMContext):
+async def select_card(message: Message, state: FSMContext, user_ctx: UserContext):
     if message.text in ["⬅️ Назад", "🏠 Головне меню"]:
-        return await handle_navigation_buttons(message, state)
+        return await handle_navigation_buttons(message, state, user_ctx)
 
     data = await state.get_data()
-    selected = next((c for c in data.get("cards", []) if f"{c['id']}: {c['number']}" == message.text.strip()), None)
+    selected = resolve_selection(data.get("cards", []), data.get("cards_index", {}), message.text)
     if not selected:
         return await message.answer("❌ Картку не знайдено.")
 
@@ -246,9 +302,9 @@ async def select_card(message: Message, state: FSMContext):
     await message.answer("Оберіть тривалість бронювання:", reply_markup=build_keyboard_from_list(durations))
 
 @router.message(SpotState.select_duration)
-async def select_duration(message: Message, state: FSMContext):
+async def select_duration(message: Message, state: FSMContext, user_ctx: UserContext):
     if message.text in ["⬅️ Назад", "🏠 Головне меню"]:
-        return await handle_navigation_buttons(message, state)
+        return await handle_navigation_buttons(message, state, user_ctx)
 
     try:
         duration_hours = int(message.text.split()[0])
@@ -270,8 +326,7 @@ async def select_duration(message: Message, state: FSMContext):
         return await message.answer("❌ Не вдалося отримати ціну за годину для обраного місця.")
 
     total_price = duration_hours * hourly_rate
-    kyiv_tz = pytz.timezone("Europe/Kyiv")
-    occupied_from = datetime.now(kyiv_tz)
+    occupied_from = now_kyiv()
 
     await push_state(state, SpotState.confirm_booking)
     await state.update_data(
@@ -300,26 +355,26 @@ async def select_duration(message: Message, state: FSMContext):
 
 
 @router.message(SpotState.confirm_booking)
-async def confirm_booking(message: Message, state: FSMContext):
+async def confirm_booking(message: Message, state: FSMContext, user_ctx: UserContext):
     text = message.text.strip()
     if text == "❌ Ні":
         await state.clear()
         return await message.answer("❌ Бронювання скасовано.", reply_markup=main_menu())
     if text in ["⬅️ Назад", "🏠 Головне меню"]:
-        return await handle_navigation_buttons(message, state)
+        return await handle_navigation_buttons(message, state, user_ctx)
     if text != "✅ Так":
         return await message.answer("❗ Оберіть: ✅ Так або ❌ Ні")
 
     data = await state.get_data()
     try:
-        occupied_from = datetime.fromisoformat(data["occupied_from"])
+        occupied_from = parse_timestamp(data["occupied_from"])
     except Exception:
-        occupied_from = datetime.now(pytz.timezone("Europe/Kyiv"))
+        occupied_from = now_kyiv()
 
     result = await book_spot(
         spot_id=data["selected_spot"]["id"],
         car_id=data["selected_car"]["id"],
-        phone_number=data["phone_number"],
+        phone_number=user_ctx.phone_number,
         card_id=data["selected_card"]["id"],
         duration_hours=data["duration_hours"],
         occupied_from=occupied_from.isoformat(),
@@ -327,6 +382,8 @@ async def confirm_booking(message: Message, state: FSMContext):
 
     if not result:
         return await message.answer("❌ Помилка під час бронювання.")
+    remember_booking(user_ctx.phone_number, result)
+    invalidate_booking_stats(user_ctx.phone_number)
 
     occupied_until = occupied_from + timedelta(hours=data["duration_hours"])
     await message.answer(
@@ -334,28 +391,160 @@ async def confirm_booking(message: Message, state: FSMContext):
         f"🅿️ Місце №{data['selected_spot']['number']}\n"
         f"🚗 Авто: {data['selected_car']['brand']} {data['selected_car']['license_plate']}\n"
         f"💰 Сума: {result['total_price']} грн\n"
-        f"🕓 З: {occupied_from.strftime('%d.%m.%Y %H:%M')}\n"
-        f"🕓 По: {occupied_until.strftime('%d.%m.%Y %H:%M')}\n"
+        f"🕓 З: {format_dt(occupied_from)}\n"
+        f"🕓 По: {format_dt(occupied_until)}\n"
         f"📄 ID: {result['id']}\n"
-        f"📅 Створено: {datetime.fromisoformat(result['created_at']).strftime('%d.%m.%Y %H:%M')}",
+        f"📅 Створено: {format_timestamp(result['created_at'])}",
         reply_markup=main_menu()
     )
     await state.clear()
-    await state.update_data(phone_number=data["phone_number"])
+    await state.update_data(phone_number=user_ctx.phone_number)
 
 BOOKINGS_PER_PAGE = 5
+# Скільки користувачів тримають завантажені сторінки історії одночасно (найдавніші витісняються)
+BOOKING_HISTORIES_LIMIT = 1000
+# Тайм-аут відправлення CSV-експорту: файл формується під час завантаження в Telegram, секунди
+BOOKING_EXPORT_TIMEOUT = 600
+# Скільки останніх місяців показує екран статистики
+BOOKING_STATS_MONTHS = 12
+
+
+async def _loaded_spots(spot_ids) -> dict[int, dict]:
+    # Місця, що не завантажились ({}), не зберігаються — наступний показ запитає їх знову
+    return {spot_id: spot for spot_id, spot in (await get_spots_by_ids(spot_ids)).items() if spot}
+
+
+class BookingHistory:
+    """
+    Історія бронювань користувача, що завантажується з API посторінково, новіші першими.
+    Курсор сторінки n приходить разом зі сторінкою n-1; наступна сторінка підвантажується
+    у фоні, поки користувач читає поточну. Якщо бекенд не підтримує пагінацію і віддав
+    усю історію з першою сторінкою, решта сторінок вирізається з неї без запитів до API.
+    """
+
+    title = None
+    empty_text = "❌ У вас немає бронювань."
+
+    def __init__(self, phone_number: str):
+        self.phone_number = phone_number
+        self.cursors: dict[int, str | None] = {1: None}
+        self.total: int | None = None
+        # Місця бронювань усіх завантажених сторінок — spot_cache для format_booking
+        self.spots: dict[int, dict] = {}
+        self._pages: dict[int, asyncio.Task] = {}
+        # Номер сторінки → зібраний текст (без заголовка)
+        self.rendered: dict[int, str] = {}
+        # Уся історія (новіші першими), якщо бекенд віддав її цілком замість сторінки
+        self._all: list[dict] | None = None
+
+    async def _fetch(self, page: int) -> dict | None:
+        if self._all is not None:
+            result = slice_bookings_page(self._all, self.cursors[page], BOOKINGS_PER_PAGE)
+        else:
+            result = await get_user_bookings_page(self.phone_number, self.cursors[page], BOOKINGS_PER_PAGE)
+            if result is not None and result["all"] is not None:
+                self._all = result["all"]
+        if result is not None:
+            # Місця всієї сторінки — одним викликом, тож і вони підвантажуються у фоні разом зі сторінкою
+            missing = [b.get("spot_id") for b in result["items"] if b.get("spot_id") not in self.spots]
+            self.spots.update(await _loaded_spots(missing))
+        return result
+
+    def _load(self, page: int) -> asyncio.Task:
+        task = self._pages.get(page)
+        if task is None:
+            task = self._pages[page] = create_detached_task(self._fetch(page))
+        return task
+
+    async def page(self, page: int) -> list | None:
+        result = await self._load(page)
+        if result is None:
+            # Помилку не кешуємо — наступне натискання спробує ще раз
+            self._pages.pop(page, None)
+            return None
+        if result["next_cursor"]:
+            self.cursors[page + 1] = result["next_cursor"]
+        if result["total"] is not None:
+            self.total = result["total"]
+        return result["items"]
+
+    def has_page(self, page: int) -> bool:
+        return page in self.cursors
+
+    def prefetch(self, page: int):
+        if self.has_page(page):
+            self._load(page)
+
+    @property
+    def total_pages(self) -> int | None:
+        if self.total is None:
+            return None
+        return max(1, (self.total + BOOKINGS_PER_PAGE - 1) // BOOKINGS_PER_PAGE)
+
+
+class FilteredBookings:
+    """
+    Результат фільтра з індексу бронювань (services/booking_index.py): список уже в пам'яті,
+    гортається тими ж кнопками, що й історія, місця сторінки запитуються одним викликом.
+    """
+
+    empty_text = "🔎 За цим фільтром бронювань немає."
+
+    def __init__(self, title: str, bookings: list[dict]):
+        self.title = title
+        self.bookings = bookings
+        self.total = len(bookings)
+        self.spots: dict[int, dict] = {}
+        # Номер сторінки → зібраний текст (без заголовка)
+        self.rendered: dict[int, str] = {}
+
+    async def page(self, page: int) -> list:
+        chunk = self.bookings[(page - 1) * BOOKINGS_PER_PAGE:page * BOOKINGS_PER_PAGE]
+        missing = [b.get("spot_id") for b in chunk if b.get("spot_id") not in self.spots]
+        self.spots.update(await _loaded_spots(missing))
+        return chunk
+
+    def has_page(self, page: int) -> bool:
+        return 1 <= page <= self.total_pages
+
+    def prefetch(self, page: int):
+        pass
+
+    @property
+    def total_pages(self) -> int:
+        return max(1, (self.total + BOOKINGS_PER_PAGE - 1) // BOOKINGS_PER_PAGE)
+
+
+# Кнопка фільтра → (за скільки останніх днів або None, статус або None)
+BOOKING_FILTERS = {
+    "🗓 За тиждень": (7, None),
+    "📅 За місяць": (30, None),
+    "🕒 Очікують оплату": (None, "pending"),
+    "✅ Оплачені": (None, "paid"),
+}
+
+# telegram_id → список бронювань, відкритий востаннє (історія або результат фільтра)
+_booking_histories: BoundedCache[int, BookingHistory | FilteredBookings] = BoundedCache(BOOKING_HISTORIES_LIMIT)
+
 
-async def format_booking(b, spot_cache: dict):
+def open_booking_history(telegram_id: int, history: BookingHistory | FilteredBookings):
+    _booking_histories[telegram_id] = history
+    return history
+
+
+async def format_booking(b, spot_cache: dict) -> tuple[str, bool]:
+    """Текст бронювання і чи вдалося показати його повністю (місце завантажилось, дані коректні)."""
     try:
         spot_id = b.get("spot_id")
-        if spot_id not in spot_cache:
-            spot_cache[spot_id] = await get_spot_by_id(spot_id)
-        spot = spot_cache[spot_id]
-        if not spot:
-            return f"❌ Некоректне бронювання ID {b.get('id')}"
-
-        occupied_from = parsedate_to_datetime(spot['occupied_from']).astimezone(pytz.timezone("Europe/Kyiv"))
-        occupied_until = parsedate_to_datetime(spot['occupied_until']).astimezone(pytz.timezone("Europe/Kyiv"))
+        spot = spot_cache.get(spot_id)
+        if spot is None:
+            spot = await get_spot_by_id(spot_id)
+            if not spot:
+                return f"❌ Некоректне бронювання ID {b.get('id')}", False
+            spot_cache[spot_id] = spot
+
+        occupied_from = format_timestamp(spot['occupied_from'])
+        occupied_until = format_timestamp(spot['occupied_until'])
         card = b.get("card", {})
         car = b.get("car", {})
 
@@ -365,64 +554,198 @@ async def format_booking(b, spot_cache: dict):
             f"🚗 Авто: {car.get('brand', '')} {car.get('license_plate', '')}\n"
             f"💳 Картка: ****{card.get('number', '')[-4:]}\n"
             f"⏳ {b.get('duration_hours')} год\n"
-            f"🕓 З: {occupied_from.strftime('%d.%m.%Y %H:%M')}\n"
-            f"🕓 По: {occupied_until.strftime('%d.%m.%Y %H:%M')}\n"
+            f"🕓 З: {occupied_from}\n"
+            f"🕓 По: {occupied_until}\n"
             f"💰 Сума: {b.get('total_price')} грн\n"
             f"{STATUS_LABELS.get(b.get('status'), '❔ Статус?')}"
-        )
+        ), True
     except Exception as e:
         logger.exception("format_booking error")
-        return f"❌ Помилка бронювання ID {b.get('id')}"
+        return f"❌ Помилка бронювання ID {b.get('id')}", False
 
-def build_bookings_keyboard(page: int, total_pages: int) -> ReplyKeyboardMarkup:
+
+async def render_booking_page(chunk: list[dict], spot_cache: dict) -> tuple[str, bool]:
+    """Текст сторінки історії і чи вдалося показати всі бронювання — неповну сторінку не кешують."""
+    formatted = [await format_booking(b, spot_cache) for b in chunk]
+    return "\n\n".join(text for text, _ in formatted), all(complete for _, complete in formatted)
+
+def build_bookings_keyboard(page: int, has_next: bool, filtered: bool = False) -> InlineKeyboardMarkup:
     buttons = []
     nav = []
 
     if page > 1:
-        nav.append(KeyboardButton(text="⬅️ Попередня"))
-    if page < total_pages:
-        nav.append(KeyboardButton(text="➡️ Наступна"))
+        nav.append(InlineKeyboardButton(text="⬅️ Попередня", callback_data=f"bk:page:{page - 1}"))
+    if has_next:
+        nav.append(InlineKeyboardButton(text="➡️ Наступна", callback_data=f"bk:page:{page + 1}"))
 
     if nav:
         buttons.append(nav)
 
-    buttons.append([KeyboardButton(text="🏠 Головне меню")])
+    # Фільтр у callback_data — його номер у BOOKING_FILTERS
+    filters = [
+        InlineKeyboardButton(text=text, callback_data=f"bk:filter:{number}")
+        for number, text in enumerate(BOOKING_FILTERS)
+    ]
+    buttons.append(filters[:2])
+    buttons.append(filters[2:])
+    buttons.append([
+        InlineKeyboardButton(text="📊 Статистика", callback_data="bk:stats"),
+        InlineKeyboardButton(text="📤 Експорт бронювань", callback_data="bk:export"),
+    ])
+    if filtered:
+        buttons.append([InlineKeyboardButton(text="ℹ️ Усі бронювання", callback_data="bk:all")])
+
+    return InlineKeyboardMarkup(inline_keyboard=buttons)
 
-    return ReplyKeyboardMarkup(keyboard=buttons, resize_keyboard=True)
 @router.message(F.text == "ℹ️ Статус бронювання")
-async def handle_booking_status(message: Message, state: FSMContext):
-    data = await state.get_data()
-    phone = data.get("phone_number")
+async def handle_booking_status(message: Message, state: FSMContext, user_ctx: UserContext):
+    phone = user_ctx.phone_number
     if not phone:
         return await message.answer("⚠️ Поділіться номером або введіть /start")
-    bookings = await get_user_bookings(phone)
-    if not bookings:
-        return await message.answer("❌ У вас немає бронювань.", reply_markup=main_menu())
-    bookings.sort(key=lambda b: b["created_at"], reverse=True)
-    await state.update_data(bookings=bookings, booking_page=1)
-    await show_booking_page(message, bookings, 1)
-
-@router.message(F.text.in_(["⬅️ Попередня", "➡️ Наступна"]))
-async def handle_booking_pagination(message: Message, state: FSMContext):
-    data = await state.get_data()
-    bookings = data.get("bookings", [])
-    page = data.get("booking_page", 1)
-    total_pages = (len(bookings) + BOOKINGS_PER_PAGE - 1) // BOOKINGS_PER_PAGE
-    if message.text == "⬅️ Попередня" and page > 1:
-        page -= 1
-    elif message.text == "➡️ Наступна" and page < total_pages:
-        page += 1
-    await state.update_data(booking_page=page)
-    await show_booking_page(message, bookings, page)
-
-async def show_booking_page(message: Message, bookings: list, page: int):
-    start = (page - 1) * BOOKINGS_PER_PAGE
-    end = start + BOOKINGS_PER_PAGE
-    chunk = bookings[start:end]
-    total_pages = (len(bookings) + BOOKINGS_PER_PAGE - 1) // BOOKINGS_PER_PAGE
-    spot_cache = {}
-    text = "\n\n".join([await format_booking(b, spot_cache) for b in chunk])
-    await message.answer(
-        f"📄 Сторінка {page}/{total_pages}\n\n{text}",
-        reply_markup=build_bookings_keyboard(page, total_pages),
+    history = open_booking_history(message.from_user.id, BookingHistory(phone))
+    await show_booking_page(message, state, history, 1)
+
+async def _callback_phone(callback: CallbackQuery, user_ctx: UserContext) -> str | None:
+    if not user_ctx.phone_number:
+        await callback.answer("⚠️ Поділіться номером або введіть /start", show_alert=True)
+    return user_ctx.phone_number
+
+@router.callback_query(F.data == "bk:all")
+async def handle_booking_all(callback: CallbackQuery, state: FSMContext, user_ctx: UserContext):
+    phone = await _callback_phone(callback, user_ctx)
+    if not phone:
+        return
+    await callback.answer()
+    history = open_booking_history(callback.from_user.id, BookingHistory(phone))
+    await show_booking_page(callback.message, state, history, 1, edit=True)
+
+@router.callback_query(F.data.startswith("bk:filter:"))
+async def handle_booking_filter(callback: CallbackQuery, state: FSMContext, user_ctx: UserContext):
+    phone = await _callback_phone(callback, user_ctx)
+    if not phone:
+        return
+    await callback.answer()
+    title = list(BOOKING_FILTERS)[int(callback.data[len("bk:filter:"):])]
+    days, status = BOOKING_FILTERS[title]
+    start = now_kyiv().replace(tzinfo=None) - timedelta(days=days) if days else None
+    index = await get_booking_index(phone)
+    history = open_booking_history(callback.from_user.id, FilteredBookings(title, index.select(start, status=status)))
+    await show_booking_page(callback.message, state, history, 1, edit=True)
+
+@router.callback_query(F.data == "bk:export")
+async def handle_booking_export(callback: CallbackQuery, bot: Bot, user_ctx: UserContext):
+    phone = await _callback_phone(callback, user_ctx)
+    if not phone:
+        return
+    await callback.answer("⏳ Формуємо файл…")
+    document = BookingsCsvFile(phone, f"bookings_{now_kyiv():%Y-%m-%d}.csv")
+    try:
+        await bot(
+            callback.message.answer_document(document, caption="📤 Ваші бронювання (CSV)"),
+            request_timeout=BOOKING_EXPORT_TIMEOUT,
+        )
+    except Exception as e:
+        logger.exception("[EXPORT] Помилка експорту бронювань: {}", e)
+        return await callback.message.answer("❌ Не вдалося сформувати експорт. Спробуйте пізніше.")
+
+def _amount(value: float) -> str:
+    return f"{value:.2f}".rstrip("0").rstrip(".")
+
+
+def format_booking_stats(stats: dict) -> str:
+    lines = [
+        "📊 Статистика бронювань\n",
+        f"🧾 Бронювань: {stats['bookings']} (відхилених: {stats['bookings'] - stats['active']})",
+        f"💰 Витрачено: {_amount(stats['spent'])} грн",
+        f"⏳ Годин на паркуванні: {_amount(stats['hours'])}",
+    ]
+    if stats["avg_rate"] is not None:
+        lines.append(f"💵 Середня ціна години: {_amount(stats['avg_rate'])} грн")
+    if stats["favourite_parking"]:
+        name, count, exact = stats["favourite_parking"]
+        lines.append(f"⭐ Улюблений паркінг: {name} ({count}{'' if exact else '+'} бронювань)")
+    if stats["monthly"]:
+        lines.append("\n📅 По місяцях:")
+        for month, count, spent, hours in stats["monthly"][:BOOKING_STATS_MONTHS]:
+            year, _, month_number = month.partition("-")
+            lines.append(f"{month_number}.{year} — {count} бр., {_amount(hours)} год, {_amount(spent)} грн")
+    return "\n".join(lines)
+
+@router.callback_query(F.data == "bk:stats")
+async def handle_booking_stats(callback: CallbackQuery, state: FSMContext, user_ctx: UserContext):
+    phone = await _callback_phone(callback, user_ctx)
+    if not phone:
+        return
+    await callback.answer()
+    stats = await get_booking_stats(phone)
+    if not stats["bookings"]:
+        return await callback.message.edit_text("❌ У вас немає бронювань.")
+    page = (await state.get_data()).get("booking_page", 1)
+    await callback.message.edit_text(
+        format_booking_stats(stats),
+        reply_markup=InlineKeyboardMarkup(inline_keyboard=[
+            [InlineKeyboardButton(text="⬅️ До бронювань", callback_data=f"bk:page:{page}")]
+        ]),
     )
+
+@router.callback_query(F.data.startswith("bk:page:"))
+async def handle_booking_pagination(callback: CallbackQuery, state: FSMContext, user_ctx: UserContext):
+    phone = await _callback_phone(callback, user_ctx)
+    if not phone:
+        return
+    await callback.answer()
+    page = int(callback.data[len("bk:page:"):])
+    history = _booking_histories.get(callback.from_user.id)
+    if history is None:
+        # Історію не відкривали після перезапуску бота — показуємо її з початку
+        history = open_booking_history(callback.from_user.id, BookingHistory(phone))
+        page = 1
+    elif page > 1 and not history.has_page(page):
+        page = 1
+    await show_booking_page(callback.message, state, history, page, edit=True)
+
+async def show_booking_page(
+    message: Message,
+    state: FSMContext,
+    history: BookingHistory | FilteredBookings,
+    page: int,
+    edit: bool = False,
+):
+    """
+    Сторінка історії в одному повідомленні з інлайн-кнопками: перше відкриття надсилає
+    повідомлення, гортання й фільтри редагують його. Зібраний текст сторінки зберігається
+    в history.rendered (лише повний), тож повернення на сторінку не звертається до API.
+    """
+    filtered = history.title is not None
+    text = history.rendered.get(page)
+    if text is None:
+        chunk = await history.page(page)
+        if chunk is None:
+            return await message.answer("❌ Не вдалося завантажити бронювання. Спробуйте пізніше.", reply_markup=main_menu())
+        if not chunk and page == 1:
+            if not filtered:
+                return await message.answer(history.empty_text, reply_markup=main_menu())
+            text, complete = history.empty_text, True
+        else:
+            text, complete = await render_booking_page(chunk, history.spots)
+        # Сторінку з місцем, що не завантажилось, збираємо знову при наступному показі
+        if complete:
+            history.rendered[page] = text
+    history.prefetch(page + 1)
+
+    # Заголовок не кешується: загальна кількість сторінок може стати відомою пізніше
+    if history.total != 0:
+        total_pages = history.total_pages
+        header = f"📄 Сторінка {page}/{total_pages}" if total_pages else f"📄 Сторінка {page}"
+        if filtered:
+            header = f"{history.title} · {header}"
+        text = f"{header}\n\n{text}"
+
+    keyboard = build_bookings_keyboard(page, history.has_page(page + 1), filtered)
+    await state.update_data(booking_page=page)
+    if edit:
+        # Повторне натискання тієї ж кнопки дає «message is not modified» — ігноруємо
+        with suppress(TelegramBadRequest):
+            await message.edit_text(text, reply_markup=keyboard)
+    else:
+        await message.answer(text, reply_markup=keyboard)
@@ -10,6 +10,7 @@ from aiogram.fsm.state import StatesGroup, State
 from loguru import logger
 
 from telegram_bot.keyboards.menu import main_menu
+from telegram_bot.middlewares.user_context import UserContext
 from telegram_bot.services.car_service import (
     add_car_phone,
     get_user_cars,
@@ -74,9 +75,8 @@ async def open_cars_menu(message: Message, state: FSMContext):
 
 # 📋 Список авто
 @router.message(F.text == "📋 Список авто")
-async def list_user_cars(message: Message, state: FSMContext):
-    data = await state.get_data()
-    phone = data.get("phone_number")
+async def list_user_cars(message: Message, state: FSMContext, user_ctx: UserContext):
+    phone = user_ctx.phone_number
     if not phone:
         await message.answer("⚠️ Не вдалося визначити номер телефону.")
         return
@@ -105,10 +105,9 @@ async def start_add_car(message: Message, state: FSMContext):
 
 
 @router.message(AddCarState.brand)
-async def get_brand(message: Message, state: FSMContext):
+async def get_brand(message: Message, state: FSMContext, user_ctx: UserContext):
     if message.text == "⬅️ Назад":
-        data = await state.get_data()
-        phone = data.get("phone_number")
+        phone = user_ctx.phone_number
         await state.clear()
         if phone:
             await state.update_data(phone_number=phone)
@@ -124,10 +123,9 @@ async def get_brand(message: Message, state: FSMContext):
 
 
 @router.message(AddCarState.model)
-async def get_model(message: Message, state: FSMContext):
+async def get_model(message: Message, state: FSMContext, user_ctx: UserContext):
     if message.text == "⬅️ Назад":
-        data = await state.get_data()
-        phone = data.get("phone_number")
+        phone = user_ctx.phone_number
         await state.clear()
         if phone:
             await state.update_data(phone_number=phone)
@@ -143,10 +141,9 @@ async def get_model(message: Message, state: FSMContext):
 
 
 @router.message(AddCarState.year)
-async def get_year(message: Message, state: FSMContext):
+async def get_year(message: Message, state: FSMContext, user_ctx: UserContext):
     if message.text == "⬅️ Назад":
-        data = await state.get_data()
-        phone = data.get("phone_number")
+        phone = user_ctx.phone_number
         await state.clear()
         if phone:
             await state.update_data(phone_number=phone)
@@ -162,10 +159,9 @@ async def get_year(message: Message, state: FSMContext):
 
 
 @router.message(AddCarState.license_plate)
-async def get_plate(message: Message, state: FSMContext):
+async def get_plate(message: Message, state: FSMContext, user_ctx: UserContext):
     if message.text == "⬅️ Назад":
-        data = await state.get_data()
-        phone = data.get("phone_number")
+        phone = user_ctx.phone_number
         await state.clear()
         if phone:
             await state.update_data(phone_number=phone)
@@ -176,7 +172,7 @@ async def get_plate(message: Message, state: FSMContext):
         await message.answer("❌ Невірний формат.", reply_markup=back_kb())
         return
     data = await state.get_data()
-    phone = data.get("phone_number")
+    phone = user_ctx.phone_number
     if not phone:
         await message.answer("⚠️ Немає номера телефону.")
         return
@@ -203,9 +199,8 @@ async def get_plate(message: Message, state: FSMContext):
 
 # ✏️ Змінити авто
 @router.message(F.text == "✏️ Змінити авто")
-async def start_update_car(message: Message, state: FSMContext):
-    data = await state.get_data()
-    phone = data.get("phone_number")
+async def start_update_car(message: Message, state: FSMContext, user_ctx: UserContext):
+    phone = user_ctx.phone_number
     if not phone:
         await message.answer("⚠️ Немає телефону.")
         return
@@ -237,10 +232,9 @@ async def select_car_for_update(callback: CallbackQuery, state: FSMContext):
 
 
 @router.message(UpdateCarState.brand)
-async def update_brand(message: Message, state: FSMContext):
+async def update_brand(message: Message, state: FSMContext, user_ctx: UserContext):
     if message.text == "⬅️ Назад":
-        data = await state.get_data()
-        phone = data.get("phone_number")
+        phone = user_ctx.phone_number
         await state.clear()
         if phone:
             await state.update_data(phone_number=phone)
@@ -256,10 +250,9 @@ async def update_brand(message: Message, state: FSMContext):
 
 
 @router.message(UpdateCarState.model)
-async def update_model(message: Message, state: FSMContext):
+async def update_model(message: Message, state: FSMContext, user_ctx: UserContext):
     if message.text == "⬅️ Назад":
-        data = await state.get_data()
-        phone = data.get("phone_number")
+        phone = user_ctx.phone_number
         await state.clear()
         if phone:
             await state.update_data(phone_number=phone)
@@ -275,10 +268,9 @@ async def update_model(message: Message, state: FSMContext):
 
 
 @router.message(UpdateCarState.year)
-async def update_year(message: Message, state: FSMContext):
+async def update_year(message: Message, state: FSMContext, user_ctx: UserContext):
     if message.text == "⬅️ Назад":
-        data = await state.get_data()
-        phone = data.get("phone_number")
+        phone = user_ctx.phone_number
         await state.clear()
         if phone:
             await state.update_data(phone_number=phone)
@@ -290,7 +282,7 @@ async def update_year(message: Message, state: FSMContext):
         return
 
     data = await state.get_data()
-    phone = data.get("phone_number")
+    phone = user_ctx.phone_number
     plate = data.get("selected_plate")
 
     if not phone or not plate:
@@ -318,9 +310,8 @@ async def update_year(message: Message, state: FSMContext):
 
 # 🗑 Видалення авто
 @router.message(F.text == "🗑 Видалити авто")
-async def start_delete_car(message: Message, state: FSMContext):
-    data = await state.get_data()
-    phone = data.get("phone_number")
+async def start_delete_car(message: Message, state: FSMContext, user_ctx: UserContext):
+    phone = user_ctx.phone_number
     if not phone:
         await message.answer("⚠️ Немає телефону.")
         return
@@ -343,10 +334,9 @@ async def start_delete_car(message: Message, state: FSMContext):
 
 
 @router.callback_query(F.data.startswith("delete:"))
-async def delete_car(callback: CallbackQuery, state: FSMContext):
+async def delete_car(callback: CallbackQuery, state: FSMContext, user_ctx: UserContext):
     plate = callback.data.split(":")[1]
-    data = await state.get_data()
-    phone = data.get("phone_number")
+    phone = user_ctx.phone_number
     if not phone:
         await callback.answer("⚠️ Немає телефону.")
         return
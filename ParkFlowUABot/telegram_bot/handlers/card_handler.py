@@ -10,6 +10,7 @@ from aiogram.fsm.state import StatesGroup, State
 from loguru import logger
 
 from telegram_bot.keyboards.menu import main_menu, card_menu
+from telegram_bot.middlewares.user_context import UserContext
 from telegram_bot.services.card_service import (
     add_card,
     get_user_cards,
@@ -89,7 +90,7 @@ async def get_exp_date(message: Message, state: FSMContext):
 
 
 @router.message(AddCardState.cvv)
-async def get_cvv(message: Message, state: FSMContext):
+async def get_cvv(message: Message, state: FSMContext, user_ctx: UserContext):
     if message.text == "⬅️ Назад":
         logger.info(f"[CARD] {message.from_user.id} повернувся назад з CVV")
         await return_to_menu(state, message)
@@ -102,7 +103,7 @@ async def get_cvv(message: Message, state: FSMContext):
 
     await state.update_data(cvv=cvv)
     data = await state.get_data()
-    phone = data.get("phone_number")
+    phone = user_ctx.phone_number
 
     if not phone:
         logger.error(f"[CARD] Немає номера телефону в state у {message.from_user.id}")
@@ -132,8 +133,8 @@ async def get_cvv(message: Message, state: FSMContext):
 
 
 @router.message(F.text == "📋 Мої картки")
-async def list_cards(message: Message, state: FSMContext):
-    phone = (await state.get_data()).get("phone_number")
+async def list_cards(message: Message, state: FSMContext, user_ctx: UserContext):
+    phone = user_ctx.phone_number
     logger.info(f"[CARD] {message.from_user.id} запитав список карток")
 
     if not phone:
@@ -154,8 +155,8 @@ async def list_cards(message: Message, state: FSMContext):
 
 
 @router.message(F.text == "❌ Видалити картку")
-async def show_cards_for_deletion(message: Message, state: FSMContext):
-    phone = (await state.get_data()).get("phone_number")
+async def show_cards_for_deletion(message: Message, state: FSMContext, user_ctx: UserContext):
+    phone = user_ctx.phone_number
     logger.info(f"[CARD] {message.from_user.id} хоче видалити картку")
 
     if not phone:
@@ -189,8 +190,8 @@ async def handle_card_deletion(callback: CallbackQuery, state: FSMContext):
 
 
 @router.message(F.text == "✏️ Змінити картку")
-async def show_cards_for_update(message: Message, state: FSMContext):
-    phone = (await state.get_data()).get("phone_number")
+async def show_cards_for_update(message: Message, state: FSMContext, user_ctx: UserContext):
+    phone = user_ctx.phone_number
     logger.info(f"[CARD] {message.from_user.id} хоче змінити картку")
 
     if not phone:
@@ -256,7 +257,7 @@ async def update_exp_date(message: Message, state: FSMContext):
 
 
 @router.message(UpdateCardState.cvv)
-async def update_cvv(message: Message, state: FSMContext):
+async def update_cvv(message: Message, state: FSMContext, user_ctx: UserContext):
     if message.text == "⬅️ Назад":
         await return_to_menu(state, message)
         return
@@ -268,7 +269,7 @@ async def update_cvv(message: Message, state: FSMContext):
 
     await state.update_data(cvv=cvv)
     data = await state.get_data()
-    phone = data.get("phone_number")
+    phone = user_ctx.phone_number
     card_id = data.get("card_id")
 
     logger.info(f"[CARD] Спроба оновлення картки {card_id} для {phone}")
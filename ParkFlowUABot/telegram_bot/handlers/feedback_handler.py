@@ -1,14 +1,28 @@
+import asyncio
+from contextlib import suppress
+
 from aiogram import Router, F
-from aiogram.types import Message, ReplyKeyboardMarkup, KeyboardButton
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import (
+    CallbackQuery, Message,
+    ReplyKeyboardMarkup, KeyboardButton,
+    InlineKeyboardMarkup, InlineKeyboardButton
+)
 from aiogram.fsm.state import State, StatesGroup
 from aiogram.fsm.context import FSMContext
-from datetime import datetime
 
 from loguru import logger
 
-from telegram_bot.services.feedback_service import send_feedback, get_all_feedbacks
-from telegram_bot.services.user_service import get_user_by_phone, get_user_by_id
+from telegram_bot.monitoring.metrics import CACHE_REQUESTS
+from telegram_bot.monitoring.tracing import create_detached_task
+from telegram_bot.services.feedback_service import send_feedback, get_feedback_set
+from telegram_bot.services.user_service import USER_DELETED, get_user_by_id
+from telegram_bot.handlers.feedback_texts import (
+    ALL_FEEDBACKS, BACK_TO_FEEDBACK_MENU, FEEDBACK_MENU, FEEDBACK_PAGE_PREFIX, MAIN_MENU, SEND_FEEDBACK,
+)
 from telegram_bot.keyboards.menu import main_menu
+from telegram_bot.middlewares.user_context import UserContext, ensure_user_id
+from telegram_bot.timeutils import format_timestamp
 
 router = Router()
 
@@ -23,35 +37,72 @@ FEEDBACKS_PER_PAGE = 5
 def feedback_menu_keyboard() -> ReplyKeyboardMarkup:
     return ReplyKeyboardMarkup(
         keyboard=[
-            [KeyboardButton(text="✍️ Надіслати відгук")],
-            [KeyboardButton(text="📖 Всі відгуки")],
-            [KeyboardButton(text="🏠 Головне меню")]
+            [KeyboardButton(text=SEND_FEEDBACK)],
+            [KeyboardButton(text=ALL_FEEDBACKS)],
+            [KeyboardButton(text=MAIN_MENU)]
         ],
         resize_keyboard=True
     )
 
-def feedback_pagination_keyboard(page: int, total_pages: int) -> ReplyKeyboardMarkup:
-    buttons = []
-
+def feedback_pagination_keyboard(page: int, total_pages: int) -> InlineKeyboardMarkup:
     nav = []
     if page > 1:
-        nav.append(KeyboardButton(text="⬅️ Назад"))
+        nav.append(InlineKeyboardButton(text="⬅️ Назад", callback_data=f"{FEEDBACK_PAGE_PREFIX}{page - 1}"))
     if page < total_pages:
-        nav.append(KeyboardButton(text="➡️ Вперед"))
-    if nav:
-        buttons.append(nav)
+        nav.append(InlineKeyboardButton(text="➡️ Вперед", callback_data=f"{FEEDBACK_PAGE_PREFIX}{page + 1}"))
+    return InlineKeyboardMarkup(inline_keyboard=[nav] if nav else [])
+
+
+def feedback_total_pages(feedbacks: list) -> int:
+    return max(1, (len(feedbacks) + FEEDBACKS_PER_PAGE - 1) // FEEDBACKS_PER_PAGE)
+
+
+class FeedbackPageCache:
+    """
+    Зібрані тексти сторінок «📖 Всі відгуки», спільні для всіх користувачів. Сторінки належать
+    одній версії набору відгуків (get_feedback_set): нова версія скидає їх усі. Кешується задача
+    рендерингу, тож кілька одночасних переглядів сторінки чекають один і той самий рендер.
+    """
+
+    def __init__(self):
+        self.version: str | None = None
+        self._pages: dict[int, asyncio.Task] = {}
+
+    def _load(self, version: str, feedbacks: list, page: int) -> asyncio.Task:
+        if version != self.version:
+            self.version = version
+            self._pages = {}
+        task = self._pages.get(page)
+        if task is None:
+            task = self._pages[page] = create_detached_task(
+                render_feedback_page(feedbacks, page, feedback_total_pages(feedbacks))
+            )
+        return task
+
+    async def text(self, version: str, feedbacks: list, page: int) -> str:
+        CACHE_REQUESTS.inc("feedback_pages", "hit" if version == self.version and page in self._pages else "miss")
+        task = self._load(version, feedbacks, page)
+        text, complete = await task
+        if not complete and self._pages.get(page) is task:
+            # Автора не отримали через помилку API — наступний перегляд спробує ще раз
+            self._pages.pop(page)
+        return text
 
-    buttons.append([KeyboardButton(text="📋 Меню відгуків")])
-    buttons.append([KeyboardButton(text="🏠 Головне меню")])
+    def prerender(self, version: str, feedbacks: list, page: int):
+        """Рендерить наступну сторінку у фоні, поки користувач читає поточну."""
+        if page <= feedback_total_pages(feedbacks):
+            self._load(version, feedbacks, page)
 
-    return ReplyKeyboardMarkup(keyboard=buttons, resize_keyboard=True)
 
-@router.message(F.text == "📣 Відгуки")
+_feedback_pages = FeedbackPageCache()
+
+
+@router.message(F.text == FEEDBACK_MENU)
 async def feedback_menu(message: Message, state: FSMContext):
     await state.set_state(None)
     await message.answer("Меню відгуків:", reply_markup=feedback_menu_keyboard())
 
-@router.message(F.text == "✍️ Надіслати відгук")
+@router.message(F.text == SEND_FEEDBACK)
 async def prompt_feedback(message: Message, state: FSMContext):
     await state.set_state(FeedbackStates.typing_feedback)
     await message.answer("📝 Напишіть свій відгук:", reply_markup=ReplyKeyboardMarkup(
@@ -80,7 +131,7 @@ async def save_draft(message: Message, state: FSMContext):
     )
 
 @router.message(FeedbackStates.confirming)
-async def send_final_feedback(message: Message, state: FSMContext):
+async def send_final_feedback(message: Message, state: FSMContext, user_ctx: UserContext):
     if message.text == "⬅️ Назад":
         await state.set_state(FeedbackStates.typing_feedback)
         return await message.answer("✍️ Введіть новий текст відгуку:")
@@ -89,71 +140,66 @@ async def send_final_feedback(message: Message, state: FSMContext):
         return await message.answer("❗ Натисніть 📤 Відправити або ⬅️ Назад.")
 
     data = await state.get_data()
-    phone = data.get("phone_number")
+    phone = user_ctx.phone_number
     feedback_text = data.get("draft", "").strip()
 
     if not phone:
         await state.clear()
         return await message.answer("⚠️ Телефон не знайдено. Спробуйте /start.", reply_markup=main_menu())
 
-    user = await get_user_by_phone(phone)
-    if not user:
+    user_id = await ensure_user_id(user_ctx)
+    if not user_id:
         await state.clear()
         return await message.answer("❌ Користувача не знайдено.", reply_markup=main_menu())
 
-    user_id = user["id"]
     await send_feedback(user_id=user_id, text=feedback_text)
 
     await message.answer("✅ Ваш відгук надіслано. Дякуємо!", reply_markup=feedback_menu_keyboard())
     await state.clear()
     await state.update_data(phone_number=phone)  # повертаємо телефон у контекст
 
-@router.message(F.text == "📖 Всі відгуки")
+@router.message(F.text == ALL_FEEDBACKS)
 async def view_all_feedbacks(message: Message, state: FSMContext):
-    feedbacks = await get_all_feedbacks()
+    version, feedbacks = await get_feedback_set()
     if not feedbacks:
         return await message.answer("😔 Ще немає жодного відгуку.")
 
     await state.set_state(FeedbackStates.viewing_feedbacks)
-    await state.update_data(feedback_page=1)
-    await send_feedback_page(message, feedbacks, page=1)
+    await send_feedback_page(message, version, feedbacks, page=1)
 
-@router.message(F.text.in_(["⬅️ Назад", "➡️ Вперед"]))
-async def paginate_feedbacks(message: Message, state: FSMContext):
-    feedbacks = await get_all_feedbacks()
+@router.callback_query(F.data.startswith(FEEDBACK_PAGE_PREFIX))
+async def paginate_feedbacks(callback: CallbackQuery, state: FSMContext):
+    await callback.answer()
+    version, feedbacks = await get_feedback_set()
     if not feedbacks:
-        return await message.answer("😔 Відгуки відсутні.")
-
-    data = await state.get_data()
-    page = data.get("feedback_page", 1)
-    total_pages = (len(feedbacks) + FEEDBACKS_PER_PAGE - 1) // FEEDBACKS_PER_PAGE
-
-    if message.text == "⬅️ Назад" and page > 1:
-        page -= 1
-    elif message.text == "➡️ Вперед" and page < total_pages:
-        page += 1
+        return await callback.message.edit_text("😔 Відгуки відсутні.")
 
-    await state.update_data(feedback_page=page)
-    await send_feedback_page(message, feedbacks, page)
+    page = min(max(int(callback.data[len(FEEDBACK_PAGE_PREFIX):]), 1), feedback_total_pages(feedbacks))
+    await send_feedback_page(callback.message, version, feedbacks, page, edit=True)
 
-async def send_feedback_page(message: Message, feedbacks: list, page: int):
-    total_pages = (len(feedbacks) + FEEDBACKS_PER_PAGE - 1) // FEEDBACKS_PER_PAGE
+async def render_feedback_page(feedbacks: list, page: int, total_pages: int) -> tuple[str, bool]:
+    """
+    Текст сторінки відгуків і чи вдалося отримати всіх авторів (видалений автор — теж відповідь,
+    незавершена лише сторінка з помилкою запиту); feedbacks — уже в порядку показу (новіші
+    першими). Різні автори сторінки запитуються паралельно.
+    """
     start = (page - 1) * FEEDBACKS_PER_PAGE
-    end = start + FEEDBACKS_PER_PAGE
-    chunk = feedbacks[::-1][start:end]
+    chunk = feedbacks[start:start + FEEDBACKS_PER_PAGE]
+    user_ids = list(dict.fromkeys(fb["user_id"] for fb in chunk))
+    users = dict(zip(user_ids, await asyncio.gather(*(get_user_by_id(user_id) for user_id in user_ids))))
 
     lines = []
 
     for fb in chunk:
-        user = await get_user_by_id(fb["user_id"])
-        if user:
+        user = users[fb["user_id"]]
+        if user and user is not USER_DELETED:
             full_name = f"{user.get('first_name', '')} {user.get('last_name', '')}".strip()
         else:
             full_name = "Видалений акаунт"
 
         created_at = fb.get("timestamp") or fb.get("created_at") or "—"
         try:
-            created_at = datetime.fromisoformat(created_at).strftime("%d.%m.%Y %H:%M")
+            created_at = format_timestamp(created_at)
         except Exception:
             pass
 
@@ -163,20 +209,27 @@ async def send_feedback_page(message: Message, feedbacks: list, page: int):
             f"💬 {fb['text']}"
         )
 
-    await message.answer(
-        f"📝 Відгуки (сторінка {page}/{total_pages}):\n\n" + "\n\n".join(lines),
-        reply_markup=feedback_pagination_keyboard(page, total_pages)
-    )
+    text = f"📝 Відгуки (сторінка {page}/{total_pages}):\n\n" + "\n\n".join(lines)
+    return text, all(user is not None for user in users.values())
 
-@router.message(F.text == "📋 Меню відгуків")
+async def send_feedback_page(message: Message, version: str, feedbacks: list, page: int, edit: bool = False):
+    text = await _feedback_pages.text(version, feedbacks, page)
+    _feedback_pages.prerender(version, feedbacks, page + 1)
+    keyboard = feedback_pagination_keyboard(page, feedback_total_pages(feedbacks))
+    if edit:
+        with suppress(TelegramBadRequest):
+            await message.edit_text(text, reply_markup=keyboard)
+    else:
+        await message.answer(text, reply_markup=keyboard)
+
+@router.message(F.text == BACK_TO_FEEDBACK_MENU)
 async def back_to_feedback_menu(message: Message, state: FSMContext):
     await state.set_state(None)
     await message.answer("Меню відгуків:", reply_markup=feedback_menu_keyboard())
 
-@router.message(F.text == "🏠 Головне меню")
-async def to_main(message: Message, state: FSMContext):
-    data = await state.get_data()
-    phone = data.get("phone_number")
+@router.message(F.text == MAIN_MENU)
+async def to_main(message: Message, state: FSMContext, user_ctx: UserContext):
+    phone = user_ctx.phone_number
     await state.clear()
     if phone:
         await state.update_data(phone_number=phone)
@@ -0,0 +1,15 @@
+# Тексти кнопок і callback_data розділу відгуків — спільні для feedback_handler та його
+# LazyRouter у handlers/__init__.py, щоб відкладений імпорт реагував саме на них
+
+FEEDBACK_MENU = "📣 Відгуки"
+SEND_FEEDBACK = "✍️ Надіслати відгук"
+ALL_FEEDBACKS = "📖 Всі відгуки"
+BACK_TO_FEEDBACK_MENU = "📋 Меню відгуків"
+MAIN_MENU = "🏠 Головне меню"
+
+# Усі тексти, на які обробники відгуків реагують без фільтра стану
+FEEDBACK_TRIGGER_TEXTS = frozenset({FEEDBACK_MENU, SEND_FEEDBACK, ALL_FEEDBACKS, BACK_TO_FEEDBACK_MENU, MAIN_MENU})
+
+# Початок callback_data усіх інлайн-кнопок відгуків і кнопок сторінок списку
+FEEDBACK_CALLBACK_PREFIX = "fb:"
+FEEDBACK_PAGE_PREFIX = f"{FEEDBACK_CALLBACK_PREFIX}page:"
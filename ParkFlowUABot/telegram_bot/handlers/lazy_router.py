@@ -0,0 +1,63 @@
+import importlib
+import time
+
+from aiogram import Router
+from aiogram.types import CallbackQuery, Message
+from loguru import logger
+
+
+class LazyRouter(Router):
+    """
+    Заглушка на місці router-а в all_handlers: модуль обробників імпортується лише тоді,
+    коли до цієї позиції вперше доходить апдейт, на який він міг би відреагувати.
+
+    Справжній router підключається як дочірній, тож порядок обробки такий самий, як при
+    звичайному імпорті. Фільтр заглушки завжди повертає False — aiogram після цього сам
+    передає апдейт дочірнім router-ам, тобто щойно імпортованому.
+    """
+
+    def __init__(
+        self,
+        module: str,
+        texts: frozenset[str] | None = None,
+        state_groups: tuple[str, ...] = (),
+        callback_prefixes: tuple[str, ...] = (),
+    ):
+        """
+        texts — тексти, на які реагують обробники модуля без фільтра стану (None — будь-який апдейт);
+        state_groups — StatesGroup модуля: апдейт у такому стані теж завантажує модуль;
+        callback_prefixes — початки callback_data інлайн-кнопок модуля (кнопки переживають перезапуск бота).
+        """
+        super().__init__(name=f"lazy:{module.rsplit('.', 1)[-1]}")
+        self.module = module
+        self.texts = texts
+        self.state_groups = state_groups
+        self.callback_prefixes = callback_prefixes
+        self.router: Router | None = None
+        for observer in (self.message, self.callback_query):
+            observer.register(self._never_called, self._load_on_first_use)
+
+    async def _load_on_first_use(self, event, raw_state: str | None = None) -> bool:
+        if self.router is None and self._is_trigger(event, raw_state):
+            self.load()
+        return False
+
+    def _is_trigger(self, event, raw_state: str | None) -> bool:
+        if self.texts is None:
+            return True
+        if raw_state and raw_state.split(":", 1)[0] in self.state_groups:
+            return True
+        if isinstance(event, CallbackQuery):
+            return bool(self.callback_prefixes) and (event.data or "").startswith(self.callback_prefixes)
+        return isinstance(event, Message) and event.text in self.texts
+
+    def load(self) -> Router:
+        started = time.perf_counter()
+        self.router = importlib.import_module(self.module).router
+        self.include_router(self.router)
+        logger.info("[LAZY] {} імпортовано за {:.1f} мс", self.module, (time.perf_counter() - started) * 1000)
+        return self.router
+
+    @staticmethod
+    async def _never_called(event):
+        pass
@@ -8,6 +8,7 @@ from aiohttp import ClientConnectorError
 from telegram_bot.services.api_service import is_api_available
 from telegram_bot.services.user_service import get_user_by_phone, create_user
 from telegram_bot.keyboards.menu import main_menu
+from telegram_bot.middlewares.user_context import UserContext, forget_user, remember_user
 
 router = Router()
 
@@ -18,7 +19,7 @@ class Registration(StatesGroup):
 
 # --- Контакт ---
 @router.message(F.contact)
-async def handle_contact(message: Message, state: FSMContext):
+async def handle_contact(message: Message, state: FSMContext, user_ctx: UserContext):
     phone = message.contact.phone_number
     telegram_id = message.from_user.id
 
@@ -26,6 +27,20 @@ async def handle_contact(message: Message, state: FSMContext):
 
     await state.update_data(phone_number=phone)
 
+    # Відомий користувач — відновлюємо сесію з локальної мапи без звернення до API
+    if user_ctx.phone_number == phone and user_ctx.user_id is not None:
+        logger.info(f"[REGISTRATION] Сесію відновлено локально для telegram_id={telegram_id}")
+        await message.answer(
+            f"Вас розпізнано як {user_ctx.first_name}!",
+            reply_markup=main_menu()
+        )
+        return
+
+    # Новий номер ще не підтверджено API: старий контекст більше не чинний, а номер
+    # до підтвердження береться з FSM (remember_user — лише після успішного пошуку нижче)
+    if user_ctx.phone_number != phone:
+        forget_user(telegram_id)
+
     if not await is_api_available():
         logger.warning("API недоступне при отриманні контакту")
         await message.answer(
@@ -46,6 +61,7 @@ async def handle_contact(message: Message, state: FSMContext):
 
     if user:
         logger.info(f"[REGISTRATION] Користувач знайдений: {user}")
+        remember_user(telegram_id, phone, user)
         await message.answer(
             f"Вас розпізнано як {user.get('first_name')}!",
             reply_markup=main_menu()
@@ -99,7 +115,7 @@ async def finish_registration(message: Message, state: FSMContext):
     phone_number = data.get("phone_number")  # 🔹 ЗБЕРІГАЄМО НОМЕР
 
     try:
-        await create_user(
+        user = await create_user(
             telegram_id=message.from_user.id,
             phone_number=phone_number,
             first_name=data["first_name"],
@@ -107,6 +123,7 @@ async def finish_registration(message: Message, state: FSMContext):
             email=data.get("email")
         )
         logger.info(f"[REGISTRATION] Користувача створено: telegram_id={message.from_user.id}")
+        remember_user(message.from_user.id, phone_number, user)
     except ClientConnectorError:
         logger.exception("[REGISTRATION] API недоступне при створенні користувача.")
         await message.answer("❌ API недоступне. Спробуйте пізніше.")
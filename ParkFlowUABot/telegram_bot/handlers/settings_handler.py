@@ -7,6 +7,7 @@ from loguru import logger
 from telegram_bot.services.user_service import get_user_by_phone, delete_user_by_phone, update_user_by_phone
 from telegram_bot.services.api_service import is_api_available
 from telegram_bot.keyboards.menu import main_menu, settings_menu
+from telegram_bot.middlewares.user_context import UserContext, forget_user, remember_user
 
 router = Router()
 
@@ -30,9 +31,8 @@ async def get_last_menu_markup(state: FSMContext):
     )
 
 
-async def get_valid_phone_or_notify(message: Message, state: FSMContext) -> str | None:
-    data = await state.get_data()
-    phone = data.get("phone_number")
+async def get_valid_phone_or_notify(message: Message, state: FSMContext, user_ctx: UserContext) -> str | None:
+    phone = user_ctx.phone_number
 
     if not phone:
         await message.answer("❗ Не вдалося отримати номер телефону. Спробуйте /start.")
@@ -61,15 +61,16 @@ async def go_back(message: Message, state: FSMContext):
 
 
 @router.message(F.text == "👤 Отримати інформацію про себе")
-async def get_user_info(message: Message, state: FSMContext):
+async def get_user_info(message: Message, state: FSMContext, user_ctx: UserContext):
     logger.info(f"[SETTINGS] Користувач {message.from_user.id} запитав інформацію про себе")
-    phone = await get_valid_phone_or_notify(message, state)
+    phone = await get_valid_phone_or_notify(message, state, user_ctx)
     if not phone:
         return
 
     user = await get_user_by_phone(phone)
     markup = await get_last_menu_markup(state)
     if user:
+        remember_user(message.from_user.id, phone, user)
         await message.answer(
             f"👤 *Ваш профіль:*\n"
             f"Ім'я: {user.get('first_name', '')} {user.get('last_name', '')}\n"
@@ -90,10 +91,10 @@ async def change_name_prompt(message: Message, state: FSMContext):
 
 
 @router.message(EditState.new_full_name)
-async def update_full_name(message: Message, state: FSMContext):
+async def update_full_name(message: Message, state: FSMContext, user_ctx: UserContext):
     input_text = message.text.strip()
     parts = input_text.split(maxsplit=1)
-    phone = await get_valid_phone_or_notify(message, state)
+    phone = await get_valid_phone_or_notify(message, state, user_ctx)
     markup = await get_last_menu_markup(state)
 
     if not phone:
@@ -107,6 +108,7 @@ async def update_full_name(message: Message, state: FSMContext):
     first_name, last_name = parts
     success = await update_user_by_phone(phone, {"first_name": first_name, "last_name": last_name})
     if success:
+        remember_user(message.from_user.id, phone, {"first_name": first_name, "last_name": last_name})
         await message.answer("✅ Ім’я та прізвище оновлено.", reply_markup=markup)
     else:
         await message.answer("❌ Не вдалося оновити. Спробуйте пізніше.", reply_markup=markup)
@@ -123,10 +125,9 @@ async def change_email_prompt(message: Message, state: FSMContext):
 
 
 @router.message(EditState.new_email)
-async def update_email(message: Message, state: FSMContext):
+async def update_email(message: Message, state: FSMContext, user_ctx: UserContext):
     email = message.text.strip()
-    data = await state.get_data()
-    phone = await get_valid_phone_or_notify(message, state)
+    phone = await get_valid_phone_or_notify(message, state, user_ctx)
     markup = await get_last_menu_markup(state)
 
     if not phone:
@@ -163,9 +164,9 @@ async def delete_profile(message: Message, state: FSMContext):
 
 
 @router.message(F.text == "✅ Так, видалити")
-async def confirm_delete(message: Message, state: FSMContext):
+async def confirm_delete(message: Message, state: FSMContext, user_ctx: UserContext):
     logger.info(f"[SETTINGS] Користувач {message.from_user.id} підтвердив видалення профілю")
-    phone = await get_valid_phone_or_notify(message, state)
+    phone = await get_valid_phone_or_notify(message, state, user_ctx)
     markup = await get_last_menu_markup(state)
 
     if not phone:
@@ -175,6 +176,7 @@ async def confirm_delete(message: Message, state: FSMContext):
     if success:
         await message.answer("✅ Ваш профіль успішно видалено. Для повторної реєстрації введіть /start.", reply_markup=main_menu())
         await state.clear()
+        forget_user(message.from_user.id)
     else:
         await message.answer("❌ Не вдалося видалити профіль. Спробуйте пізніше.", reply_markup=markup)
 
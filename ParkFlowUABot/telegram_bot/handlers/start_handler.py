@@ -5,6 +5,8 @@ from aiogram.filters import Command
 from loguru import logger
 
 from telegram_bot.services.api_service import is_api_available
+from telegram_bot.keyboards.menu import main_menu
+from telegram_bot.middlewares.user_context import UserContext
 
 router = Router()
 
@@ -23,9 +25,19 @@ retry_keyboard = ReplyKeyboardMarkup(
 )
 
 @router.message(Command("start"))
-async def start(message: Message, state: FSMContext):
+async def start(message: Message, state: FSMContext, user_ctx: UserContext):
     logger.info(f"/start викликано користувачем: telegram_id={message.from_user.id}")
 
+    # Повторний користувач: сесія відновлюється з локальної мапи без запитів до API
+    if user_ctx.phone_number and user_ctx.user_id is not None:
+        logger.info(f"Сесію відновлено локально: telegram_id={message.from_user.id}")
+        await state.update_data(phone_number=user_ctx.phone_number)
+        await message.answer(
+            f"👋 З поверненням, {user_ctx.first_name}!",
+            reply_markup=main_menu()
+        )
+        return
+
     if not await is_api_available():
         logger.warning("Сервер API недоступний при виклику /start")
         await message.answer(
@@ -44,6 +56,6 @@ async def start(message: Message, state: FSMContext):
     )
 
 @router.message(F.text == "🔁 Спробувати ще раз")
-async def retry_start(message: Message, state: FSMContext):
+async def retry_start(message: Message, state: FSMContext, user_ctx: UserContext):
     logger.info(f"Користувач {message.from_user.id} натиснув 'Спробувати ще раз'")
-    await start(message, state)
+    await start(message, state, user_ctx)
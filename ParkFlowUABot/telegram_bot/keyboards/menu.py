@@ -1,4 +1,6 @@
-from aiogram.types import ReplyKeyboardMarkup, KeyboardButton
+from typing import Callable
+
+from aiogram.types import ReplyKeyboardMarkup, KeyboardButton, InlineKeyboardMarkup, InlineKeyboardButton
 from loguru import logger
 
 
@@ -95,4 +97,34 @@ def build_keyboard_from_list(options: list[str], include_nav: bool = True) -> Re
             KeyboardButton(text="🏠 Головне меню")
         ])
 
-    return ReplyKeyboardMarkup(keyboard=keyboard, resize_keyboard=True)
\ No newline at end of file
+    return ReplyKeyboardMarkup(keyboard=keyboard, resize_keyboard=True)
+
+
+def build_paginated_inline_keyboard(
+    items: list[dict],
+    label: Callable[[dict], str],
+    prefix: str,
+    page: int = 1,
+    per_page: int = 8,
+) -> InlineKeyboardMarkup:
+    """
+    Інлайн-клавіатура з однією сторінкою списку: підписи формуються лише для показаних елементів,
+    кнопка елемента надсилає "{prefix}:{id}", стрілки гортання — "{prefix}:page:{n}".
+    """
+    pages = max(1, (len(items) + per_page - 1) // per_page)
+    page = min(max(page, 1), pages)
+    keyboard = [
+        [InlineKeyboardButton(text=label(item), callback_data=f"{prefix}:{item['id']}")]
+        for item in items[(page - 1) * per_page:page * per_page]
+    ]
+
+    if pages > 1:
+        nav = []
+        if page > 1:
+            nav.append(InlineKeyboardButton(text="◀️", callback_data=f"{prefix}:page:{page - 1}"))
+        nav.append(InlineKeyboardButton(text=f"{page}/{pages}", callback_data="noop"))
+        if page < pages:
+            nav.append(InlineKeyboardButton(text="▶️", callback_data=f"{prefix}:page:{page + 1}"))
+        keyboard.append(nav)
+
+    return InlineKeyboardMarkup(inline_keyboard=keyboard)
@@ -0,0 +1,37 @@
+"""
+Вибір елемента списку з FSM за натиснутою кнопкою. Коли будується клавіатура, разом зі списком
+зберігається індекс «ключ кнопки → позиція елемента» (ключ — підпис reply-кнопки або id
+з callback_data), тож натискання розпізнається одним пошуком у словнику: без форматування
+підпису кожного елемента й без залежності від того, як саме підпис складено.
+"""
+from typing import Callable
+
+from aiogram.types import ReplyKeyboardMarkup
+
+from telegram_bot.keyboards.menu import build_keyboard_from_list
+
+
+def selection_index(items: list[dict], key: Callable[[dict], str]) -> dict[str, int]:
+    return {key(item): position for position, item in enumerate(items)}
+
+
+def id_index(items: list[dict]) -> dict[str, int]:
+    """Індекс за id — для callback_data, де передається лише id елемента."""
+    return selection_index(items, lambda item: str(item["id"]))
+
+
+def build_selection_keyboard(items: list[dict], label: Callable[[dict], str]) -> tuple[ReplyKeyboardMarkup, dict[str, int]]:
+    """
+    Reply-клавіатура з підписами елементів (плюс «Назад» / «Головне меню») та індекс
+    підпис → позиція, який треба зберегти в FSM поруч зі списком.
+    """
+    labels = [label(item) for item in items]
+    return build_keyboard_from_list(labels), {text: position for position, text in enumerate(labels)}
+
+
+def resolve_selection(items: list[dict], index: dict[str, int], key: str | None) -> dict | None:
+    """Елемент за натиснутою кнопкою або None, якщо такої кнопки в клавіатурі не було."""
+    position = index.get(key.strip()) if key else None
+    if position is None or position >= len(items):
+        return None
+    return items[position]
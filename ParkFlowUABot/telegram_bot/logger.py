@@ -1,3 +1,229 @@
+import atexit
+import gzip
+import json
+import logging
+import os
+import queue
+import random
+import shutil
+import sys
+import threading
+import traceback
+from datetime import datetime
+
+from dotenv import load_dotenv
 from loguru import logger
 
-logger.add("telegram_bot/telegram_bot.log", rotation="1 MB", level="INFO", format="{time} | {level} | {message}")
+load_dotenv()
+
+LOG_FILE = os.getenv("LOG_FILE", "telegram_bot/telegram_bot.log")
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_ROTATION_BYTES = int(os.getenv("LOG_ROTATION_BYTES", str(1024 * 1024)))
+CONSOLE_LOG_LEVEL = os.getenv("CONSOLE_LOG_LEVEL", LOG_LEVEL)
+
+
+def _parse_sample_rates(raw: str) -> dict[str, float]:
+    # Формат: "CARS:0.1,BOOKING_SERVICE:0.05" — частка DEBUG-рядків категорії, що потрапляє в лог
+    rates = {}
+    for item in raw.split(","):
+        category, _, rate = item.partition(":")
+        if category.strip() and rate.strip():
+            rates[category.strip()] = float(rate)
+    return rates
+
+
+LOG_SAMPLE_RATES = _parse_sample_rates(os.getenv("LOG_SAMPLE_RATES", ""))
+
+
+class _Unsampled:
+    """Те, що повертає sampled() для рядка поза вибіркою: нічого не форматує й не пише."""
+
+    def debug(self, *args, **kwargs):
+        pass
+
+
+_UNSAMPLED = _Unsampled()
+# Рядки, про вибірку яких уже вирішив sampled(), — фільтр їх удруге не відкидає
+_sampled_logger = logger.bind(sampled=True)
+
+
+def sampled(category: str):
+    """
+    Логер для DEBUG-рядка категорії з LOG_SAMPLE_RATES. Вибірка вирішується до виклику, тож
+    відкинутий рядок не форматується зовсім — payload не перетворюється на рядок:
+        sampled("CARS").debug("[CARS] Отримано авто: {}", data)
+    """
+    rate = LOG_SAMPLE_RATES.get(category)
+    if rate is None:
+        return logger
+    return _sampled_logger if random.random() < rate else _UNSAMPLED
+
+
+def _sample_filter(record) -> bool:
+    """
+    Запасна вибірка для DEBUG-рядків, записаних без sampled(): повідомлення вже відформатоване,
+    тож економиться лише запис. Категорія — префікс повідомлення у квадратних дужках, наприклад "[CARS]".
+    """
+    if not LOG_SAMPLE_RATES or record["level"].no > 10 or record["extra"].get("sampled"):
+        return True
+    message = record["message"]
+    end = message.find("]")
+    if not message.startswith("[") or end < 0:
+        return True
+    rate = LOG_SAMPLE_RATES.get(message[1:end])
+    return rate is None or random.random() < rate
+
+
+def _compress_in_background(path: str):
+    # Стиснення ротованого файлу в окремому потоці, щоб не затримувати запис нових логів
+    def compress():
+        try:
+            with open(path, "rb") as src, gzip.open(f"{path}.gz", "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(path)
+        except OSError as e:
+            sys.stderr.write(f"Не вдалося стиснути {path}: {e}\n")
+
+    threading.Thread(target=compress, name="log-compress", daemon=True).start()
+
+
+# Фіксований набір полів JSON-запису; відсутні значення пишуться як null, щоб схема не «плавала»
+JSON_FIELDS = ("update_id", "user_id", "trace_id", "endpoint", "latency_ms", "status")
+
+
+def _json_format(record) -> str:
+    """
+    Серіалізує запис у компактний JSON-рядок і повертає шаблон, що просто виводить його.
+    """
+    extra = record["extra"]
+    payload = {
+        "ts": round(record["time"].timestamp(), 6),
+        "level": record["level"].name,
+        "module": record["name"],
+        "msg": record["message"],
+    }
+    for field in JSON_FIELDS:
+        payload[field] = extra.get(field)
+    if record["exception"] is not None:
+        exc_type, exc_value, exc_traceback = record["exception"]
+        payload["exc"] = f"{exc_type.__name__ if exc_type else ''}: {exc_value}"
+        payload["traceback"] = "".join(traceback.format_exception(exc_type, exc_value, exc_traceback))
+    extra["_json"] = json.dumps(payload, ensure_ascii=False, separators=(",", ":"), default=str)
+    return "{extra[_json]}\n"
+
+
+class InterceptHandler(logging.Handler):
+    """
+    Перенаправляє записи стандартного logging (aiogram, aiohttp, asyncio) у loguru.
+    """
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            level = logger.level(record.levelname).name
+        except ValueError:
+            level = record.levelno
+        logger.opt(depth=6, exception=record.exc_info).log(level, record.getMessage())
+
+
+class QueuedSink:
+    """
+    Sink для loguru, що лише кладе готовий рядок у чергу. Запис у файл (або stderr), flush
+    та ротацію виконує фоновий потік, тож обробники на event loop не чекають на I/O.
+    На відміну від enqueue=True, повідомлення не серіалізуються через pickle.
+    """
+
+    def __init__(self, path: str | None = None, rotation_bytes: int | None = None, compression=None):
+        self._path = path
+        self._rotation_bytes = rotation_bytes
+        self._compression = compression
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def __call__(self, message: str):
+        self._queue.put(message)
+
+    def stop(self):
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout=5)
+
+    def _open(self):
+        if self._path is None:
+            return sys.stderr, 0
+        directory = os.path.dirname(self._path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        stream = open(self._path, "a", encoding="utf-8")
+        return stream, stream.tell()
+
+    def _rotate(self, stream):
+        stream.close()
+        root, ext = os.path.splitext(self._path)
+        rotated = f"{root}.{datetime.now().strftime('%Y-%m-%d_%H-%M-%S_%f')}{ext}"
+        os.replace(self._path, rotated)
+        if self._compression:
+            self._compression(rotated)
+        return self._open()
+
+    @staticmethod
+    def _report_error(error: Exception):
+        # Через вихідний stderr процесу: підмінений sys.stderr може бути саме тим, що зламалося
+        try:
+            sys.__stderr__.write(f"Помилка запису логу: {error}\n")
+        except (AttributeError, OSError, ValueError):
+            pass
+
+    def _run(self):
+        stream, size = self._open()
+        while True:
+            message = self._queue.get()
+            if message is None:
+                break
+            if self._path is None:
+                # Консоль береться щоразу: sys.stderr можуть підмінити (перенаправлення виводу, pytest)
+                stream = sys.stderr
+            try:
+                stream.write(message)
+                if self._queue.empty():
+                    stream.flush()
+                if self._rotation_bytes:
+                    size += len(message.encode("utf-8"))
+                    if size >= self._rotation_bytes:
+                        stream, size = self._rotate(stream)
+            except (OSError, ValueError) as e:
+                # ValueError — запис у вже закритий потік
+                self._report_error(e)
+        if self._path is None:
+            stream = sys.stderr
+        try:
+            stream.flush()
+            if self._path is not None:
+                stream.close()
+        except (OSError, ValueError) as e:
+            self._report_error(e)
+
+
+# Рядки нижче LOG_LEVEL відкидаються loguru ще до форматування, тому в коді використовуємо
+# logger.debug("... {}", data) замість f-рядків; рядки з великими payload — через sampled().
+logger.remove()
+logger.add(
+    QueuedSink(),
+    level=CONSOLE_LOG_LEVEL,
+    format="{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {name}:{function}:{line} - {message}",
+    filter=_sample_filter,
+)
+logger.add(
+    QueuedSink(LOG_FILE, rotation_bytes=LOG_ROTATION_BYTES, compression=_compress_in_background),
+    level=LOG_LEVEL,
+    format=_json_format if LOG_FORMAT == "json" else "{time} | {level} | {message}",
+    filter=_sample_filter,
+)
+# logging не знає рівнів loguru (TRACE, SUCCESS) — передаємо числовий рівень найнижчого sink-а
+logging.basicConfig(
+    handlers=[InterceptHandler()],
+    level=min(logger.level(LOG_LEVEL).no, logger.level(CONSOLE_LOG_LEVEL).no),
+    force=True,
+)
@@ -0,0 +1,28 @@
+from typing import Any, Awaitable, Callable
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject, Update
+from loguru import logger
+
+from telegram_bot.monitoring.tracing import current_trace_id
+
+
+class LogContextMiddleware(BaseMiddleware):
+    """
+    Додає update_id, user_id та trace_id до всіх записів логу, зроблених під час обробки апдейту.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        from_user = data.get("event_from_user")
+        update_id = event.update_id if isinstance(event, Update) else None
+        with logger.contextualize(
+            update_id=update_id,
+            user_id=from_user.id if from_user else None,
+            trace_id=current_trace_id(),
+        ):
+            return await handler(event, data)
@@ -0,0 +1,51 @@
+import time
+from typing import Any, Awaitable, Callable
+
+from aiogram import BaseMiddleware
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.methods import GetUpdates, TelegramMethod
+from aiogram.types import TelegramObject
+
+from telegram_bot.monitoring.metrics import HANDLER_LATENCY, TELEGRAM_SEND_LATENCY
+
+
+def handler_labels(data: dict[str, Any]) -> tuple[str, str]:
+    """
+    Мітки (router, handler) для обробника: модуль хендлера (booking_handler, ...) та ім'я функції.
+    """
+    callback = data["handler"].callback
+    return callback.__module__.rsplit(".", 1)[-1], callback.__name__
+
+
+class HandlerMetricsMiddleware(BaseMiddleware):
+    """
+    Внутрішній middleware: вимірює час виконання конкретного обробника.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        started = time.perf_counter()
+        try:
+            return await handler(event, data)
+        finally:
+            HANDLER_LATENCY.observe(time.perf_counter() - started, *handler_labels(data))
+
+
+class TelegramRequestMetricsMiddleware(BaseRequestMiddleware):
+    """
+    Middleware сесії бота: вимірює час вихідних запитів (sendMessage, editMessageText, ...).
+    """
+
+    async def __call__(self, make_request: NextRequestMiddlewareType, bot, method: TelegramMethod):
+        if isinstance(method, GetUpdates):
+            return await make_request(bot, method)
+
+        started = time.perf_counter()
+        try:
+            return await make_request(bot, method)
+        finally:
+            TELEGRAM_SEND_LATENCY.observe(time.perf_counter() - started, method.__api_method__)
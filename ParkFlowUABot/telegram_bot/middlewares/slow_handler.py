@@ -0,0 +1,64 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+from loguru import logger
+
+from telegram_bot.config import SLOW_HANDLER_SAMPLE_INTERVAL, SLOW_HANDLER_THRESHOLD
+from telegram_bot.middlewares.metrics import handler_labels
+from telegram_bot.monitoring.metrics import SLOW_HANDLERS
+from telegram_bot.monitoring.stack_sampler import TaskStackSampler
+from telegram_bot.monitoring.tracing import collect_spans
+
+
+class SlowHandlerMiddleware(BaseMiddleware):
+    """
+    Внутрішній middleware: якщо обробник працює довше за поріг, ще під час виконання починає
+    знімати стеки його задачі, а після завершення логує сервісні виклики з тривалістю та
+    найчастіші стеки.
+    """
+
+    def __init__(self, threshold: float = SLOW_HANDLER_THRESHOLD, sample_interval: float = SLOW_HANDLER_SAMPLE_INTERVAL):
+        self.threshold = threshold
+        self.sample_interval = sample_interval
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        sampler = TaskStackSampler(asyncio.current_task(), self.sample_interval)
+        watchdog = asyncio.get_running_loop().call_later(self.threshold, sampler.start)
+        started = time.perf_counter()
+        try:
+            with collect_spans() as spans:
+                return await handler(event, data)
+        finally:
+            elapsed = time.perf_counter() - started
+            watchdog.cancel()
+            sampler.stop()
+            if elapsed >= self.threshold:
+                self._report(data, elapsed, spans, sampler)
+
+    def _report(self, data: dict[str, Any], elapsed: float, spans: list, sampler: TaskStackSampler):
+        router, name = handler_labels(data)
+        SLOW_HANDLERS.inc(router, name)
+
+        service_calls = [
+            f"{span.name}={span.duration_us / 1000:.1f}ms"
+            for span in spans
+            if span.category in ("service", "telegram")
+        ]
+        stacks = [
+            f"{count}x " + " -> ".join(chain)
+            for chain, count in sampler.top()
+        ]
+        logger.bind(latency_ms=round(elapsed * 1000, 2)).warning(
+            "[SLOW_HANDLER] {}.{} виконувався {:.2f} с (поріг {} с). Виклики: {}. Стеки: {}",
+            router, name, elapsed, self.threshold,
+            ", ".join(service_calls) or "—",
+            " | ".join(stacks) or "—",
+        )
@@ -0,0 +1,61 @@
+import time
+from typing import Any, Awaitable, Callable
+
+from aiogram import BaseMiddleware
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.methods import GetUpdates, TelegramMethod
+from aiogram.types import TelegramObject, Update
+
+from telegram_bot.middlewares.metrics import handler_labels
+from telegram_bot.monitoring.tracing import current_span, record_span, start_span, start_trace
+
+
+class UpdateTracingMiddleware(BaseMiddleware):
+    """
+    Зовнішній middleware: кожен апдейт отримує власний trace ID та кореневий спан "update".
+    Має реєструватися першим, щоб інші middleware вже бачили trace ID.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        update_id = event.update_id if isinstance(event, Update) else None
+        with start_trace("update", update_id=update_id, event_type=getattr(event, "event_type", None)):
+            return await handler(event, data)
+
+
+class HandlerTracingMiddleware(BaseMiddleware):
+    """
+    Внутрішній middleware: спан "middleware" (від початку апдейту до обробника) і спан самого обробника.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        root = current_span()
+        if root is not None:
+            now_us = time.time_ns() // 1000
+            record_span("middleware", "middleware", root.start_us, now_us - root.start_us)
+
+        router, name = handler_labels(data)
+        with start_span(name, "handler", router=router):
+            return await handler(event, data)
+
+
+class TelegramRequestTracingMiddleware(BaseRequestMiddleware):
+    """
+    Middleware сесії бота: спан на кожне вихідне повідомлення (sendMessage, editMessageText, ...).
+    """
+
+    async def __call__(self, make_request: NextRequestMiddlewareType, bot, method: TelegramMethod):
+        if isinstance(method, GetUpdates):
+            return await make_request(bot, method)
+
+        with start_span(f"telegram.{method.__api_method__}", "telegram"):
+            return await make_request(bot, method)
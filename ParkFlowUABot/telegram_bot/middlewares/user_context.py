@@ -0,0 +1,137 @@
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+from loguru import logger
+
+from telegram_bot.monitoring.metrics import CACHE_REQUESTS
+from telegram_bot.services.identity_store import load_identities, schedule_save
+from telegram_bot.services.user_service import get_user_by_phone
+
+
+@dataclass
+class UserContext:
+    telegram_id: int
+    phone_number: str | None = None
+    user_id: int | None = None
+    first_name: str | None = None
+    last_name: str | None = None
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.first_name or ''} {self.last_name or ''}".strip()
+
+    def update_from_user(self, user: dict):
+        self.user_id = user.get("id", self.user_id)
+        self.first_name = user.get("first_name", self.first_name)
+        self.last_name = user.get("last_name", self.last_name)
+        self.phone_number = user.get("phone_number") or self.phone_number
+
+
+# Кеш контекстів: telegram_id → UserContext (дублюється на диск через identity_store)
+_user_contexts: dict[int, UserContext] = {}
+
+
+def load_user_contexts():
+    """
+    Відновлює кеш з локальної мапи при старті, щоб повторні користувачі не проходили /start заново.
+    """
+    for telegram_id, identity in load_identities().items():
+        _user_contexts[telegram_id] = UserContext(
+            telegram_id=telegram_id,
+            phone_number=identity.get("phone_number"),
+            user_id=identity.get("user_id"),
+            first_name=identity.get("first_name"),
+            last_name=identity.get("last_name"),
+        )
+
+
+def _identity_snapshot() -> dict[int, dict]:
+    # На диск — лише контексти, підтверджені бекендом (з user_id): номер із FSM чи щойно
+    # надісланого контакту ще може не належати жодному користувачу
+    return {
+        telegram_id: {k: v for k, v in asdict(ctx).items() if k != "telegram_id"}
+        for telegram_id, ctx in _user_contexts.items()
+        if ctx.phone_number and ctx.user_id is not None
+    }
+
+
+def _persist():
+    schedule_save(_identity_snapshot)
+
+
+def get_cached_context(telegram_id: int) -> UserContext | None:
+    return _user_contexts.get(telegram_id)
+
+
+def remember_user(telegram_id: int, phone_number: str, user: dict | None = None) -> UserContext:
+    """
+    Зберігає (або оновлює) контекст користувача після контакту, реєстрації чи запиту до API.
+    """
+    ctx = _user_contexts.get(telegram_id)
+    before = asdict(ctx) if ctx else None
+    if ctx is None or ctx.phone_number != phone_number:
+        ctx = UserContext(telegram_id=telegram_id, phone_number=phone_number)
+        _user_contexts[telegram_id] = ctx
+    if user:
+        ctx.update_from_user(user)
+    if asdict(ctx) != before:
+        logger.debug("[USER_CTX] Контекст збережено для telegram_id={}", telegram_id)
+        _persist()
+    return ctx
+
+
+def forget_user(telegram_id: int):
+    if _user_contexts.pop(telegram_id, None) is not None:
+        logger.debug("[USER_CTX] Контекст видалено для telegram_id={}", telegram_id)
+        _persist()
+
+
+async def ensure_user_id(ctx: UserContext) -> int | None:
+    """
+    Повертає ID користувача з бекенду, звертаючись до API лише якщо його ще немає в кеші.
+    """
+    if ctx.user_id is not None or not ctx.phone_number:
+        return ctx.user_id
+
+    try:
+        user = await get_user_by_phone(ctx.phone_number)
+    except Exception as e:
+        logger.error("[USER_CTX] Не вдалося отримати користувача: {}", e)
+        return None
+
+    if user:
+        ctx.update_from_user(user)
+        _persist()
+    return ctx.user_id
+
+
+class UserContextMiddleware(BaseMiddleware):
+    """
+    Визначає користувача один раз на апдейт і передає його в обробники як `user_ctx`.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        from_user = data.get("event_from_user")
+        if from_user is None:
+            return await handler(event, data)
+
+        ctx = _user_contexts.get(from_user.id)
+        CACHE_REQUESTS.inc("user_context", "hit" if ctx is not None else "miss")
+        if ctx is None:
+            phone = None
+            state = data.get("state")
+            if state is not None:
+                phone = (await state.get_data()).get("phone_number")
+            ctx = UserContext(telegram_id=from_user.id, phone_number=phone)
+            if phone:
+                _user_contexts[from_user.id] = ctx
+
+        data["user_ctx"] = ctx
+        return await handler(event, data)
@@ -0,0 +1,37 @@
+from typing import Any
+
+from aiogram.fsm.storage.base import BaseStorage, StateType, StorageKey
+
+from telegram_bot.monitoring.metrics import FSM_OPERATIONS
+
+
+class InstrumentedStorage(BaseStorage):
+    """
+    Обгортка над сховищем FSM, що рахує кожну операцію (get_data, update_data, set_state, ...).
+    """
+
+    def __init__(self, storage: BaseStorage):
+        self.storage = storage
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        FSM_OPERATIONS.inc("set_state")
+        await self.storage.set_state(key, state)
+
+    async def get_state(self, key: StorageKey) -> str | None:
+        FSM_OPERATIONS.inc("get_state")
+        return await self.storage.get_state(key)
+
+    async def set_data(self, key: StorageKey, data: dict[str, Any]) -> None:
+        FSM_OPERATIONS.inc("set_data")
+        await self.storage.set_data(key, data)
+
+    async def get_data(self, key: StorageKey) -> dict[str, Any]:
+        FSM_OPERATIONS.inc("get_data")
+        return await self.storage.get_data(key)
+
+    async def update_data(self, key: StorageKey, data: dict[str, Any]) -> dict[str, Any]:
+        FSM_OPERATIONS.inc("update_data")
+        return await self.storage.update_data(key, data)
+
+    async def close(self) -> None:
+        await self.storage.close()
@@ -0,0 +1,87 @@
+import asyncio
+import threading
+import time
+
+from loguru import logger
+
+from telegram_bot.monitoring.metrics import LOOP_BLOCKS, LOOP_LAG
+from telegram_bot.monitoring.stack_sampler import attribute_frames, thread_frames
+
+# Скільки внутрішніх кадрів блокувального стеку показувати в лозі
+ORIGIN_DEPTH = 6
+
+
+def _describe(frames: list) -> str:
+    return " -> ".join(
+        f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_name}:{frame.f_lineno}"
+        for frame in frames[-ORIGIN_DEPTH:]
+    )
+
+
+class LoopMonitor:
+    """
+    Постійний монітор event loop:
+    - heartbeat-корутина кожні interval секунд міряє, наскільки пізно її розбудили (LOOP_LAG);
+    - сторожовий потік помічає, що heartbeat не оновлювався довше за threshold, і знімає
+      стек потоку циклу — саме той код, що зараз блокує цикл;
+    - коли цикл відновлюється, блокування логується з походженням і потрапляє в LOOP_BLOCKS.
+    """
+
+    def __init__(self, interval: float, threshold: float):
+        self.interval = interval
+        self.threshold = threshold
+        self._beat = time.monotonic()
+        self._blocked: tuple[str, str] | None = None
+        self._stop = threading.Event()
+        self._task: asyncio.Task | None = None
+        self._watchdog: threading.Thread | None = None
+
+    def start(self):
+        self._beat = time.monotonic()
+        self._task = asyncio.create_task(self._heartbeat())
+        self._watchdog = threading.Thread(
+            target=self._watch, args=(threading.get_ident(),), name="loop-watchdog", daemon=True
+        )
+        self._watchdog.start()
+        logger.info("[LOOP] Монітор event loop запущено: інтервал {} с, поріг блокування {} с", self.interval, self.threshold)
+
+    async def stop(self):
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+        if self._watchdog is not None:
+            await asyncio.to_thread(self._watchdog.join)
+
+    async def _heartbeat(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(loop.time() - expected, 0.0)
+            LOOP_LAG.observe(lag)
+            self._beat = time.monotonic()
+            if self._blocked is not None:
+                self._report(lag)
+
+    def _report(self, lag: float):
+        origin, stack = self._blocked
+        self._blocked = None
+        LOOP_BLOCKS.observe(lag, origin)
+        logger.bind(latency_ms=round(lag * 1000, 2)).warning(
+            "[LOOP] Event loop заблоковано на {:.0f} мс ({}): {}", lag * 1000, origin, stack
+        )
+
+    def _watch(self, loop_thread_id: int):
+        # Перевіряємо вдвічі частіше за поріг, щоб зловити блокування ще під час виконання
+        period = self.threshold / 2
+        while not self._stop.wait(period):
+            beat = self._beat
+            if self._blocked is not None or time.monotonic() - beat < self.interval + self.threshold:
+                continue
+            frames = thread_frames(loop_thread_id)
+            # Цикл міг відновитися, поки ми знімали стек — тоді це вже не блокувальний код
+            if not frames or self._beat != beat:
+                continue
+            origin, _ = attribute_frames(frames)
+            self._blocked = (origin, _describe(frames))
+
@@ -0,0 +1,157 @@
+from bisect import bisect_left
+
+from aiohttp import web
+from loguru import logger
+
+# Межі кошиків у секундах: від швидких локальних операцій до повільних запитів до API
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(names: tuple[str, ...], values: tuple) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+        for name, value in zip(names, values)
+    )
+    return "{" + pairs + "}"
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def get(self, *labels) -> float:
+        return self._values.get(labels, 0)
+
+    def total(self) -> float:
+        return sum(self._values.values())
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for labels, value in self._values.items():
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {value}")
+        return lines
+
+
+class Histogram:
+    """
+    Гістограма з фіксованими кошиками. observe() — лише bisect та кілька операцій над списком,
+    тож її можна викликати на кожен апдейт і кожен запит.
+    """
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = (), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        # labels → [лічильники кошиків..., +Inf, сума]
+        self._series: dict[tuple, list] = {}
+
+    def observe(self, value: float, *labels):
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def count(self, *labels) -> int:
+        series = self._series.get(labels)
+        return sum(series[:-1]) if series else 0
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        bucket_names = self.labelnames + ("le",)
+        for labels, series in self._series.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{self.name}_bucket{_format_labels(bucket_names, labels + (le,))} {cumulative}")
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {series[-1]}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: dict[str, Counter | Histogram] = {}
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: tuple[str, ...] = (), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def _register(self, metric):
+        if metric.name in self._metrics:
+            return self._metrics[metric.name]
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+HANDLER_LATENCY = registry.histogram(
+    "parkflow_handler_latency_seconds", "Час виконання обробника апдейту", ("router", "handler")
+)
+API_LATENCY = registry.histogram(
+    "parkflow_api_request_latency_seconds", "Час запиту до ParkFlow API", ("function", "endpoint")
+)
+API_REQUESTS = registry.counter(
+    "parkflow_api_requests_total", "Кількість запитів до ParkFlow API за статусом", ("function", "endpoint", "status")
+)
+FSM_OPERATIONS = registry.counter(
+    "parkflow_fsm_storage_operations_total", "Кількість операцій зі сховищем FSM", ("operation",)
+)
+TELEGRAM_SEND_LATENCY = registry.histogram(
+    "parkflow_telegram_request_latency_seconds", "Час виконання запиту до Telegram Bot API", ("method",)
+)
+SLOW_HANDLERS = registry.counter(
+    "parkflow_slow_handlers_total", "Обробники, що перевищили поріг SLOW_HANDLER_THRESHOLD", ("router", "handler")
+)
+LOOP_LAG = registry.histogram(
+    "parkflow_event_loop_lag_seconds", "Затримка планування event loop відносно очікуваного часу"
+)
+LOOP_BLOCKS = registry.histogram(
+    "parkflow_event_loop_block_seconds", "Тривалість блокувань event loop понад LOOP_BLOCK_THRESHOLD", ("origin",)
+)
+FAULTS_INJECTED = registry.counter(
+    "parkflow_api_faults_injected_total", "Збої, штучно додані до запитів API (API_FAULTS)", ("kind", "endpoint")
+)
+CACHE_REQUESTS = registry.counter(
+    "parkflow_cache_requests_total", "Звернення до локальних кешів", ("cache", "result")
+)
+
+
+async def _metrics_view(request: web.Request) -> web.Response:
+    return web.Response(
+        body=registry.render().encode("utf-8"),
+        headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"},
+    )
+
+
+async def start_metrics_server(host: str, port: int) -> web.AppRunner:
+    """
+    Піднімає локальний HTTP-сервер з ендпоінтом /metrics у форматі Prometheus.
+    """
+    app = web.Application()
+    app.router.add_get("/metrics", _metrics_view)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    logger.info("[METRICS] /metrics доступний на http://{}:{}/metrics", host, port)
+    return runner
@@ -0,0 +1,131 @@
+import asyncio
+import json
+import os
+import threading
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from datetime import datetime
+
+from loguru import logger
+
+from telegram_bot.config import PROFILE_DIR, PROFILE_DURATION, PROFILE_SAMPLE_INTERVAL
+from telegram_bot.monitoring.stack_sampler import UNATTRIBUTED, attribute_frames, is_idle, iter_await_frames, thread_frames
+
+LOOP_LAG_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+
+class ProfilingSession:
+    """
+    Семплювальний профайлер на фіксований час:
+    - wall: стеки await-ів усіх задач обробників (де обробники чекають);
+    - cpu: стек потоку event loop з окремого потоку (де цикл реально працює);
+    - затримка циклу: наскільки пізніше за заплановане прокидається семплер.
+    Поза сесією нічого не встановлюється, тож вимкнений профайлер нічого не коштує.
+    """
+
+    def __init__(self, duration: float, interval: float):
+        self.duration = duration
+        self.interval = interval
+        self.wall: defaultdict[str, Counter] = defaultdict(Counter)
+        self.cpu: defaultdict[str, Counter] = defaultdict(Counter)
+        self.lag_buckets = [0] * (len(LOOP_LAG_BUCKETS_MS) + 1)
+        self.lag_sum_ms = 0.0
+        self.lag_max_ms = 0.0
+
+    async def run(self) -> str:
+        loop = asyncio.get_running_loop()
+        stop = threading.Event()
+        cpu_thread = threading.Thread(
+            target=self._sample_cpu, args=(threading.get_ident(), stop), name="profiler", daemon=True
+        )
+        logger.info("[PROFILER] Профілювання запущено на {} с", self.duration)
+        cpu_thread.start()
+        deadline = loop.time() + self.duration
+        try:
+            while loop.time() < deadline:
+                expected = loop.time() + self.interval
+                await asyncio.sleep(self.interval)
+                self._observe_lag((loop.time() - expected) * 1000)
+                self._sample_tasks()
+        finally:
+            stop.set()
+            await asyncio.to_thread(cpu_thread.join)
+        path = await asyncio.to_thread(self._dump)
+        logger.info("[PROFILER] Профіль збережено: {}", path)
+        return path
+
+    def _observe_lag(self, lag_ms: float):
+        lag_ms = max(lag_ms, 0.0)
+        self.lag_buckets[bisect_left(LOOP_LAG_BUCKETS_MS, lag_ms)] += 1
+        self.lag_sum_ms += lag_ms
+        self.lag_max_ms = max(self.lag_max_ms, lag_ms)
+
+    def _sample_tasks(self):
+        current = asyncio.current_task()
+        for task in asyncio.all_tasks():
+            if task is current:
+                continue
+            handler, stack = attribute_frames(list(iter_await_frames(task)))
+            if handler != UNATTRIBUTED:
+                self.wall[handler][stack] += 1
+
+    def _sample_cpu(self, thread_id: int, stop: threading.Event):
+        while not stop.wait(self.interval):
+            frames = thread_frames(thread_id)
+            if not frames or is_idle(frames[-1]):
+                continue
+            handler, stack = attribute_frames(frames)
+            self.cpu[handler][stack] += 1
+
+    def _dump(self) -> str:
+        path = os.path.join(PROFILE_DIR, datetime.now().strftime("%Y%m%d-%H%M%S"))
+        os.makedirs(path, exist_ok=True)
+
+        # Формат collapsed stacks (flamegraph.pl, speedscope): "wall;кадр;кадр кількість"
+        handlers = sorted(set(self.wall) | set(self.cpu))
+        for handler in handlers:
+            with open(os.path.join(path, f"{handler.strip('<>')}.collapsed"), "w", encoding="utf-8") as file:
+                for kind, samples in (("wall", self.wall[handler]), ("cpu", self.cpu[handler])):
+                    for stack, count in samples.most_common():
+                        file.write(f"{kind};{';'.join(stack)} {count}\n")
+
+        samples = sum(self.lag_buckets)
+        summary = {
+            "duration_s": self.duration,
+            "interval_ms": self.interval * 1000,
+            "handlers": {
+                handler: {
+                    "wall_samples": sum(self.wall[handler].values()),
+                    "cpu_samples": sum(self.cpu[handler].values()),
+                }
+                for handler in handlers
+            },
+            "loop_lag": {
+                "samples": samples,
+                "mean_ms": round(self.lag_sum_ms / samples, 3) if samples else 0.0,
+                "max_ms": round(self.lag_max_ms, 3),
+                "buckets_ms": {
+                    **{f"le_{bound}": count for bound, count in zip(LOOP_LAG_BUCKETS_MS, self.lag_buckets)},
+                    "inf": self.lag_buckets[-1],
+                },
+            },
+        }
+        with open(os.path.join(path, "summary.json"), "w", encoding="utf-8") as file:
+            json.dump(summary, file, ensure_ascii=False, indent=2)
+        return path
+
+
+_session: asyncio.Task | None = None
+
+
+def start_profiling(duration: float = PROFILE_DURATION) -> asyncio.Task | None:
+    """
+    Запускає сесію профілювання у фоні. Повертає задачу (результат — каталог профілю)
+    або None, якщо сесія вже триває.
+    """
+    global _session
+    if _session is not None and not _session.done():
+        logger.warning("[PROFILER] Профілювання вже триває")
+        return None
+    _session = asyncio.create_task(ProfilingSession(duration, PROFILE_SAMPLE_INTERVAL).run())
+    return _session
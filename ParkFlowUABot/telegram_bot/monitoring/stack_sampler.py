@@ -0,0 +1,96 @@
+import asyncio
+import os
+import sys
+from collections import Counter
+
+HANDLERS_PACKAGE = "telegram_bot.handlers."
+# Стеки без кадру обробника (aiogram, aiohttp, сам цикл) обрізаються до цієї глибини
+MAX_UNATTRIBUTED_DEPTH = 20
+UNATTRIBUTED = "<event_loop>"
+
+
+def iter_await_frames(task: asyncio.Task):
+    """
+    Кадри ланцюжка await-ів задачі від зовнішньої корутини до тієї, що зараз чекає.
+    Task.get_stack() для призупиненої корутини повертає лише верхній кадр, тож проходимо cr_await вручну.
+    """
+    coro = task.get_coro()
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None) or getattr(coro, "ag_frame", None)
+        if frame is None:
+            return
+        yield frame
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None) or getattr(coro, "ag_await", None)
+
+
+def await_chain(task: asyncio.Task) -> tuple[str, ...]:
+    return tuple(
+        f"{frame.f_code.co_name} ({os.path.basename(frame.f_code.co_filename)}:{frame.f_lineno})"
+        for frame in iter_await_frames(task)
+    )
+
+
+def thread_frames(thread_id: int) -> list:
+    """
+    Поточний стек іншого потоку, від зовнішнього кадру до внутрішнього.
+    """
+    frame = sys._current_frames().get(thread_id)
+    frames = []
+    while frame is not None:
+        frames.append(frame)
+        frame = frame.f_back
+    frames.reverse()
+    return frames
+
+
+def is_idle(frame) -> bool:
+    # Цикл чекає на події в select/epoll — це не робота, а простій
+    return frame.f_globals.get("__name__") == "selectors" and frame.f_code.co_name == "select"
+
+
+def attribute_frames(frames: list) -> tuple[str, tuple[str, ...]]:
+    """
+    Повертає (обробник, стек від кадру обробника) для кадрів від зовнішнього до внутрішнього.
+    Якщо обробника в стеку немає — UNATTRIBUTED та останні MAX_UNATTRIBUTED_DEPTH кадрів.
+    """
+    for index, frame in enumerate(frames):
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith(HANDLERS_PACKAGE):
+            handler = f"{module[len(HANDLERS_PACKAGE):]}.{frame.f_code.co_name}"
+            break
+    else:
+        handler, index = UNATTRIBUTED, max(0, len(frames) - MAX_UNATTRIBUTED_DEPTH)
+    stack = tuple(
+        f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_name}" for frame in frames[index:]
+    )
+    return handler, stack
+
+
+class TaskStackSampler:
+    """
+    Періодично знімає стек await-ів задачі через loop.call_later, поки її не зупинять.
+    Працює лише поки event loop не заблоковано — блокування ловить монітор затримок циклу.
+    """
+
+    def __init__(self, task: asyncio.Task, interval: float):
+        self.task = task
+        self.interval = interval
+        self.samples: Counter[tuple[str, ...]] = Counter()
+        self._handle: asyncio.TimerHandle | None = None
+
+    def start(self):
+        self._sample()
+
+    def stop(self):
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    def _sample(self):
+        if self.task.done():
+            return
+        self.samples[await_chain(self.task)] += 1
+        self._handle = asyncio.get_running_loop().call_later(self.interval, self._sample)
+
+    def top(self, limit: int = 3) -> list[tuple[tuple[str, ...], int]]:
+        return self.samples.most_common(limit)
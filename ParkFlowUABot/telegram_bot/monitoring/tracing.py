@@ -0,0 +1,187 @@
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from loguru import logger
+
+from telegram_bot.config import TRACE_EXPORT_PATH
+from telegram_bot.logger import QueuedSink
+
+
+class Span:
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "category", "start_us", "duration_us", "attributes", "_started")
+
+    def __init__(self, trace_id: str, parent_id: str | None, name: str, category: str, attributes: dict):
+        self.trace_id = trace_id
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.name = name
+        self.category = category
+        self.attributes = attributes
+        self.start_us = time.time_ns() // 1000
+        self.duration_us = None
+        self._started = time.perf_counter_ns()
+
+    def finish(self):
+        self.duration_us = (time.perf_counter_ns() - self._started) // 1000
+        collector = _span_collector.get()
+        if collector is not None:
+            collector.append(self)
+        _export(self)
+
+
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+_trace_id: ContextVar[str | None] = ContextVar("trace_id", default=None)
+# Якщо встановлено — сюди додаються всі завершені спани (використовує детектор повільних обробників)
+_span_collector: ContextVar[list | None] = ContextVar("span_collector", default=None)
+
+
+def new_trace_id() -> str:
+    return f"{random.getrandbits(128):032x}"
+
+
+def current_trace_id() -> str | None:
+    return _trace_id.get()
+
+
+def current_span() -> Span | None:
+    return _current_span.get()
+
+
+@contextmanager
+def start_trace(name: str, category: str = "update", **attributes):
+    """
+    Починає новий трейс (на кожен апдейт) з кореневим спаном.
+    """
+    trace_token = _trace_id.set(new_trace_id())
+    try:
+        with start_span(name, category, **attributes) as span:
+            yield span
+    finally:
+        _trace_id.reset(trace_token)
+
+
+@contextmanager
+def start_span(name: str, category: str, **attributes):
+    trace_id = _trace_id.get()
+    if trace_id is None:
+        # Виклик поза апдейтом (наприклад, фонові задачі) — окремий трейс
+        trace_id = new_trace_id()
+    parent = _current_span.get()
+    span = Span(trace_id, parent.span_id if parent else None, name, category, attributes)
+    token = _current_span.set(span)
+    try:
+        yield span
+    finally:
+        _current_span.reset(token)
+        span.finish()
+
+
+def child_span(name: str, category: str, **attributes) -> Span:
+    """
+    Створює дочірній спан, не роблячи його поточним; завершується явним span.finish().
+    Потрібен там, де початок і кінець операції — в різних колбеках (хуки aiohttp).
+    """
+    parent = _current_span.get()
+    trace_id = parent.trace_id if parent else (_trace_id.get() or new_trace_id())
+    return Span(trace_id, parent.span_id if parent else None, name, category, attributes)
+
+
+def record_span(name: str, category: str, start_us: int, duration_us: int, **attributes):
+    """
+    Записує вже завершений відрізок часу як дочірній спан поточного (наприклад, час у middleware).
+    """
+    parent = _current_span.get()
+    if parent is None:
+        return
+    span = Span(parent.trace_id, parent.span_id, name, category, attributes)
+    span.start_us = start_us
+    span.duration_us = duration_us
+    _export(span)
+
+
+@contextmanager
+def collect_spans():
+    """
+    Збирає спани, завершені всередині блоку (включно з дочірніми задачами, створеними в ньому,
+    крім фонових — див. create_detached_task).
+    """
+    spans = []
+    token = _span_collector.set(spans)
+    try:
+        yield spans
+    finally:
+        _span_collector.reset(token)
+
+
+def create_detached_task(coro) -> asyncio.Task:
+    """
+    Фонова задача, що може пережити апдейт (підвантаження наступної сторінки, рендер у кеш).
+    Трейс і батьківський спан вона успадковує, а збирач спанів — ні, тож не дописує спани
+    в уже завершений трейс повільного обробника.
+    """
+    # Задача копіює контекст у момент створення — збирач скидається лише на цей момент.
+    # Без обгортки-корутини: задача, скасована до старту, не лишає неочікуваної корутини.
+    token = _span_collector.set(None)
+    try:
+        return asyncio.create_task(coro)
+    finally:
+        _span_collector.reset(token)
+
+
+def trace_headers() -> dict[str, str]:
+    """
+    Заголовки для пропагації трейсу в бекенд: W3C traceparent та простіший X-Trace-Id.
+    """
+    trace_id = _trace_id.get()
+    if trace_id is None:
+        return {}
+    span = _current_span.get()
+    parent_id = span.span_id if span else f"{random.getrandbits(64):016x}"
+    return {"traceparent": f"00-{trace_id}-{parent_id}-01", "X-Trace-Id": trace_id}
+
+
+# Експорт у Chrome Trace Event Format (JSON Array) — відкривається в Perfetto або chrome://tracing.
+# Кожен трейс (апдейт) має власний "tid", тож спани одного апдейту лягають на одну доріжку.
+_exporter: QueuedSink | None = None
+_exporter_lock = threading.Lock()
+
+
+def _get_exporter() -> QueuedSink | None:
+    global _exporter
+    if not TRACE_EXPORT_PATH:
+        return None
+    if _exporter is None:
+        with _exporter_lock:
+            if _exporter is None:
+                if not os.path.exists(TRACE_EXPORT_PATH) or os.path.getsize(TRACE_EXPORT_PATH) == 0:
+                    directory = os.path.dirname(TRACE_EXPORT_PATH)
+                    if directory:
+                        os.makedirs(directory, exist_ok=True)
+                    with open(TRACE_EXPORT_PATH, "w", encoding="utf-8") as f:
+                        f.write("[\n")
+                _exporter = QueuedSink(TRACE_EXPORT_PATH)
+                logger.info("[TRACING] Спани експортуються у {}", TRACE_EXPORT_PATH)
+    return _exporter
+
+
+def _export(span: Span):
+    exporter = _get_exporter()
+    if exporter is None:
+        return
+    event = {
+        "name": span.name,
+        "cat": span.category,
+        "ph": "X",
+        "ts": span.start_us,
+        "dur": span.duration_us,
+        "pid": os.getpid(),
+        "tid": int(span.trace_id[:8], 16),
+        "args": {"trace_id": span.trace_id, "span_id": span.span_id, "parent_id": span.parent_id, **span.attributes},
+    }
+    exporter(json.dumps(event, ensure_ascii=False, separators=(",", ":"), default=str) + ",\n")
@@ -1,10 +1,201 @@
-from telegram_bot.config import API_BASE_URL
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from types import SimpleNamespace
+
 import aiohttp
+from loguru import logger
+from yarl import URL
+
+from telegram_bot.bounded_cache import BoundedCache
+from telegram_bot.config import API_BASE_URL, API_FAULTS, API_RECORD_PATH, API_REPLAY_PATH, API_REPLAY_SPEED, API_TIMEOUT
+from telegram_bot.monitoring.metrics import API_LATENCY, API_REQUESTS, CACHE_REQUESTS
+from telegram_bot.monitoring.tracing import child_span, start_span, trace_headers
+
+# Ім'я сервісної функції, що відкрила поточну сесію (мітка "function" у метриках)
+_api_function: ContextVar[str] = ContextVar("api_function", default="unknown")
+
+
+def endpoint_label(url) -> str:
+    """
+    Нормалізує шлях запиту до шаблону ендпоінта (/cars/phone/{id}), щоб не плодити унікальні мітки.
+    """
+    path = url.path if hasattr(url, "path") else str(url)
+    return "/".join("{id}" if any(ch.isdigit() for ch in part) else part for part in path.split("/"))
+
+
+async def _on_request_start(session, ctx: SimpleNamespace, params: aiohttp.TraceRequestStartParams):
+    ctx.started = time.perf_counter()
+    ctx.span = child_span(f"{params.method} {endpoint_label(params.url)}", "http")
+
+
+def observe_api_call(method: str, endpoint: str, elapsed: float, status):
+    """
+    Метрики та структурований лог одного запиту до API (спільне для реальних і відтворених запитів).
+    """
+    API_LATENCY.observe(elapsed, _api_function.get(), endpoint)
+    API_REQUESTS.inc(_api_function.get(), endpoint, status)
+    logger.bind(endpoint=endpoint, latency_ms=round(elapsed * 1000, 2), status=status).info(
+        "[API] {} {} -> {}", method, endpoint, status
+    )
+
+
+async def _on_request_end(session, ctx: SimpleNamespace, params: aiohttp.TraceRequestEndParams):
+    ctx.span.attributes["status"] = params.response.status
+    ctx.span.finish()
+    observe_api_call(params.method, endpoint_label(params.url), time.perf_counter() - ctx.started, params.response.status)
+
+
+async def _on_request_exception(session, ctx: SimpleNamespace, params: aiohttp.TraceRequestExceptionParams):
+    elapsed = time.perf_counter() - ctx.started
+    latency_ms = round(elapsed * 1000, 2)
+    endpoint = endpoint_label(params.url)
+    function = _api_function.get()
+    API_LATENCY.observe(elapsed, function, endpoint)
+    API_REQUESTS.inc(function, endpoint, "error")
+    ctx.span.attributes["error"] = type(params.exception).__name__
+    ctx.span.finish()
+    logger.bind(endpoint=endpoint, latency_ms=latency_ms, status="error").warning(
+        "[API] {} {} -> {}", params.method, endpoint, type(params.exception).__name__
+    )
+
+
+def _build_trace_config() -> aiohttp.TraceConfig:
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(_on_request_start)
+    trace_config.on_request_end.append(_on_request_end)
+    trace_config.on_request_exception.append(_on_request_exception)
+    return trace_config
+
+
+_trace_config = _build_trace_config()
+
+_timeout = aiohttp.ClientTimeout(total=API_TIMEOUT)
+
+# Запис і відтворення трафіку (services/cassette.py) та інʼєкція збоїв (services/faults.py)
+# створюються лише якщо увімкнені в конфігурації
+_recorder = None
+_replay_session = None
+_fault_rules = None
+
+
+def _client_middlewares() -> tuple:
+    global _recorder
+    if not API_RECORD_PATH:
+        return ()
+    if _recorder is None:
+        from telegram_bot.services.cassette import CassetteRecorder
+        _recorder = CassetteRecorder(API_RECORD_PATH)
+    return (_recorder,)
+
+
+def get_replay_session():
+    global _replay_session
+    if _replay_session is None:
+        from telegram_bot.services.cassette import Cassette, ReplaySession
+        _replay_session = ReplaySession(Cassette(API_REPLAY_PATH, API_REPLAY_SPEED))
+    return _replay_session
+
+
+def _with_faults(session):
+    global _fault_rules
+    if not API_FAULTS:
+        return session
+    from telegram_bot.services.faults import FaultInjectingSession, parse_faults
+    if _fault_rules is None:
+        _fault_rules = parse_faults(API_FAULTS)
+        logger.warning("[FAULTS] Інʼєкція збоїв API увімкнена: {}", _fault_rules)
+    return FaultInjectingSession(session, _fault_rules, API_TIMEOUT)
+
+
+@asynccontextmanager
+async def api_session(function: str):
+    """
+    Сесія для запитів до ParkFlow API: кожен запит логується одним структурованим записом
+    (endpoint, latency_ms, status) і потрапляє в метрики з міткою function — назвою сервісної функції.
+    Уся робота з сесією обгорнута в спан цієї функції, а trace ID передається бекенду в заголовках.
+    """
+    token = _api_function.set(function)
+    try:
+        with start_span(function, "service"):
+            if API_REPLAY_PATH:
+                yield _with_faults(get_replay_session())
+                return
+            async with aiohttp.ClientSession(
+                headers=trace_headers(), timeout=_timeout, trace_configs=[_trace_config], middlewares=_client_middlewares()
+            ) as session:
+                yield _with_faults(session)
+    finally:
+        _api_function.reset(token)
+
+
+# Скільки відповідей з валідаторами (ETag / Last-Modified) пам'ятає conditional_get_json
+CONDITIONAL_CACHE_LIMIT = 1000
+
+# URL → (ETag, Last-Modified, розібране тіло останньої відповіді 200)
+_conditional_cache: BoundedCache[str, tuple[str | None, str | None, object]] = BoundedCache(CONDITIONAL_CACHE_LIMIT)
+
+
+async def conditional_get_json(session, url: str, **json_kwargs) -> tuple[int, object]:
+    """
+    GET списку з умовним запитом: якщо для URL уже є відповідь з ETag чи Last-Modified, вони
+    надсилаються в If-None-Match / If-Modified-Since, і на 304 повертається збережене тіло —
+    без передачі й розбору JSON.
+
+    Повертає (статус, дані): 200 — щойно отримані дані, 304 — збережені, інший статус — текст
+    помилки. Збережені дані спільні для всіх викликів, тож їх не змінюють на місці.
+    """
+    cached = _conditional_cache.get(url)
+    headers = {}
+    if cached is not None:
+        etag, last_modified, _ = cached
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+    async with session.get(url, headers=headers) as resp:
+        if resp.status == 304 and cached is not None:
+            CACHE_REQUESTS.inc("conditional_get", "hit")
+            return 304, cached[2]
+        if resp.status == 304:
+            # 304 без збереженого тіла (проксі, відтворена касета) — тіла немає, тож питаємо ще раз
+            logger.warning("[API] 304 без збереженої відповіді для {}, повторний запит", endpoint_label(URL(url)))
+            return await _unconditional_get_json(session, url, **json_kwargs)
+        if resp.status != 200:
+            return resp.status, await resp.text()
+        data = await resp.json(**json_kwargs)
+        etag, last_modified = resp.headers.get("ETag"), resp.headers.get("Last-Modified")
+
+    _remember_validators(url, etag, last_modified, data)
+    return 200, data
+
+
+async def _unconditional_get_json(session, url: str, **json_kwargs) -> tuple[int, object]:
+    async with session.get(url, headers={"Cache-Control": "no-cache"}) as resp:
+        if resp.status == 304:
+            # Порожнє тіло не можна віддати як список — для сервісів це помилка бекенда
+            return 502, "304 Not Modified без збереженої відповіді"
+        if resp.status != 200:
+            return resp.status, await resp.text()
+        data = await resp.json(**json_kwargs)
+        etag, last_modified = resp.headers.get("ETag"), resp.headers.get("Last-Modified")
+
+    _remember_validators(url, etag, last_modified, data)
+    return 200, data
+
+
+def _remember_validators(url: str, etag: str | None, last_modified: str | None, data):
+    CACHE_REQUESTS.inc("conditional_get", "miss")
+    _conditional_cache.pop(url, None)
+    if etag or last_modified:
+        _conditional_cache[url] = (etag, last_modified, data)
+
 
 # Перевірка доступності API
 async def is_api_available():
     try:
-        async with aiohttp.ClientSession() as session:
+        async with api_session("is_api_available") as session:
             async with session.get(f"{API_BASE_URL}/health") as resp:
                 return resp.status == 200
     except:
@@ -0,0 +1,107 @@
+import csv
+import io
+from typing import AsyncIterator
+
+from aiogram.types import InputFile
+from loguru import logger
+
+from telegram_bot.services.booking_service import get_spots_by_ids, iter_user_bookings
+from telegram_bot.timeutils import format_timestamp
+
+# Скільки бронювань запитується з API за раз під час експорту
+EXPORT_PAGE_SIZE = 200
+
+# Ті самі поля, що показує format_booking, плюс дата створення для обліку
+CSV_COLUMNS = (
+    "ID", "Створено", "Місце", "Авто", "Номерний знак", "Картка",
+    "Тривалість, год", "З", "По", "Сума, грн", "Статус",
+)
+
+# З цих символів Excel починає формулу — такі значення (марка, номер авто від користувача)
+# записуються з апострофом, щоб показувались як текст
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _cell(value):
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return f"'{value}"
+    return value
+
+
+def _timestamp(value) -> str:
+    # Нерозпізнаний час (або не рядок, як-от число з API) пишемо як є, не обриваючи експорт
+    try:
+        return format_timestamp(value) if value else ""
+    except (ValueError, TypeError):
+        return str(value)
+
+
+def booking_csv_row(b: dict, spot: dict) -> list:
+    car = b.get("car") or {}
+    card = b.get("card") or {}
+    card_number = card.get("number") or ""
+    row = [
+        b.get("id"),
+        _timestamp(b.get("created_at")),
+        spot.get("number", ""),
+        car.get("brand", ""),
+        car.get("license_plate", ""),
+        f"****{card_number[-4:]}" if card_number else "",
+        b.get("duration_hours"),
+        _timestamp(spot.get("occupied_from")),
+        _timestamp(spot.get("occupied_until")),
+        b.get("total_price"),
+        b.get("status", ""),
+    ]
+    return [_cell(value) for value in row]
+
+
+async def iter_booking_rows(phone_number: str) -> AsyncIterator[list]:
+    # Місця запитуються пакетом на сторінку; кеш місць росте з кількістю різних місць, а не рядків
+    spots: dict[int, dict] = {}
+    async for page in iter_user_bookings(phone_number, EXPORT_PAGE_SIZE):
+        spots.update(await get_spots_by_ids(b.get("spot_id") for b in page if b.get("spot_id") not in spots))
+        for b in page:
+            yield booking_csv_row(b, spots.get(b.get("spot_id")) or {})
+
+
+async def iter_csv_chunks(rows: AsyncIterator[list], chunk_size: int) -> AsyncIterator[bytes]:
+    """
+    Рядки → шматки CSV у UTF-8 розміром близько chunk_size. BOM на початку — щоб Excel
+    правильно показав кирилицю.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write("\ufeff")
+    writer.writerow(CSV_COLUMNS)
+    async for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= chunk_size:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+class BookingsCsvFile(InputFile):
+    """
+    CSV з усією історією бронювань, що формується під час відправлення: aiogram передає read()
+    у multipart-запит як потік, тож у пам'яті одночасно лише сторінка бронювань і один шматок файлу.
+    """
+
+    def __init__(self, phone_number: str, filename: str):
+        super().__init__(filename=filename)
+        self.phone_number = phone_number
+        self.rows = 0
+
+    async def _counted(self, rows: AsyncIterator[list]) -> AsyncIterator[list]:
+        async for row in rows:
+            self.rows += 1
+            yield row
+
+    async def read(self, bot) -> AsyncIterator[bytes]:
+        self.rows = 0
+        async for chunk in iter_csv_chunks(self._counted(iter_booking_rows(self.phone_number)), self.chunk_size):
+            yield chunk
+        logger.info("[EXPORT] CSV бронювань сформовано: {} рядків", self.rows)
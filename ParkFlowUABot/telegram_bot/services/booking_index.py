@@ -0,0 +1,114 @@
+import time
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+
+from loguru import logger
+
+from telegram_bot.bounded_cache import BoundedCache
+from telegram_bot.monitoring.metrics import CACHE_REQUESTS
+from telegram_bot.services.booking_service import get_user_bookings
+from telegram_bot.timeutils import parse_timestamp, to_kyiv
+
+# Скільки секунд індекс вважається актуальним (статуси бронювань змінюються на бекенді)
+BOOKING_INDEX_TTL = 300
+# Скільки користувачів тримають індекс одночасно (найдавніші витісняються)
+BOOKING_INDEX_LIMIT = 1000
+
+
+def _created_key(booking: dict) -> datetime:
+    # Київський час без зони: так порівнюються і час із зоною, і час без неї, що приходить з API
+    return to_kyiv(parse_timestamp(booking["created_at"])).replace(tzinfo=None)
+
+
+class BookingIndex:
+    """
+    Бронювання одного користувача, відсортовані за created_at, плюс окремий відсортований
+    кошик для кожного статусу. Фільтри за проміжком часу й статусом — двійковий пошук
+    у відповідному кошику, нове бронювання вставляється без перебудови.
+    """
+
+    def __init__(self, bookings: list[dict] = ()):
+        self.built_at = time.monotonic()
+        self._ids: set = set()
+        self._all: tuple[list, list] = ([], [])
+        self._by_status: dict[str, tuple[list, list]] = {}
+        entries = []
+        for booking in bookings:
+            try:
+                entries.append((_created_key(booking), booking.get("id") or 0, booking))
+            except (KeyError, TypeError, ValueError):
+                logger.warning("[BOOKING_INDEX] Бронювання без коректного created_at: {}", booking.get("id"))
+        entries.sort(key=lambda entry: entry[:2])
+        for key, booking_id, booking in entries:
+            self._append(key, booking_id, booking)
+
+    def __len__(self) -> int:
+        return len(self._all[0])
+
+    def _bucket(self, status: str | None) -> tuple[list, list]:
+        return self._all if status is None else self._by_status.get(status, ([], []))
+
+    def _append(self, key, booking_id, booking: dict):
+        self._ids.add(booking_id)
+        for keys, items in (self._all, self._by_status.setdefault(booking.get("status"), ([], []))):
+            keys.append((key, booking_id))
+            items.append(booking)
+
+    def add(self, booking: dict):
+        """Додає нове бронювання на своє місце за created_at; вже відоме бронювання ігнорується."""
+        booking_id = booking.get("id") or 0
+        if booking_id in self._ids:
+            return
+        entry = (_created_key(booking), booking_id)
+        self._ids.add(booking_id)
+        for keys, items in (self._all, self._by_status.setdefault(booking.get("status"), ([], []))):
+            position = bisect_right(keys, entry)
+            keys.insert(position, entry)
+            items.insert(position, booking)
+
+    def entries(self):
+        """Пари (час створення, бронювання) від найстаріших — з ключами, розібраними під час побудови."""
+        keys, items = self._all
+        return ((created, booking) for (created, _), booking in zip(keys, items))
+
+    def select(self, start: datetime | None = None, end: datetime | None = None, status: str | None = None) -> list[dict]:
+        """
+        Бронювання зі створенням у [start, end) (київський час без зони) та, за потреби, з певним
+        статусом — новіші першими.
+        """
+        keys, items = self._bucket(status)
+        low = bisect_left(keys, (start,)) if start is not None else 0
+        high = bisect_left(keys, (end,)) if end is not None else len(keys)
+        return items[low:high][::-1]
+
+
+# Телефон → індекс
+_indexes: BoundedCache[str, BookingIndex] = BoundedCache(BOOKING_INDEX_LIMIT)
+
+
+async def get_booking_index(phone_number: str) -> BookingIndex:
+    index = _indexes.get(phone_number)
+    fresh = index is not None and time.monotonic() - index.built_at < BOOKING_INDEX_TTL
+    CACHE_REQUESTS.inc("booking_index", "hit" if fresh else "miss")
+    if fresh:
+        return index
+
+    index = BookingIndex(await get_user_bookings(phone_number))
+    logger.debug("[BOOKING_INDEX] Індекс побудовано: {} бронювань", len(index))
+    _indexes.pop(phone_number, None)
+    # Порожній список може бути й помилкою API — такий індекс не кешуємо
+    if len(index):
+        _indexes[phone_number] = index
+    return index
+
+
+def remember_booking(phone_number: str, booking: dict):
+    """Додає щойно створене бронювання в індекс користувача, якщо той уже побудований."""
+    index = _indexes.get(phone_number)
+    if index is None:
+        return
+    try:
+        index.add(booking)
+    except (KeyError, TypeError, ValueError):
+        # Без created_at бронювання не впорядкувати — при наступному запиті індекс перебудується
+        _indexes.pop(phone_number, None)
@@ -1,26 +1,48 @@
-from datetime import datetime
+import asyncio
 
-import aiohttp
-import pytz
 from loguru import logger
-from telegram_bot.services.api_service import API_BASE_URL
+from telegram_bot.logger import sampled
+from telegram_bot.services.api_service import API_BASE_URL, api_session, conditional_get_json
+from telegram_bot.timeutils import localize, parse_timestamp
+
+# Скільки запитів /parking/spot/{id} іде паралельно, коли бекенд не має пакетного ендпоінта
+SPOT_LOOKUP_CONCURRENCY = 8
+# None — ще не перевіряли; False — бекенд не знає GET /parking/spots?ids=
+_spot_batch_supported: bool | None = None
 
 
 async def get_all_cities():
-    async with aiohttp.ClientSession() as session:
-        async with session.get(f"{API_BASE_URL}/parking/cities") as response:
-            return await response.json()
+    async with api_session("get_all_cities") as session:
+        status, data = await conditional_get_json(session, f"{API_BASE_URL}/parking/cities")
+    if status not in (200, 304):
+        raise RuntimeError(f"GET /parking/cities -> {status}")
+    return data
 
 
 async def get_parkings_by_city(city_id: int):
-    async with aiohttp.ClientSession() as session:
-        async with session.get(f"{API_BASE_URL}/parking/parkings") as response:
-            data = await response.json()
-            return [p for p in data if p["city_id"] == city_id]
+    async with api_session("get_parkings_by_city") as session:
+        status, data = await conditional_get_json(session, f"{API_BASE_URL}/parking/parkings")
+    if status not in (200, 304):
+        raise RuntimeError(f"GET /parking/parkings -> {status}")
+    return [p for p in data if p["city_id"] == city_id]
+
+
+async def get_all_parkings():
+    url = f"{API_BASE_URL}/parking/parkings"
+    try:
+        async with api_session("get_all_parkings") as session:
+            status, data = await conditional_get_json(session, url)
+        if status in (200, 304):
+            return data
+        logger.error("[PARKING_SERVICE] {} – {}", status, data)
+        return []
+    except Exception as e:
+        logger.exception("[PARKING_SERVICE] Помилка при отриманні паркінгів: {}", e)
+        return []
 
 
 async def get_available_spots(parking_id: int):
-    async with aiohttp.ClientSession() as session:
+    async with api_session("get_available_spots") as session:
         async with session.get(
             f"{API_BASE_URL}/parking/spots/available",
             params={"parking_id": parking_id}
@@ -30,21 +52,18 @@ async def get_available_spots(parking_id: int):
 async def get_user_cars(phone_number: str):
     url = f"{API_BASE_URL}/cars/phone/{phone_number}"
 
-    logger.debug(f"[CARS] Запит авто користувача: {url}")
+    logger.debug("[CARS] Запит авто користувача: {}", url)
 
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    logger.debug(f"[CARS] Отримано авто: {data}")
-                    return data
-                else:
-                    text = await response.text()
-                    logger.error(f"[CARS] Помилка {response.status}: {text}")
-                    return []
+        async with api_session("get_user_cars") as session:
+            status, data = await conditional_get_json(session, url)
+        if status in (200, 304):
+            sampled("CARS").debug("[CARS] Отримано авто: {}", data)
+            return data
+        logger.error("[CARS] Помилка {}: {}", status, data)
+        return []
     except Exception as e:
-        logger.exception(f"[CARS] Виняток при отриманні авто: {e}")
+        logger.exception("[CARS] Виняток при отриманні авто: {}", e)
         return []
 
 
@@ -58,21 +77,21 @@ async def book_spot(spot_id: int, car_id: int, phone_number: str, card_number: s
         "card_number": card_number
     }
 
-    logger.debug(f"[BOOKING] Надсилаємо запит до {url} з даними: {payload}")
+    logger.debug("[BOOKING] Надсилаємо запит до {} з даними: {}", url, payload)
 
     try:
-        async with aiohttp.ClientSession() as session:
+        async with api_session("book_spot") as session:
             async with session.post(url, json=payload) as response:
                 if response.status == 201:
                     data = await response.json()
-                    logger.success(f"[BOOKING] Бронювання створено: {data}")
+                    logger.success("[BOOKING] Бронювання створено: {}", data)
                     return data
                 else:
                     error_text = await response.text()
-                    logger.error(f"[BOOKING] Помилка створення: {response.status} – {error_text}")
+                    logger.error("[BOOKING] Помилка створення: {} – {}", response.status, error_text)
                     return None
     except Exception as e:
-        logger.exception(f"[BOOKING] Виняток при запиті: {e}")
+        logger.exception("[BOOKING] Виняток при запиті: {}", e)
         return None
 
 
@@ -94,71 +113,193 @@ async def book_spot(
     }
 
     if occupied_from:
-        kyiv_tz = pytz.timezone("Europe/Kyiv")
         # конвертуємо str → datetime
         if isinstance(occupied_from, str):
-            occupied_from_dt = datetime.fromisoformat(occupied_from)
+            occupied_from_dt = parse_timestamp(occupied_from)
         else:
             occupied_from_dt = occupied_from
 
         # додаємо таймзону, якщо її нема
-        if occupied_from_dt.tzinfo is None:
-            occupied_from_dt = kyiv_tz.localize(occupied_from_dt)
+        payload["occupied_from"] = localize(occupied_from_dt).isoformat()
 
-        payload["occupied_from"] = occupied_from_dt.isoformat()
-
-    logger.debug(f"[BOOKING_SERVICE] Запит на бронювання: {payload}")
+    logger.debug("[BOOKING_SERVICE] Запит на бронювання: {}", payload)
 
     try:
-        async with aiohttp.ClientSession() as session:
+        async with api_session("book_spot") as session:
             async with session.post(url, json=payload) as response:
                 if response.status == 201:
                     data = await response.json()
-                    logger.success(f"[BOOKING_SERVICE] Бронювання успішне: {data}")
+                    logger.success("[BOOKING_SERVICE] Бронювання успішне: {}", data)
                     return data
                 else:
                     error_text = await response.text()
-                    logger.error(f"[BOOKING_SERVICE] {response.status} – {error_text}")
+                    logger.error("[BOOKING_SERVICE] {} – {}", response.status, error_text)
                     return None
     except Exception as e:
-        logger.exception(f"[BOOKING_SERVICE] Виняток при створенні бронювання: {e}")
+        logger.exception("[BOOKING_SERVICE] Виняток при створенні бронювання: {}", e)
         return None
 
 async def get_spot_by_id(spot_id: int):
     url = f"{API_BASE_URL}/parking/spot/{spot_id}"
-    logger.debug(f"[PARKING_SERVICE] Запит місця: {url}")
+    logger.debug("[PARKING_SERVICE] Запит місця: {}", url)
 
     try:
-        async with aiohttp.ClientSession() as session:
+        async with api_session("get_spot_by_id") as session:
             async with session.get(url) as response:
                 if response.status == 200:
                     data = await response.json()
-                    logger.debug(f"[PARKING_SERVICE] Місце отримано: {data}")
+                    sampled("PARKING_SERVICE").debug("[PARKING_SERVICE] Місце отримано: {}", data)
                     return data
                 else:
                     error = await response.text()
-                    logger.error(f"[PARKING_SERVICE] {response.status} – {error}")
+                    logger.error("[PARKING_SERVICE] {} – {}", response.status, error)
                     return {}
     except Exception as e:
-        logger.exception(f"[PARKING_SERVICE] Помилка при отриманні місця: {e}")
+        logger.exception("[PARKING_SERVICE] Помилка при отриманні місця: {}", e)
         return {}
 
+async def _get_spots_batch(spot_ids: list[int]) -> dict[int, dict] | None:
+    global _spot_batch_supported
+    url = f"{API_BASE_URL}/parking/spots"
+    logger.debug("[PARKING_SERVICE] Пакетний запит місць: {}", spot_ids)
+
+    try:
+        async with api_session("_get_spots_batch") as session:
+            async with session.get(url, params={"ids": ",".join(map(str, spot_ids))}) as response:
+                if response.status in (404, 405):
+                    logger.info("[PARKING_SERVICE] Пакетного ендпоінта місць немає — місця запитуються поодинці")
+                    _spot_batch_supported = False
+                    return None
+                if response.status != 200:
+                    error = await response.text()
+                    logger.error("[PARKING_SERVICE] {} – {}", response.status, error)
+                    return None
+                spots = await response.json()
+    except Exception as e:
+        logger.exception("[PARKING_SERVICE] Помилка пакетного запиту місць: {}", e)
+        return None
+
+    _spot_batch_supported = True
+    return {spot["id"]: spot for spot in spots}
+
+async def get_spots_by_ids(spot_ids) -> dict[int, dict]:
+    """
+    Місця за багатьма ID одним викликом: {spot_id: місце}, для місць, які не вдалося отримати, — {}
+    (як у get_spot_by_id). Спершу пакетний GET /parking/spots?ids=1,2,3; якщо бекенд його не має,
+    місця запитуються поодинці, не більше SPOT_LOOKUP_CONCURRENCY одночасно.
+    """
+    ids = list(dict.fromkeys(spot_id for spot_id in spot_ids if spot_id is not None))
+    if not ids:
+        return {}
+
+    if _spot_batch_supported is not False:
+        spots = await _get_spots_batch(ids)
+        if spots is not None:
+            return {spot_id: spots.get(spot_id, {}) for spot_id in ids}
+
+    semaphore = asyncio.Semaphore(SPOT_LOOKUP_CONCURRENCY)
+
+    async def fetch(spot_id: int) -> dict:
+        async with semaphore:
+            return await get_spot_by_id(spot_id)
+
+    return dict(zip(ids, await asyncio.gather(*(fetch(spot_id) for spot_id in ids))))
+
 async def get_user_bookings(phone_number: str):
     url = f"{API_BASE_URL}/bookings/phone/{phone_number}"
-    logger.debug(f"[BOOKING_SERVICE] Запит бронювань користувача: {url}")
+    logger.debug("[BOOKING_SERVICE] Запит бронювань користувача: {}", url)
 
     try:
-        async with aiohttp.ClientSession() as session:
+        async with api_session("get_user_bookings") as session:
             async with session.get(url) as response:
                 if response.status == 200:
                     bookings = await response.json()
-                    logger.debug(f"[BOOKING_SERVICE] Бронювання: {bookings}")
+                    sampled("BOOKING_SERVICE").debug("[BOOKING_SERVICE] Бронювання: {}", bookings)
                     return bookings
                 else:
                     error = await response.text()
-                    logger.error(f"[BOOKING_SERVICE] {response.status} – {error}")
+                    logger.error("[BOOKING_SERVICE] {} – {}", response.status, error)
                     return []
     except Exception as e:
-        logger.exception(f"[BOOKING_SERVICE] Виняток при запиті бронювань: {e}")
+        logger.exception("[BOOKING_SERVICE] Виняток при запиті бронювань: {}", e)
         return []
 
+async def _fetch_bookings_page(phone_number: str, cursor: str | None, limit: int, function: str):
+    # Бекенд із пагінацією відповідає {"items", "next_cursor", "total"} на ?limit=&cursor=; бекенд без неї
+    # ігнорує параметри й віддає весь список. None — помилка запиту. function — мітка запиту в метриках
+    # (функція, що викликала, а не цей спільний помічник).
+    url = f"{API_BASE_URL}/bookings/phone/{phone_number}"
+    params = {"limit": limit, "order": "-created_at"}
+    if cursor:
+        params["cursor"] = cursor
+    logger.debug("[BOOKING_SERVICE] Запит сторінки бронювань: {} {}", url, params)
+
+    try:
+        async with api_session(function) as session:
+            async with session.get(url, params=params) as response:
+                if response.status != 200:
+                    error = await response.text()
+                    logger.error("[BOOKING_SERVICE] {} – {}", response.status, error)
+                    return None
+                data = await response.json()
+    except Exception as e:
+        logger.exception("[BOOKING_SERVICE] Виняток при запиті сторінки бронювань: {}", e)
+        return None
+    return data
+
+def slice_bookings_page(bookings: list[dict], cursor: str | None, limit: int) -> dict:
+    """
+    Сторінка з повного списку, вже відсортованого новішими першими: курсор — зсув у списку.
+    Так сторінки віддаються, коли бекенд не підтримує пагінацію.
+    """
+    offset = int(cursor or 0)
+    end = offset + limit
+    return {
+        "items": bookings[offset:end],
+        "next_cursor": str(end) if end < len(bookings) else None,
+        "total": len(bookings),
+        "all": bookings,
+    }
+
+async def get_user_bookings_page(phone_number: str, cursor: str | None = None, limit: int = 5):
+    """
+    Одна сторінка бронювань користувача, новіші першими: {"items": [...], "next_cursor": ..., "total": ..., "all": ...}.
+    Якщо бекенд не підтримує пагінацію, сторінка вирізається з повного списку (slice_bookings_page),
+    а в "all" повертається весь відсортований список, щоб наступні сторінки брати з нього без
+    запитів; для бекенда з пагінацією "all" — None. None замість сторінки — помилка запиту.
+    """
+    data = await _fetch_bookings_page(phone_number, cursor, limit, "get_user_bookings_page")
+    if data is None:
+        return None
+
+    if isinstance(data, dict):
+        return {
+            "items": data.get("items", []),
+            "next_cursor": data.get("next_cursor"),
+            "total": data.get("total"),
+            "all": None,
+        }
+
+    data.sort(key=lambda b: b["created_at"], reverse=True)
+    return slice_bookings_page(data, cursor, limit)
+
+async def iter_user_bookings(phone_number: str, page_size: int = 200):
+    """
+    Усі бронювання користувача сторінками по page_size, новіші першими, — для обробки всієї
+    історії без завантаження її в пам'ять. Бекенд без пагінації віддає весь список одним запитом,
+    тоді він лише ріжеться на сторінки. Помилка запиту посеред історії — RuntimeError.
+    """
+    cursor = None
+    while True:
+        data = await _fetch_bookings_page(phone_number, cursor, page_size, "iter_user_bookings")
+        if data is None:
+            raise RuntimeError(f"Не вдалося отримати бронювання (курсор {cursor!r})")
+        if isinstance(data, list):
+            data.sort(key=lambda b: b["created_at"], reverse=True)
+            for start in range(0, len(data), page_size):
+                yield data[start:start + page_size]
+            return
+        yield data.get("items", [])
+        cursor = data.get("next_cursor")
+        if not cursor:
+            return
@@ -0,0 +1,133 @@
+import math
+import time
+from collections import Counter
+
+from loguru import logger
+
+from telegram_bot.bounded_cache import BoundedCache
+from telegram_bot.monitoring.metrics import CACHE_REQUESTS
+from telegram_bot.services.booking_index import BookingIndex, get_booking_index
+from telegram_bot.services.booking_service import get_all_parkings, get_spots_by_ids
+
+# Скільки секунд статистика вважається актуальною та для скількох користувачів зберігається
+BOOKING_STATS_TTL = 300
+BOOKING_STATS_LIMIT = 1000
+# Скільки місць запитується за раз, коли шукається улюблений паркінг, і скільки прив'язок
+# місце → паркінг пам'ятається (місця між паркінгами не переносяться)
+FAVOURITE_BATCH = 8
+SPOT_PARKINGS_LIMIT = 10000
+
+
+def aggregate_bookings(index: BookingIndex) -> dict:
+    """
+    Витрати, години, середня ціна години, кількість бронювань на місце та розбивка по місяцях
+    (новіші першими) за один прохід по індексу. Місяць береться з уже розібраного індексом
+    часу створення (київський час), а бронювання йдуть від найстаріших, тож місяці
+    з'являються вже впорядкованими.
+    """
+    # Місяць → (ціни, години) його бронювань; суми рахує fsum, щоб копійки не губились
+    months: dict[tuple[int, int], tuple[list, list]] = {}
+    spot_counts: Counter = Counter()
+    for created, booking in index.entries():
+        # Відхилені бронювання не оплачуються — у витрати й години не входять
+        if booking.get("status") == "rejected":
+            continue
+        month = months.get((created.year, created.month))
+        if month is None:
+            month = months[created.year, created.month] = ([], [])
+        month[0].append(float(booking.get("total_price") or 0))
+        month[1].append(float(booking.get("duration_hours") or 0))
+        spot_counts[booking.get("spot_id") or 0] += 1
+
+    spent = math.fsum(price for prices, _ in months.values() for price in prices)
+    hours = math.fsum(hours_ for _, hours_list in months.values() for hours_ in hours_list)
+    return {
+        "bookings": len(index),
+        "active": sum(len(prices) for prices, _ in months.values()),
+        "spent": spent,
+        "hours": hours,
+        "avg_rate": spent / hours if hours else None,
+        "monthly": [
+            (f"{year:04d}-{month:02d}", len(prices), math.fsum(prices), math.fsum(hours_list))
+            for (year, month), (prices, hours_list) in reversed(months.items())
+        ],
+        "spot_counts": dict(spot_counts),
+    }
+
+
+# Місце → ID паркінгу
+_spot_parkings: BoundedCache[int, int] = BoundedCache(SPOT_PARKINGS_LIMIT)
+
+
+async def _resolve_parkings(spot_ids: list[int]):
+    for spot_id in spot_ids:
+        CACHE_REQUESTS.inc("spot_parking", "hit" if spot_id in _spot_parkings else "miss")
+    missing = [spot_id for spot_id in spot_ids if spot_id not in _spot_parkings]
+    if not missing:
+        return
+    spots = await get_spots_by_ids(missing)
+    for spot_id in missing:
+        parking_id = (spots.get(spot_id) or {}).get("parking_id")
+        # Місце, що не завантажилось, не запам'ятовуємо — наступного разу запитаємо знову
+        if parking_id is not None:
+            _spot_parkings[spot_id] = parking_id
+
+
+async def _favourite_parking(spot_counts: dict[int, int]) -> tuple[str, int, bool] | None:
+    """
+    Паркінг з найбільшою кількістю бронювань: (назва, кількість, чи кількість точна). Місця
+    перебираються від найчастіших і запитуються пачками по FAVOURITE_BATCH; щойно бронювань
+    у решті місць не вистачить, щоб наздогнати лідера, решта місць не запитується — лідер
+    уже відомий, а його кількість стає нижньою межею.
+    """
+    if not spot_counts:
+        return None
+    ordered = sorted(spot_counts.items(), key=lambda item: item[1], reverse=True)
+    remaining = sum(spot_counts.values())
+    parking_counts: Counter = Counter()
+    for start in range(0, len(ordered), FAVOURITE_BATCH):
+        batch = ordered[start:start + FAVOURITE_BATCH]
+        await _resolve_parkings([spot_id for spot_id, _ in batch])
+        for spot_id, count in batch:
+            remaining -= count
+            parking_id = _spot_parkings.get(spot_id)
+            if parking_id is not None:
+                parking_counts[parking_id] += count
+        leaders = parking_counts.most_common(2)
+        if leaders and leaders[0][1] - (leaders[1][1] if len(leaders) > 1 else 0) > remaining:
+            break
+    if not parking_counts:
+        return None
+    parking_id, count = parking_counts.most_common(1)[0]
+    names = {parking["id"]: parking.get("name") for parking in await get_all_parkings()}
+    return names.get(parking_id) or f"Паркінг №{parking_id}", count, remaining == 0
+
+
+# Телефон → (час обчислення, статистика)
+_stats_cache: BoundedCache[str, tuple[float, dict]] = BoundedCache(BOOKING_STATS_LIMIT)
+
+
+async def get_booking_stats(phone_number: str) -> dict:
+    cached = _stats_cache.get(phone_number)
+    fresh = cached is not None and time.monotonic() - cached[0] < BOOKING_STATS_TTL
+    CACHE_REQUESTS.inc("booking_stats", "hit" if fresh else "miss")
+    if fresh:
+        return cached[1]
+
+    started = time.perf_counter()
+    index = await get_booking_index(phone_number)
+    stats = aggregate_bookings(index)
+    stats["favourite_parking"] = await _favourite_parking(stats.pop("spot_counts"))
+    logger.debug(
+        "[BOOKING_STATS] Статистику обчислено: {} бронювань за {:.1f} мс",
+        stats["bookings"], (time.perf_counter() - started) * 1000,
+    )
+
+    _stats_cache.pop(phone_number, None)
+    if stats["bookings"]:
+        _stats_cache[phone_number] = (time.monotonic(), stats)
+    return stats
+
+
+def invalidate_booking_stats(phone_number: str):
+    _stats_cache.pop(phone_number, None)
@@ -1,64 +1,63 @@
-import aiohttp
 from loguru import logger
-from telegram_bot.services.api_service import API_BASE_URL
+from telegram_bot.logger import sampled
+from telegram_bot.services.api_service import API_BASE_URL, api_session, conditional_get_json
 
 
 async def add_card(phone_number: str, card_data: dict):
     url = f"{API_BASE_URL}/cards/phone/{phone_number}"
-    logger.debug(f"[CARD][ADD] POST {url} | Data: {card_data}")
+    logger.debug("[CARD][ADD] POST {} | Data: {}", url, card_data)
     try:
-        async with aiohttp.ClientSession() as session:
+        async with api_session("add_card") as session:
             async with session.post(url, json=card_data) as resp:
                 data = await resp.json(content_type=None)
-                logger.debug(f"[CARD][ADD] Status: {resp.status} | Response: {data}")
+                logger.debug("[CARD][ADD] Status: {} | Response: {}", resp.status, data)
                 if resp.status == 201:
                     return True
                 elif resp.status == 200 and data.get("message") == "Картка вже існує":
                     return "duplicate"
                 return False
     except Exception as e:
-        logger.exception(f"[CARD][ADD] Помилка при додаванні картки: {e}")
+        logger.exception("[CARD][ADD] Помилка при додаванні картки: {}", e)
         return False
 
 
 async def get_user_cards(phone_number: str) -> list[dict]:
     url = f"{API_BASE_URL}/cards/phone/{phone_number}"
-    logger.debug(f"[CARD][GET] GET {url}")
+    logger.debug("[CARD][GET] GET {}", url)
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as resp:
-                if resp.status == 200:
-                    data = await resp.json(content_type=None)
-                    logger.debug(f"[CARD][GET] Status: {resp.status} | Response: {data}")
-                    return data
-                logger.warning(f"[CARD][GET] Status: {resp.status} | Empty result")
-                return []
+        async with api_session("get_user_cards") as session:
+            status, data = await conditional_get_json(session, url, content_type=None)
+        if status in (200, 304):
+            sampled("CARD").debug("[CARD][GET] Status: {} | Response: {}", status, data)
+            return data
+        logger.warning("[CARD][GET] Status: {} | Empty result", status)
+        return []
     except Exception as e:
-        logger.exception(f"[CARD][GET] Помилка при отриманні карток: {e}")
+        logger.exception("[CARD][GET] Помилка при отриманні карток: {}", e)
         return []
 
 
 async def delete_card_by_id(card_id: int) -> bool:
     url = f"{API_BASE_URL}/cards/{card_id}"
-    logger.debug(f"[CARD][DELETE] DELETE {url}")
+    logger.debug("[CARD][DELETE] DELETE {}", url)
     try:
-        async with aiohttp.ClientSession() as session:
+        async with api_session("delete_card_by_id") as session:
             async with session.delete(url) as resp:
-                logger.debug(f"[CARD][DELETE] Status: {resp.status}")
+                logger.debug("[CARD][DELETE] Status: {}", resp.status)
                 return resp.status in (200, 204)
     except Exception as e:
-        logger.exception(f"[CARD][DELETE] Помилка при видаленні картки: {e}")
+        logger.exception("[CARD][DELETE] Помилка при видаленні картки: {}", e)
         return False
 
 
 async def update_card_by_id(card_id: int, updated_data: dict) -> bool:
     url = f"{API_BASE_URL}/cards/{card_id}"
-    logger.debug(f"[CARD][UPDATE] PUT {url} | Data: {updated_data}")
+    logger.debug("[CARD][UPDATE] PUT {} | Data: {}", url, updated_data)
     try:
-        async with aiohttp.ClientSession() as session:
+        async with api_session("update_card_by_id") as session:
             async with session.put(url, json=updated_data) as resp:
-                logger.debug(f"[CARD][UPDATE] Status: {resp.status}")
+                logger.debug("[CARD][UPDATE] Status: {}", resp.status)
                 return resp.status == 200
     except Exception as e:
-        logger.exception(f"[CARD][UPDATE] Помилка при оновленні картки: {e}")
+        logger.exception("[CARD][UPDATE] Помилка при оновленні картки: {}", e)
         return False
@@ -0,0 +1,227 @@
+import asyncio
+import hashlib
+import itertools
+import json
+import re
+import time
+from collections import defaultdict
+
+import aiohttp
+from loguru import logger
+from yarl import URL
+
+from telegram_bot.logger import QueuedSink
+from telegram_bot.services.api_service import endpoint_label, observe_api_call
+
+# Заголовки-валідатори, що записуються разом з відповіддю: без них умовні запити
+# (conditional_get_json) при відтворенні не мали б збереженого тіла для 304
+VALIDATOR_HEADERS = ("ETag", "Last-Modified")
+
+# Поля з персональними даними та даними карток, що маскуються в касеті
+REDACTED_FIELDS = frozenset({
+    "phone_number", "first_name", "last_name", "email",
+    "number", "card_number", "cvv", "exp_date", "license_plate",
+})
+
+
+# Номери телефонів і карток у вільному тексті (тексти помилок, повідомлення бекенда)
+_SENSITIVE_TEXT = re.compile(r"(?<!\d)\+?\d{10,15}(?!\d)|(?<!\d)\d{4}(?:[ -]?\d{4}){3}(?!\d)")
+
+# Клієнтські middleware aiohttp, через які пишеться касета, з'явилися в 3.12
+MIN_AIOHTTP_VERSION = (3, 12)
+
+
+def _mask(value: str) -> str:
+    # Зберігаємо довжину та формат (цифри → 0, літери → x), щоб розміри payload лишались реальними
+    return re.sub(r"[^\W\d_]", "x", re.sub(r"\d", "0", value))
+
+
+def scrub_text(text: str) -> str:
+    return _SENSITIVE_TEXT.sub(lambda match: _mask(match.group()), text)
+
+
+def redact(value):
+    if isinstance(value, dict):
+        return {
+            key: _mask(item) if key in REDACTED_FIELDS and isinstance(item, str) else redact(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [redact(item) for item in value]
+    if isinstance(value, str):
+        return scrub_text(value)
+    return value
+
+
+def _aiohttp_version() -> tuple[int, ...]:
+    return tuple(int(part) for part in re.findall(r"\d+", aiohttp.__version__)[:2])
+
+
+class CannedResponse:
+    """
+    Відповідь без мережі з тим самим інтерфейсом, яким користуються сервіси:
+    status, headers, read(), text(), json().
+    """
+
+    def __init__(self, status: int, body: bytes, content_type: str = "application/json", validators: dict | None = None):
+        self.status = status
+        self.ok = status < 400
+        self.headers = {"Content-Type": content_type, **(validators or {})}
+        self.content_type = content_type
+        self._body = body
+
+    async def read(self) -> bytes:
+        return self._body
+
+    async def text(self, encoding: str = "utf-8") -> str:
+        return self._body.decode(encoding)
+
+    async def json(self, **kwargs):
+        return json.loads(self._body)
+
+    def release(self):
+        pass
+
+
+class CassetteRecorder:
+    """
+    Клієнтський middleware aiohttp: записує кожну пару запит/відповідь у касету (JSON Lines).
+    Тіла відповідей маскуються і зберігаються один раз — повторні однакові відповіді
+    посилаються на вже записане тіло за хешем.
+    """
+
+    def __init__(self, path: str):
+        if _aiohttp_version() < MIN_AIOHTTP_VERSION:
+            raise RuntimeError(
+                f"Запис касети (API_RECORD_PATH) потребує aiohttp>={'.'.join(map(str, MIN_AIOHTTP_VERSION))}, "
+                f"встановлено {aiohttp.__version__}"
+            )
+        self.path = path
+        self._sink = QueuedSink(path)
+        self._seen_bodies: set[str] = set()
+        logger.info("[CASSETTE] Запис трафіку API у {}", path)
+
+    async def __call__(self, request, handler):
+        started = time.perf_counter()
+        response = await handler(request)
+        # read() кешує тіло у відповіді, тож сервіс далі читає його як звичайно
+        body = await response.read()
+        latency_ms = round((time.perf_counter() - started) * 1000, 2)
+
+        content_type = response.headers.get("Content-Type", "")
+        redacted = None
+        if "json" in content_type and body:
+            try:
+                redacted = json.dumps(redact(json.loads(body)), ensure_ascii=False, separators=(",", ":"))
+            except ValueError:
+                pass
+        if redacted is None:
+            # Не JSON (текст помилки, HTML проксі) — маскуємо номери у вільному тексті
+            redacted = scrub_text(body.decode("utf-8", errors="replace"))
+        body = redacted.encode("utf-8")
+
+        body_id = hashlib.sha1(body).hexdigest()[:16]
+        if body_id not in self._seen_bodies:
+            self._seen_bodies.add(body_id)
+            self._write({"b": body_id, "body": body.decode("utf-8", errors="replace")})
+        record = {
+            "m": request.method,
+            "e": endpoint_label(request.url),
+            "s": response.status,
+            "t": latency_ms,
+            "ct": content_type,
+            "b": body_id,
+        }
+        validators = {name: response.headers[name] for name in VALIDATOR_HEADERS if name in response.headers}
+        if validators:
+            record["h"] = validators
+        self._write(record)
+        return response
+
+    def _write(self, record: dict):
+        self._sink(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+
+class Cassette:
+    """
+    Записані відповіді, згруповані за (метод, шаблон ендпоінта). Для кожного ендпоінта
+    відповіді віддаються по колу в порядку запису з їхньою оригінальною затримкою,
+    тож розподіл часу відповіді й розміри payload відтворюються.
+    """
+
+    def __init__(self, path: str, speed: float = 1.0):
+        self.path = path
+        self.speed = speed
+        self.served = 0
+        bodies: dict[str, bytes] = {}
+        interactions: defaultdict[tuple[str, str], list] = defaultdict(list)
+        with open(path, encoding="utf-8") as file:
+            for line in file:
+                record = json.loads(line)
+                if "body" in record:
+                    bodies[record["b"]] = record["body"].encode("utf-8")
+                else:
+                    interactions[(record["m"], record["e"])].append(
+                        (record["s"], record["t"] / 1000, record["b"], record.get("ct", "application/json"), record.get("h"))
+                    )
+        self._bodies = bodies
+        self._responses = {key: itertools.cycle(items) for key, items in interactions.items()}
+        logger.info("[CASSETTE] Відтворення з {}: {} ендпоінтів", path, len(self._responses))
+
+    async def respond(self, method: str, endpoint: str) -> CannedResponse:
+        self.served += 1
+        responses = self._responses.get((method, endpoint))
+        if responses is None:
+            logger.warning("[CASSETTE] Немає запису для {} {}", method, endpoint)
+            return CannedResponse(404, b'{"detail":"Not recorded"}')
+        status, latency, body_id, content_type, validators = next(responses)
+        if self.speed:
+            await asyncio.sleep(latency / self.speed)
+        return CannedResponse(status, self._bodies.get(body_id, b""), content_type, validators)
+
+
+class _CannedRequest:
+    def __init__(self, respond):
+        self._respond = respond
+
+    def __await__(self):
+        return self._respond().__await__()
+
+    async def __aenter__(self) -> CannedResponse:
+        return await self._respond()
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+class ReplaySession:
+    """
+    Замінник aiohttp.ClientSession для сервісів у режимі відтворення: ті ж get/post/put/delete,
+    але відповіді беруться з касети, а метрики й логи API пишуться як для реальних запитів.
+    """
+
+    def __init__(self, cassette: Cassette):
+        self.cassette = cassette
+
+    def request(self, method: str, url: str, **kwargs) -> _CannedRequest:
+        endpoint = endpoint_label(URL(url))
+
+        async def respond() -> CannedResponse:
+            started = time.perf_counter()
+            response = await self.cassette.respond(method, endpoint)
+            observe_api_call(method, endpoint, time.perf_counter() - started, response.status)
+            return response
+
+        return _CannedRequest(respond)
+
+    def get(self, url: str, **kwargs) -> _CannedRequest:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> _CannedRequest:
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs) -> _CannedRequest:
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url: str, **kwargs) -> _CannedRequest:
+        return self.request("DELETE", url, **kwargs)
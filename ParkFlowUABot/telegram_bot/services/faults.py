@@ -0,0 +1,117 @@
+import asyncio
+import random
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+
+import aiohttp
+from loguru import logger
+from yarl import URL
+
+from telegram_bot.monitoring.metrics import FAULTS_INJECTED
+from telegram_bot.services.api_service import endpoint_label, observe_api_call
+from telegram_bot.services.cassette import CannedResponse
+
+FAULT_KINDS = ("latency", "timeout", "error", "reset", "malformed")
+
+
+@dataclass(frozen=True)
+class FaultRule:
+    kind: str
+    probability: float
+    endpoint: str = "*"
+    value: float | None = None
+
+    def matches(self, endpoint: str) -> bool:
+        return fnmatchcase(endpoint, self.endpoint)
+
+
+def parse_faults(spec: str) -> list[FaultRule]:
+    """
+    Розбирає API_FAULTS: правила через кому у форматі <вид>[=<значення>]:<ймовірність>[@<ендпоінт>].
+    Ендпоінт — шаблон як у метриках (/cars/phone/{id}), підтримує * та ?.
+        latency=0.5:0.2@/feedback      +0.5 с до 20% запитів /feedback
+        timeout:0.01                   1% запитів «висить» до тайм-ауту клієнта
+        error=503:0.1@/parking/*       10% відповідей 503
+        reset:0.05                     5% з'єднань обриваються
+        malformed:0.1@/bookings/*      10% відповідей 200 з битим JSON
+    """
+    rules = []
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        head, _, endpoint = item.partition("@")
+        fault, _, probability = head.partition(":")
+        kind, _, value = fault.partition("=")
+        if kind not in FAULT_KINDS or not probability:
+            raise ValueError(f"Некоректне правило API_FAULTS: {item!r}")
+        rules.append(FaultRule(kind, float(probability), endpoint or "*", float(value) if value else None))
+    return rules
+
+
+class _FaultyRequest:
+    def __init__(self, session: "FaultInjectingSession", method: str, url: str, kwargs: dict):
+        self._session = session
+        self._method = method
+        self._url = url
+        self._kwargs = kwargs
+        self._inner = None
+
+    async def __aenter__(self):
+        session = self._session
+        endpoint = endpoint_label(URL(self._url))
+        for rule in session.rules:
+            if not rule.matches(endpoint) or session.rng.random() >= rule.probability:
+                continue
+            FAULTS_INJECTED.inc(rule.kind, endpoint)
+            logger.debug("[FAULTS] {} {} {}", rule.kind, self._method, endpoint)
+            if rule.kind == "latency":
+                await asyncio.sleep(rule.value or 1.0)
+            elif rule.kind == "timeout":
+                await asyncio.sleep(rule.value or session.timeout)
+                observe_api_call(self._method, endpoint, rule.value or session.timeout, "error")
+                raise asyncio.TimeoutError(f"Injected timeout: {self._method} {endpoint}")
+            elif rule.kind == "reset":
+                observe_api_call(self._method, endpoint, 0.0, "error")
+                raise aiohttp.ClientConnectionResetError(f"Injected connection reset: {self._method} {endpoint}")
+            elif rule.kind == "error":
+                status = int(rule.value or 503)
+                observe_api_call(self._method, endpoint, 0.0, status)
+                return CannedResponse(status, b'{"detail":"Injected fault"}')
+            elif rule.kind == "malformed":
+                observe_api_call(self._method, endpoint, 0.0, 200)
+                return CannedResponse(200, b'{"detail": [{"id": 1, "name": "trunc')
+
+        self._inner = session.inner.request(self._method, self._url, **self._kwargs)
+        return await self._inner.__aenter__()
+
+    async def __aexit__(self, *exc_info):
+        if self._inner is not None:
+            return await self._inner.__aexit__(*exc_info)
+        return False
+
+
+class FaultInjectingSession:
+    """
+    Обгортка над сесією API (реальною або ReplaySession), що за правилами API_FAULTS
+    додає затримки, тайм-аути, 5xx, обриви з'єднання та битий JSON перед зверненням до бекенду.
+    Усі збої — кооперативні (asyncio.sleep/винятки), тож event loop вони не блокують.
+    """
+
+    def __init__(self, inner, rules: list[FaultRule], timeout: float, rng: random.Random | None = None):
+        self.inner = inner
+        self.rules = rules
+        self.timeout = timeout
+        self.rng = rng or random.Random()
+
+    def request(self, method: str, url: str, **kwargs) -> _FaultyRequest:
+        return _FaultyRequest(self, method, url, kwargs)
+
+    def get(self, url: str, **kwargs) -> _FaultyRequest:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> _FaultyRequest:
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs) -> _FaultyRequest:
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url: str, **kwargs) -> _FaultyRequest:
+        return self.request("DELETE", url, **kwargs)
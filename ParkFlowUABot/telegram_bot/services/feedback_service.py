@@ -1,12 +1,20 @@
 # telegram_bot/services/feedback_service.py
 
+import time
+
 import aiohttp
-import logging
-from telegram_bot.config import API_BASE_URL
+from loguru import logger
 
-logger = logging.getLogger(__name__)
+from telegram_bot.config import API_BASE_URL
+from telegram_bot.monitoring.metrics import CACHE_REQUESTS
+from telegram_bot.services.api_service import api_session, conditional_get_json
 
 FEEDBACK_API = f"{API_BASE_URL}/feedback"
+# Скільки секунд набір відгуків береться з пам'яті без звернення до API
+FEEDBACK_CACHE_TTL = 60
+
+# (час отримання, версія набору, відгуки новіші першими) або None — ще не завантажено
+_feedback_set: tuple[float, str, list] | None = None
 
 # 🔸 Надіслати відгук
 async def send_feedback(user_id: int, text: str):
@@ -15,45 +23,95 @@ async def send_feedback(user_id: int, text: str):
         "text": text
     }
 
-    logger.info(f"[FEEDBACK_SERVICE] Відправка відгуку: {payload}")
+    logger.info("[FEEDBACK_SERVICE] Відправка відгуку: {}", payload)
 
     try:
-        async with aiohttp.ClientSession() as session:
+        async with api_session("send_feedback") as session:
             async with session.post(FEEDBACK_API, json=payload) as resp:
                 if resp.status in (200, 201):
                     data = await resp.json()
-                    logger.info(f"[FEEDBACK_SERVICE] Відгук збережено: {data}")
+                    logger.info("[FEEDBACK_SERVICE] Відгук збережено: {}", data)
+                    invalidate_feedbacks()
                     return data
                 else:
                     error_text = await resp.text()
-                    logger.warning(f"[FEEDBACK_SERVICE] Статус {resp.status}, відповідь: {error_text}")
+                    logger.warning("[FEEDBACK_SERVICE] Статус {}, відповідь: {}", resp.status, error_text)
                     return None
     except aiohttp.ClientError as e:
-        logger.exception(f"[FEEDBACK_SERVICE] HTTP-помилка: {e}")
+        logger.exception("[FEEDBACK_SERVICE] HTTP-помилка: {}", e)
         return None
     except Exception as e:
-        logger.exception(f"[FEEDBACK_SERVICE] Невідома помилка: {e}")
+        logger.exception("[FEEDBACK_SERVICE] Невідома помилка: {}", e)
         return None
 
 
 # 🔹 Отримати всі відгуки
-async def get_all_feedbacks():
+async def _fetch_feedbacks() -> tuple[list, bool] | None:
+    """Відгуки з API та чи змінилися вони (False — бекенд відповів 304); None — помилка."""
     logger.info("[FEEDBACK_SERVICE] Запит усіх відгуків")
 
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(FEEDBACK_API) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    logger.info(f"[FEEDBACK_SERVICE] Отримано {len(data)} відгуків")
-                    return data
-                else:
-                    error_text = await resp.text()
-                    logger.warning(f"[FEEDBACK_SERVICE] Помилка {resp.status}, відповідь: {error_text}")
-                    return []
+        async with api_session("_fetch_feedbacks") as session:
+            status, data = await conditional_get_json(session, FEEDBACK_API)
+            if status in (200, 304):
+                logger.info("[FEEDBACK_SERVICE] Отримано {} відгуків", len(data))
+                return data, status == 200
+            logger.warning("[FEEDBACK_SERVICE] Помилка {}, відповідь: {}", status, data)
+            return None
     except aiohttp.ClientError as e:
-        logger.exception(f"[FEEDBACK_SERVICE] HTTP-помилка: {e}")
-        return []
+        logger.exception("[FEEDBACK_SERVICE] HTTP-помилка: {}", e)
+        return None
     except Exception as e:
-        logger.exception(f"[FEEDBACK_SERVICE] Невідома помилка: {e}")
-        return []
+        logger.exception("[FEEDBACK_SERVICE] Невідома помилка: {}", e)
+        return None
+
+
+async def get_all_feedbacks():
+    fetched = await _fetch_feedbacks()
+    return fetched[0] if fetched is not None else []
+
+
+def _feedback_version(feedbacks: list) -> str:
+    # Версія — відбиток вмісту: змінюється при додаванні, видаленні й редагуванні відгуку
+    return f"{len(feedbacks)}:{hash(tuple((fb.get('id'), fb.get('text')) for fb in feedbacks)):x}"
+
+
+async def get_feedback_set() -> tuple[str, list]:
+    """
+    Версія набору відгуків і самі відгуки (новіші першими). Протягом FEEDBACK_CACHE_TTL набір
+    береться з пам'яті; після цього запитується знову умовним запитом, і версія змінюється, лише
+    якщо бекенд віддав інший набір. Успішний send_feedback одразу робить набір застарілим.
+    """
+    global _feedback_set
+    fresh = _feedback_set is not None and time.monotonic() - _feedback_set[0] < FEEDBACK_CACHE_TTL
+    CACHE_REQUESTS.inc("feedbacks", "hit" if fresh else "miss")
+    if fresh:
+        return _feedback_set[1], _feedback_set[2]
+
+    fetched = await _fetch_feedbacks()
+    if fetched is None:
+        # API недоступний — показуємо останній відомий набір, якщо він є
+        return (_feedback_set[1], _feedback_set[2]) if _feedback_set is not None else ("", [])
+
+    feedbacks, changed = fetched
+    if not changed and _feedback_set is not None:
+        # 304 — той самий набір, відбиток не перераховуємо
+        _feedback_set = (time.monotonic(), _feedback_set[1], _feedback_set[2])
+        return _feedback_set[1], _feedback_set[2]
+
+    version = _feedback_version(feedbacks)
+    if _feedback_set is not None and _feedback_set[1] == version:
+        # Набір не змінився — лишаємо той самий список, лише подовжуємо термін
+        _feedback_set = (time.monotonic(), version, _feedback_set[2])
+    else:
+        logger.debug("[FEEDBACK_SERVICE] Нова версія набору відгуків: {}", version)
+        _feedback_set = (time.monotonic(), version, feedbacks[::-1])
+    return _feedback_set[1], _feedback_set[2]
+
+
+def invalidate_feedbacks():
+    # Набір лише позначається застарілим: наступний перегляд запитає API, а якщо той недоступний —
+    # покаже останній відомий набір
+    global _feedback_set
+    if _feedback_set is not None:
+        _feedback_set = (float("-inf"), _feedback_set[1], _feedback_set[2])
@@ -0,0 +1,95 @@
+import asyncio
+import json
+import os
+from typing import Callable
+
+from loguru import logger
+
+from telegram_bot.config import IDENTITY_STORE_PATH
+from telegram_bot.monitoring.tracing import create_detached_task
+
+# Скільки секунд змін збирається в один запис мапи на диск
+SAVE_DELAY = 1.0
+
+# Відкладений запис (None — змін, що чекають запису, немає) і функція, що знімає знімок мапи
+_pending_save: asyncio.Task | None = None
+_snapshot: Callable[[], dict[int, dict]] | None = None
+_write_lock = asyncio.Lock()
+
+
+def load_identities() -> dict[int, dict]:
+    """
+    Зчитує збережену мапу telegram_id → {phone_number, user_id, first_name, last_name}.
+    """
+    if not os.path.exists(IDENTITY_STORE_PATH):
+        return {}
+
+    try:
+        with open(IDENTITY_STORE_PATH, encoding="utf-8") as f:
+            raw = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.error("[IDENTITY] Не вдалося прочитати {}: {}", IDENTITY_STORE_PATH, e)
+        return {}
+
+    identities = {int(telegram_id): identity for telegram_id, identity in raw.items()}
+    logger.info("[IDENTITY] Завантажено {} користувачів", len(identities))
+    return identities
+
+
+def save_identities(identities: dict[int, dict]):
+    # Запис через тимчасовий файл, щоб не залишити пошкоджену мапу при збої
+    tmp_path = f"{IDENTITY_STORE_PATH}.tmp"
+    try:
+        directory = os.path.dirname(IDENTITY_STORE_PATH)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({str(k): v for k, v in identities.items()}, f, ensure_ascii=False)
+        os.replace(tmp_path, IDENTITY_STORE_PATH)
+    except OSError as e:
+        logger.error("[IDENTITY] Не вдалося зберегти {}: {}", IDENTITY_STORE_PATH, e)
+
+
+def schedule_save(snapshot: Callable[[], dict[int, dict]]):
+    """
+    Планує запис мапи: зміни за SAVE_DELAY секунд зливаються в один запис, а сам файл
+    пишеться в окремому потоці, тож апдейти не чекають на диск. Знімок знімається
+    на event loop безпосередньо перед записом — у файл потрапляє останній стан.
+    """
+    global _pending_save, _snapshot
+    _snapshot = snapshot
+    if _pending_save is not None:
+        return
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        # Поза event loop (скрипти) — пишемо одразу
+        save_identities(snapshot())
+        return
+    _pending_save = create_detached_task(_save_later())
+
+
+async def _write(identities: dict[int, dict]):
+    # Записи по черзі: обидва йдуть через той самий тимчасовий файл
+    async with _write_lock:
+        await asyncio.to_thread(save_identities, identities)
+
+
+async def _save_later():
+    global _pending_save
+    await asyncio.sleep(SAVE_DELAY)
+    # Зміни після цього моменту плануватимуть новий запис
+    _pending_save = None
+    await _write(_snapshot())
+
+
+async def flush_identities():
+    """Записує відкладені зміни одразу (при зупинці бота) і чекає завершення поточного запису."""
+    global _pending_save
+    task, _pending_save = _pending_save, None
+    if task is not None:
+        task.cancel()
+        await _write(_snapshot())
+    else:
+        async with _write_lock:
+            pass
@@ -1,8 +1,11 @@
 import aiohttp
-import logging
+from loguru import logger
+
 from telegram_bot.config import API_BASE_URL
+from telegram_bot.services.api_service import api_session
 
-logger = logging.getLogger(__name__)
+# Відповідь get_user_by_id для видаленого користувача (404), щоб відрізнити її від помилки (None)
+USER_DELETED = object()
 
 # Створення нового користувача
 async def create_user(telegram_id: int, first_name: str, last_name: str, phone_number: str, email: str = None):
@@ -15,31 +18,31 @@ async def create_user(telegram_id: int, first_name: str, last_name: str, phone_n
         "email": email
     }
 
-    logger.info(f"Відправка запиту на створення користувача: {payload}")
+    logger.info("Відправка запиту на створення користувача: {}", payload)
 
     try:
-        async with aiohttp.ClientSession() as session:
+        async with api_session("create_user") as session:
             async with session.post(url, json=payload) as response:
-                logger.info(f"Відповідь API: {response.status}")
+                logger.info("Відповідь API: {}", response.status)
 
                 if response.status in [200, 201]:
                     try:
                         data = await response.json()
-                        logger.info(f"Користувача створено успішно: {data}")
+                        logger.info("Користувача створено успішно: {}", data)
                         return data
                     except Exception as json_err:
-                        logger.error(f"Не вдалося розпарсити JSON: {json_err}")
+                        logger.error("Не вдалося розпарсити JSON: {}", json_err)
                         return None
                 else:
                     error_text = await response.text()
-                    logger.warning(f"API повернув неуспішний статус: {response.status}, текст: {error_text}")
+                    logger.warning("API повернув неуспішний статус: {}, текст: {}", response.status, error_text)
                     return None
 
     except aiohttp.ClientError as e:
-        logger.exception(f"Помилка HTTP-з'єднання: {e}")
+        logger.exception("Помилка HTTP-з'єднання: {}", e)
         return None
     except Exception as e:
-        logger.exception(f"Невідома помилка у create_user: {e}")
+        logger.exception("Невідома помилка у create_user: {}", e)
         return None
 
 async def get_user_by_phone(phone_number: str):
@@ -47,29 +50,29 @@ async def get_user_by_phone(phone_number: str):
     params = {"phone_number": phone_number}
 
     try:
-        async with aiohttp.ClientSession() as session:
+        async with api_session("get_user_by_phone") as session:
             async with session.get(url, params=params) as resp:
-                logger.info(f"Виконано GET {url} з параметрами {params}, статус: {resp.status}")
+                logger.info("Виконано GET {} з параметрами {}, статус: {}", url, params, resp.status)
 
                 if resp.status == 200:
                     try:
                         data = await resp.json()
-                        logger.info(f"Користувач знайдений: {data}")
+                        logger.info("Користувач знайдений: {}", data)
                         return data
                     except Exception as json_err:
-                        logger.error(f"Помилка розбору JSON відповіді: {json_err}")
+                        logger.error("Помилка розбору JSON відповіді: {}", json_err)
                         return None
 
                 # Тепер 404 також сприймається як помилка API (не дозволяємо продовжити)
                 error_text = await resp.text()
-                logger.error(f"❌ API повернув помилку: статус {resp.status}, відповідь: {error_text}")
+                logger.error("❌ API повернув помилку: статус {}, відповідь: {}", resp.status, error_text)
                 raise Exception("Помилка відповіді API")
 
     except aiohttp.ClientError as e:
-        logger.exception(f"Помилка з'єднання з API у get_user_by_phone: {e}")
+        logger.exception("Помилка з'єднання з API у get_user_by_phone: {}", e)
         raise Exception("Помилка з'єднання з API")
     except Exception as e:
-        logger.exception(f"Невідома помилка у get_user_by_phone: {e}")
+        logger.exception("Невідома помилка у get_user_by_phone: {}", e)
         raise Exception("Невідома помилка у get_user_by_phone")
 
 
@@ -78,13 +81,13 @@ async def update_user_by_phone(phone_number: str, update_data: dict):
     url = f"{API_BASE_URL}/users/update"
     params = {"phone_number": phone_number}
     try:
-        async with aiohttp.ClientSession() as session:
+        async with api_session("update_user_by_phone") as session:
             async with session.put(url, params=params, json=update_data) as resp:
                 if resp.status in [200, 204]:
                     logger.info("Користувача успішно оновлено.")
                     return True
                 else:
-                    logger.warning(f"Помилка оновлення користувача: {resp.status}")
+                    logger.warning("Помилка оновлення користувача: {}", resp.status)
                     return False
     except Exception as e:
         logger.exception("Помилка при оновленні користувача.")
@@ -95,48 +98,48 @@ async def delete_user_by_phone(phone_number: str):
     url = f"{API_BASE_URL}/users/delete"
     params = {"phone_number": phone_number}
     try:
-        async with aiohttp.ClientSession() as session:
+        async with api_session("delete_user_by_phone") as session:
             async with session.delete(url, params=params) as resp:
                 if resp.status in [200, 204]:
                     logger.info("Користувача успішно видалено.")
                     return True
                 else:
-                    logger.warning(f"Помилка при видаленні користувача: {resp.status}")
+                    logger.warning("Помилка при видаленні користувача: {}", resp.status)
                     return False
     except Exception as e:
         logger.exception("Помилка при видаленні користувача.")
         return False
 
-# 🔹 Отримати користувача по ID
+# 🔹 Отримати користувача по ID: USER_DELETED, якщо його не існує, None — при помилці
 async def get_user_by_id(user_id: int):
     url = f"{API_BASE_URL}/users/{user_id}"
 
     try:
-        async with aiohttp.ClientSession() as session:
+        async with api_session("get_user_by_id") as session:
             async with session.get(url) as resp:
-                logger.info(f"[GET_USER_BY_ID] GET {url} -> {resp.status}")
+                logger.info("[GET_USER_BY_ID] GET {} -> {}", url, resp.status)
 
                 if resp.status == 200:
                     try:
                         data = await resp.json()
-                        logger.info(f"[GET_USER_BY_ID] Отримано користувача: {data}")
+                        logger.info("[GET_USER_BY_ID] Отримано користувача: {}", data)
                         return data
                     except Exception as json_err:
-                        logger.error(f"[GET_USER_BY_ID] Помилка парсингу JSON: {json_err}")
+                        logger.error("[GET_USER_BY_ID] Помилка парсингу JSON: {}", json_err)
                         return None
 
                 elif resp.status == 404:
-                    logger.warning(f"[GET_USER_BY_ID] Користувача з ID {user_id} не знайдено.")
-                    return None
+                    logger.warning("[GET_USER_BY_ID] Користувача з ID {} не знайдено.", user_id)
+                    return USER_DELETED
 
                 else:
                     error_text = await resp.text()
-                    logger.error(f"[GET_USER_BY_ID] {resp.status}: {error_text}")
+                    logger.error("[GET_USER_BY_ID] {}: {}", resp.status, error_text)
                     return None
 
     except aiohttp.ClientError as e:
-        logger.exception(f"[GET_USER_BY_ID] HTTP помилка: {e}")
+        logger.exception("[GET_USER_BY_ID] HTTP помилка: {}", e)
         return None
     except Exception as e:
-        logger.exception(f"[GET_USER_BY_ID] Невідома помилка: {e}")
+        logger.exception("[GET_USER_BY_ID] Невідома помилка: {}", e)
         return None
\ No newline at end of file
@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+# Часовий пояс бота; ZoneInfo створюється один раз (на Windows потрібен пакет tzdata)
+KYIV_TZ = ZoneInfo("Europe/Kyiv")
+
+_MONTHS = {
+    "Jan": 1, "Feb": 2, "Mar": 3, "Apr": 4, "May": 5, "Jun": 6,
+    "Jul": 7, "Aug": 8, "Sep": 9, "Oct": 10, "Nov": 11, "Dec": 12,
+}
+_UTC_ZONES = ("GMT", "UTC", "+0000", "-0000")
+
+
+def now_kyiv() -> datetime:
+    return datetime.now(KYIV_TZ)
+
+
+def _parse_rfc1123(value: str) -> datetime | None:
+    # "Sun, 01 Jun 2025 08:00:00 GMT" / "... +0300" — фіксовані позиції, без регулярних виразів
+    if len(value) < 29 or value[3:5] != ", " or value[19] != ":" or value[22] != ":":
+        return None
+    month = _MONTHS.get(value[8:11])
+    zone = value[26:]
+    if month is None:
+        return None
+    if zone in _UTC_ZONES:
+        tz = timezone.utc
+    elif len(zone) == 5 and zone[0] in "+-" and zone[1:].isdigit():
+        offset = timedelta(hours=int(zone[1:3]), minutes=int(zone[3:5]))
+        tz = timezone(-offset if zone[0] == "-" else offset)
+    else:
+        return None
+    return datetime(
+        int(value[12:16]), month, int(value[5:7]),
+        int(value[17:19]), int(value[20:22]), int(value[23:25]), tzinfo=tz,
+    )
+
+
+def parse_timestamp(value: str) -> datetime:
+    """
+    Розбирає час з API: RFC 1123 (occupied_from/occupied_until місць) або ISO 8601
+    (created_at, timestamp). Некоректний рядок — ValueError.
+    """
+    if value[:4].isdigit():
+        return datetime.fromisoformat(value)
+    parsed = _parse_rfc1123(value)
+    if parsed is None:
+        # Рідкісні варіанти RFC 2822 (без дня тижня, інші зони) — повільний, але повний розбір
+        try:
+            parsed = parsedate_to_datetime(value)
+        except (TypeError, IndexError) as e:
+            raise ValueError(f"Некоректний час: {value!r}") from e
+    return parsed
+
+
+def to_kyiv(moment: datetime) -> datetime:
+    # Час без зони API вже віддає київським — лишаємо як є, як і раніше показувався
+    return moment.astimezone(KYIV_TZ) if moment.tzinfo is not None else moment
+
+
+def localize(moment: datetime) -> datetime:
+    """Додає київську зону часу без зони; час із зоною повертає без змін."""
+    return moment.replace(tzinfo=KYIV_TZ) if moment.tzinfo is None else moment
+
+
+def format_dt(moment: datetime) -> str:
+    """Формат показу користувачу: 01.06.2025 11:00 (те саме, що strftime('%d.%m.%Y %H:%M'), але швидше)."""
+    return f"{moment.day:02d}.{moment.month:02d}.{moment.year} {moment.hour:02d}:{moment.minute:02d}"
+
+
+@lru_cache(maxsize=4096)
+def format_timestamp(value: str) -> str:
+    """
+    Рядок часу з API → київський час у форматі показу. Мемоізовано: ті самі occupied_from/created_at
+    повторюються на кожній сторінці історії бронювань і відгуків.
+    """
+    return format_dt(to_kyiv(parse_timestamp(value)))
@@ -0,0 +1,10 @@
+"""
+Тести запускаються з каталогу ParkFlowUABot:
+    python -m pytest
+"""
+import os
+import tempfile
+
+# Конфігурація і логер читаються під час імпорту telegram_bot — тиша в консолі та лог поза репозиторієм
+os.environ.setdefault("CONSOLE_LOG_LEVEL", "WARNING")
+os.environ.setdefault("LOG_FILE", os.path.join(tempfile.gettempdir(), "parkflow-tests.log"))
@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+
+from telegram_bot.handlers import booking_handler
+from telegram_bot.handlers.booking_handler import BOOKINGS_PER_PAGE, BookingHistory
+from telegram_bot.services import booking_service
+
+BOOKINGS = [
+    {"id": booking_id, "spot_id": booking_id, "created_at": f"2025-01-{booking_id:02d}T10:00:00"}
+    for booking_id in range(1, 23)
+]
+
+
+@pytest.fixture
+def fetches(monkeypatch):
+    calls = []
+
+    async def no_spots(spot_ids):
+        return {}
+
+    monkeypatch.setattr(booking_handler, "get_spots_by_ids", no_spots)
+    return calls
+
+
+def _non_paging_backend(monkeypatch, calls):
+    # Бекенд без пагінації ігнорує cursor/limit і щоразу віддає весь список у довільному порядку
+    async def fetch(phone_number, cursor, limit, function):
+        calls.append(cursor)
+        return list(BOOKINGS)
+
+    monkeypatch.setattr(booking_service, "_fetch_bookings_page", fetch)
+
+
+def _paging_backend(monkeypatch, calls):
+    async def fetch(phone_number, cursor, limit, function):
+        calls.append(cursor)
+        ordered = sorted(BOOKINGS, key=lambda b: b["created_at"], reverse=True)
+        offset = int(cursor or 0)
+        end = offset + limit
+        return {"items": ordered[offset:end], "next_cursor": str(end) if end < len(ordered) else None, "total": len(ordered)}
+
+    monkeypatch.setattr(booking_service, "_fetch_bookings_page", fetch)
+
+
+async def _browse(history: BookingHistory, pages: list[int]) -> list[list[int]]:
+    # Як show_booking_page: сторінка, потім фонове підвантаження наступної
+    shown = []
+    for page in pages:
+        items = await history.page(page)
+        history.prefetch(page + 1)
+        shown.append([b["id"] for b in items])
+    await asyncio.gather(*history._pages.values())
+    return shown
+
+
+def test_non_paging_backend_is_downloaded_once(monkeypatch, fetches):
+    _non_paging_backend(monkeypatch, fetches)
+    shown = asyncio.run(_browse(BookingHistory("+380000000001"), [1, 2, 3, 2, 1, 4, 5]))
+
+    assert len(fetches) == 1
+    assert shown[0] == [22, 21, 20, 19, 18]
+    assert shown[2] == [12, 11, 10, 9, 8]
+    assert shown[6] == [2, 1]
+
+
+def test_paging_backend_requests_each_page_once(monkeypatch, fetches):
+    _paging_backend(monkeypatch, fetches)
+    history = BookingHistory("+380000000001")
+    shown = asyncio.run(_browse(history, [1, 2, 3, 2, 1]))
+
+    # Сторінки 1–3 і фонове підвантаження четвертої
+    assert fetches == [None, str(BOOKINGS_PER_PAGE), str(2 * BOOKINGS_PER_PAGE), str(3 * BOOKINGS_PER_PAGE)]
+    assert shown[1] == [17, 16, 15, 14, 13]
+    assert history.total_pages == 5
@@ -0,0 +1,100 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from telegram_bot.services.booking_index import BookingIndex, _created_key
+
+STATUSES = ("pending", "confirmed", "rejected")
+START = datetime(2025, 1, 1)
+
+
+def _created_at(rng: random.Random) -> str:
+    # Той самий момент у трьох форматах, що приходять з API: ISO без зони, ISO із зоною, RFC 1123
+    moment = START + timedelta(minutes=rng.randrange(60 * 24 * 90))
+    kind = rng.randrange(3)
+    if kind == 0:
+        return moment.isoformat()
+    utc = moment.replace(tzinfo=timezone(timedelta(hours=2))).astimezone(timezone.utc)
+    if kind == 1:
+        return utc.isoformat()
+    return utc.strftime("%a, %d %b %Y %H:%M:%S GMT")
+
+
+def _bookings(count: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    return [
+        {"id": booking_id, "created_at": _created_at(rng), "status": rng.choice(STATUSES)}
+        for booking_id in rng.sample(range(1, count * 10), count)
+    ]
+
+
+def _brute_force(bookings, start=None, end=None, status=None) -> list[dict]:
+    selected = [
+        b for b in bookings
+        if (start is None or _created_key(b) >= start)
+        and (end is None or _created_key(b) < end)
+        and (status is None or b["status"] == status)
+    ]
+    return sorted(selected, key=lambda b: (_created_key(b), b["id"]), reverse=True)
+
+
+def _ids(bookings) -> list[int]:
+    return [b["id"] for b in bookings]
+
+
+def test_mixed_naive_and_aware_timestamps_are_ordered_in_kyiv_time():
+    bookings = [
+        {"id": 1, "created_at": "2025-01-01T12:00:00", "status": "pending"},
+        # 09:30 UTC = 11:30 за Києвом (UTC+2 взимку)
+        {"id": 2, "created_at": "2025-01-01T09:30:00+00:00", "status": "pending"},
+        {"id": 3, "created_at": "2025-01-01T11:00:00", "status": "pending"},
+        # 09:45 GMT = 11:45 за Києвом
+        {"id": 4, "created_at": "Wed, 01 Jan 2025 09:45:00 GMT", "status": "pending"},
+    ]
+    assert _ids(BookingIndex(bookings).select()) == [1, 4, 2, 3]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_select_matches_brute_force(seed):
+    bookings = _bookings(300, seed)
+    index = BookingIndex(bookings)
+    rng = random.Random(seed)
+    assert len(index) == len(bookings)
+    for _ in range(50):
+        bounds = sorted(START + timedelta(days=rng.uniform(-5, 95)) for _ in range(2))
+        start = bounds[0] if rng.random() < 0.8 else None
+        end = bounds[1] if rng.random() < 0.8 else None
+        status = rng.choice((None,) + STATUSES)
+        assert _ids(index.select(start, end, status)) == _ids(_brute_force(bookings, start, end, status))
+
+
+def test_unknown_status_selects_nothing():
+    assert BookingIndex(_bookings(20, 0)).select(status="cancelled") == []
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_add_keeps_order_of_full_build(seed):
+    bookings = _bookings(200, seed)
+    initial, added = bookings[:120], bookings[120:]
+    random.Random(seed).shuffle(added)
+    index = BookingIndex(initial)
+    for booking in added:
+        index.add(booking)
+    full = BookingIndex(bookings)
+    assert _ids(index.select()) == _ids(full.select())
+    for status in STATUSES:
+        assert _ids(index.select(status=status)) == _ids(full.select(status=status))
+
+
+def test_add_ignores_known_booking():
+    bookings = _bookings(10, 1)
+    index = BookingIndex(bookings)
+    index.add(dict(bookings[0]))
+    assert len(index) == len(bookings)
+
+
+def test_booking_without_valid_created_at_is_skipped():
+    bookings = _bookings(5, 2) + [{"id": 999, "status": "pending"}, {"id": 1000, "created_at": "вчора"}]
+    assert 999 not in _ids(BookingIndex(bookings).select())
+    assert len(BookingIndex(bookings)) == 5
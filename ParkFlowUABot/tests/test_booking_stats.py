@@ -0,0 +1,33 @@
+from telegram_bot.services.booking_index import BookingIndex
+from telegram_bot.services.booking_stats import aggregate_bookings
+
+BOOKINGS = [
+    {"id": 1, "spot_id": 7, "status": "paid", "total_price": 50, "duration_hours": 2,
+     "created_at": "2025-01-15T10:00:00"},
+    # 23:30 UTC 31 січня — це вже 1 лютого за київським часом
+    {"id": 2, "spot_id": 7, "status": "paid", "total_price": 30.1, "duration_hours": 1.5,
+     "created_at": "2025-01-31T23:30:00+00:00"},
+    {"id": 3, "spot_id": 9, "status": "pending", "total_price": 20.2, "duration_hours": 1,
+     "created_at": "2025-02-03T09:00:00"},
+    {"id": 4, "spot_id": 9, "status": "rejected", "total_price": 100, "duration_hours": 4,
+     "created_at": "2025-02-04T09:00:00"},
+]
+
+
+def test_aggregate_bookings():
+    stats = aggregate_bookings(BookingIndex(BOOKINGS))
+
+    assert stats["bookings"] == 4
+    assert stats["active"] == 3
+    assert stats["spent"] == 100.3
+    assert stats["hours"] == 4.5
+    assert stats["monthly"] == [("2025-02", 2, 50.3, 2.5), ("2025-01", 1, 50.0, 2.0)]
+    assert stats["spot_counts"] == {7: 2, 9: 1}
+
+
+def test_aggregate_empty_index():
+    stats = aggregate_bookings(BookingIndex())
+
+    assert stats["bookings"] == stats["active"] == 0
+    assert stats["avg_rate"] is None
+    assert stats["monthly"] == []
@@ -0,0 +1,20 @@
+from telegram_bot.bounded_cache import BoundedCache
+
+
+def test_new_key_over_limit_evicts_oldest():
+    cache = BoundedCache(2)
+    cache["a"] = 1
+    cache["b"] = 2
+    cache["c"] = 3
+
+    assert list(cache.items()) == [("b", 2), ("c", 3)]
+
+
+def test_overwritten_key_becomes_newest():
+    cache = BoundedCache(2)
+    cache["a"] = 1
+    cache["b"] = 2
+    cache["a"] = 10
+    cache["c"] = 3
+
+    assert list(cache.items()) == [("a", 10), ("c", 3)]
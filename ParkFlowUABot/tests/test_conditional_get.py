@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+
+from telegram_bot.bounded_cache import BoundedCache
+from telegram_bot.services import api_service
+from telegram_bot.services.api_service import conditional_get_json
+from telegram_bot.services.cassette import CannedResponse
+
+URL = "http://api.test/parking/cities"
+
+
+class _Request:
+    def __init__(self, response: CannedResponse):
+        self._response = response
+
+    async def __aenter__(self) -> CannedResponse:
+        return self._response
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+class StubSession:
+    """Віддає наперед задані відповіді по черзі й запам'ятовує надіслані заголовки."""
+
+    def __init__(self, *responses: CannedResponse):
+        self.responses = list(responses)
+        self.sent_headers: list[dict] = []
+
+    def get(self, url: str, headers: dict | None = None, **kwargs) -> _Request:
+        self.sent_headers.append(dict(headers or {}))
+        return _Request(self.responses.pop(0))
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch):
+    monkeypatch.setattr(api_service, "_conditional_cache", BoundedCache(api_service.CONDITIONAL_CACHE_LIMIT))
+
+
+def _get(session: StubSession):
+    return asyncio.run(conditional_get_json(session, URL))
+
+
+def test_200_with_etag_then_304_returns_cached_body():
+    session = StubSession(
+        CannedResponse(200, b'[{"id": 1}]', validators={"ETag": '"v1"'}),
+        CannedResponse(304, b""),
+    )
+    status, first = _get(session)
+    assert (status, first) == (200, [{"id": 1}])
+
+    status, second = _get(session)
+    assert status == 304
+    assert second is first
+    assert session.sent_headers == [{}, {"If-None-Match": '"v1"'}]
+
+
+def test_last_modified_is_sent_as_if_modified_since():
+    last_modified = "Wed, 01 Jan 2025 10:00:00 GMT"
+    session = StubSession(
+        CannedResponse(200, b"[]", validators={"Last-Modified": last_modified}),
+        CannedResponse(200, b"[1]", validators={"Last-Modified": last_modified}),
+    )
+    _get(session)
+    assert _get(session) == (200, [1])
+    assert session.sent_headers[1] == {"If-Modified-Since": last_modified}
+
+
+def test_response_without_validators_is_not_cached():
+    session = StubSession(CannedResponse(200, b"[1]"), CannedResponse(200, b"[2]"))
+    _get(session)
+    assert _get(session) == (200, [2])
+    assert session.sent_headers == [{}, {}]
+
+
+def test_error_returns_text_and_keeps_cached_body():
+    session = StubSession(
+        CannedResponse(200, b"[1]", validators={"ETag": '"v1"'}),
+        CannedResponse(500, b"Internal error", "text/plain"),
+        CannedResponse(304, b""),
+    )
+    _get(session)
+    assert _get(session) == (500, "Internal error")
+    assert _get(session) == (304, [1])
+
+
+def test_unexpected_304_is_retried_without_validators():
+    session = StubSession(
+        CannedResponse(304, b""),
+        CannedResponse(200, b"[1]", validators={"ETag": '"v1"'}),
+    )
+    assert _get(session) == (200, [1])
+    assert "If-None-Match" not in session.sent_headers[1]
+
+
+def test_repeated_304_without_cached_body_is_an_error():
+    session = StubSession(CannedResponse(304, b""), CannedResponse(304, b""))
+    status, data = _get(session)
+    assert status not in (200, 304)
+    assert isinstance(data, str)
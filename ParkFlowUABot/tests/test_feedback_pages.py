@@ -0,0 +1,46 @@
+import asyncio
+
+from telegram_bot.handlers import feedback_handler
+from telegram_bot.handlers.feedback_handler import FeedbackPageCache
+from telegram_bot.services.user_service import USER_DELETED
+
+FEEDBACKS = [
+    {"id": 1, "user_id": 1, "text": "Зручно", "created_at": "2025-01-02T10:00:00"},
+    {"id": 2, "user_id": 2, "text": "Дорого", "created_at": "2025-01-01T10:00:00"},
+]
+
+
+def _authors(monkeypatch, second_author):
+    calls = []
+
+    async def get_user_by_id(user_id):
+        calls.append(user_id)
+        return {"id": 1, "first_name": "Іван", "last_name": "Петренко"} if user_id == 1 else second_author
+
+    monkeypatch.setattr(feedback_handler, "get_user_by_id", get_user_by_id)
+    return calls
+
+
+async def _view_twice():
+    cache = FeedbackPageCache()
+    first = await cache.text("v1", FEEDBACKS, 1)
+    second = await cache.text("v1", FEEDBACKS, 1)
+    return first, second
+
+
+def test_page_with_deleted_author_is_cached(monkeypatch):
+    calls = _authors(monkeypatch, USER_DELETED)
+
+    first, second = asyncio.run(_view_twice())
+
+    assert "Видалений акаунт" in first
+    assert first == second
+    assert calls == [1, 2]
+
+
+def test_page_with_failed_author_is_rendered_again(monkeypatch):
+    calls = _authors(monkeypatch, None)
+
+    asyncio.run(_view_twice())
+
+    assert calls == [1, 2, 1, 2]
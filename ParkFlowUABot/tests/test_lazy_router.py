@@ -0,0 +1,61 @@
+import asyncio
+from datetime import datetime
+
+from aiogram.fsm.state import State
+from aiogram.types import CallbackQuery, Chat, Message, User
+
+from telegram_bot.handlers.feedback_handler import router
+from telegram_bot.handlers.feedback_texts import (
+    FEEDBACK_CALLBACK_PREFIX, FEEDBACK_PAGE_PREFIX, FEEDBACK_TRIGGER_TEXTS,
+)
+from telegram_bot.handlers.lazy_router import LazyRouter
+
+USER = User(id=7, is_bot=False, first_name="Іван")
+
+
+def _message(text: str) -> Message:
+    return Message(message_id=1, date=datetime.now(), chat=Chat(id=7, type="private"), from_user=USER, text=text)
+
+
+def _lazy_feedback_router() -> LazyRouter:
+    # Такий самий, як у handlers/__init__.py, незалежно від LAZY_ROUTERS у середовищі тестів
+    return LazyRouter(
+        "telegram_bot.handlers.feedback_handler",
+        texts=FEEDBACK_TRIGGER_TEXTS,
+        state_groups=("FeedbackStates",),
+        callback_prefixes=(FEEDBACK_CALLBACK_PREFIX,),
+    )
+
+
+async def _accepts(handler, event) -> bool:
+    accepted, _ = await handler.check(event, raw_state=None)
+    return accepted
+
+
+def test_lazy_texts_match_feedback_handlers():
+    lazy = _lazy_feedback_router()
+
+    async def check():
+        handled = set()
+        for handler in router.message.handlers:
+            states = [f.callback for f in handler.filters or () if isinstance(f.callback, State)]
+            if states:
+                # Обробник стану: апдейт у цьому стані має завантажити модуль
+                assert all(lazy._is_trigger(_message(""), state.state) for state in states)
+                continue
+            texts = {text for text in FEEDBACK_TRIGGER_TEXTS if await _accepts(handler, _message(text))}
+            # Обробник без стану, що не реагує на жоден текст LazyRouter, ніколи не отримав би апдейт
+            assert texts, handler.callback.__name__
+            handled |= texts
+        return handled
+
+    assert asyncio.run(check()) == FEEDBACK_TRIGGER_TEXTS
+    assert all(lazy._is_trigger(_message(text), None) for text in FEEDBACK_TRIGGER_TEXTS)
+
+
+def test_lazy_callback_prefix_matches_feedback_pages():
+    lazy = _lazy_feedback_router()
+    callback = CallbackQuery(id="1", from_user=USER, chat_instance="x", data=f"{FEEDBACK_PAGE_PREFIX}2")
+
+    assert lazy._is_trigger(callback, None)
+    assert all(asyncio.run(_accepts(handler, callback)) for handler in router.callback_query.handlers)